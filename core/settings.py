@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
@@ -104,6 +105,20 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The file based cache is shared by the web and worker processes of one
+# host; point QUIZ_CACHE_LOCATION to shared storage (or switch to Redis)
+# when workers run on several nodes.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv("QUIZ_CACHE_LOCATION", str(BASE_DIR / "media" / "cache")),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -159,4 +174,162 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "BLACKLIST_AFTER_ROTATION": True,
     "UPDATE_LAST_LOGIN": True,
-}
\ No newline at end of file
+}
+
+# Quiz generation queue
+# Workers claim jobs with a lease; a job whose lease expires (crashed
+# worker) is picked up again until QUIZ_JOB_MAX_ATTEMPTS is reached.
+
+QUIZ_JOB_LEASE_SECONDS = int(os.getenv("QUIZ_JOB_LEASE_SECONDS", "120"))
+QUIZ_JOB_MAX_ATTEMPTS = int(os.getenv("QUIZ_JOB_MAX_ATTEMPTS", "3"))
+QUIZ_WORKER_POLL_SECONDS = float(os.getenv("QUIZ_WORKER_POLL_SECONDS", "2"))
+
+# Every generation gets its own scratch directory below QUIZ_WORKSPACE_ROOT
+# (point it to a tmpfs mount to keep audio off the disk). Directories of
+# dead processes or older than QUIZ_WORKSPACE_MAX_AGE_SECONDS are purged
+# at startup.
+
+QUIZ_WORKSPACE_ROOT = os.getenv("QUIZ_WORKSPACE_ROOT", str(BASE_DIR / "media" / "workspaces"))
+QUIZ_WORKSPACE_MAX_AGE_SECONDS = int(os.getenv("QUIZ_WORKSPACE_MAX_AGE_SECONDS", str(6 * 60 * 60)))
+QUIZ_WORKSPACE_PURGE_ON_STARTUP = os.getenv("QUIZ_WORKSPACE_PURGE_ON_STARTUP", "True") == "True"
+
+# Whisper models are loaded once per process. Models listed in
+# WHISPER_PRELOAD_MODELS (comma separated) are loaded at app startup,
+# quiz workers always warm up WHISPER_MODEL before taking jobs.
+
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "small")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "cpu")
+WHISPER_PRELOAD_MODELS = [
+    name for name in os.getenv("WHISPER_PRELOAD_MODELS", "").split(",") if name
+]
+
+# Transcripts are shared between users per video ID and Whisper model.
+# Entries expire after TRANSCRIPT_CACHE_MAX_AGE_SECONDS; above
+# TRANSCRIPT_CACHE_MAX_BYTES the least recently used ones are evicted.
+
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.getenv("TRANSCRIPT_CACHE_MAX_BYTES", str(200 * 2**20)))
+TRANSCRIPT_CACHE_MAX_AGE_SECONDS = int(os.getenv("TRANSCRIPT_CACHE_MAX_AGE_SECONDS", str(30 * 24 * 60 * 60)))
+
+# With QUIZ_AUDIO_CACHE_ENABLED the compact audio stream of every
+# transcribed video is kept below QUIZ_AUDIO_CACHE_ROOT (one directory per
+# host); above QUIZ_AUDIO_CACHE_MAX_BYTES per host the least recently used
+# files are deleted.
+
+QUIZ_AUDIO_CACHE_ENABLED = os.getenv("QUIZ_AUDIO_CACHE_ENABLED", "False") == "True"
+QUIZ_AUDIO_CACHE_ROOT = os.getenv("QUIZ_AUDIO_CACHE_ROOT", str(BASE_DIR / "media" / "audio_cache"))
+QUIZ_AUDIO_CACHE_MAX_BYTES = int(os.getenv("QUIZ_AUDIO_CACHE_MAX_BYTES", str(2 * 2**30)))
+
+# Gemini model used for quiz generation. Generated quizzes are cached per
+# video ID, prompt version and model name.
+
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+# yt-dlp metadata (duration, title, formats and caption languages) is
+# extracted once per video and shared by URL validation and scheduling.
+# Only host-independent fields are cached; signed stream URLs are always
+# extracted fresh by the worker that downloads.
+
+YOUTUBE_INFO_TTL_SECONDS = int(os.getenv("YOUTUBE_INFO_TTL_SECONDS", "3600"))
+
+# Decode the smallest audio-only stream directly into memory for Whisper
+# instead of writing a full-quality WAV file first.
+
+QUIZ_AUDIO_IN_MEMORY = os.getenv("QUIZ_AUDIO_IN_MEMORY", "True") == "True"
+
+# Audio is split at silent points into chunks of at most
+# WHISPER_CHUNK_SECONDS, and progress is reported per chunk. With
+# WHISPER_PARALLEL_WORKERS above one the chunks are transcribed in a pool
+# of processes, each holding its own Whisper model; otherwise one after
+# another with the shared model.
+
+WHISPER_PARALLEL_WORKERS = int(os.getenv("WHISPER_PARALLEL_WORKERS", "1"))
+WHISPER_CHUNK_SECONDS = float(os.getenv("WHISPER_CHUNK_SECONDS", "120"))
+
+# Captions (uploaded first, then automatic ones) in the first available of
+# these languages replace the audio download and the Whisper pass.
+
+QUIZ_TRANSCRIPT_LANGUAGES = os.getenv("QUIZ_TRANSCRIPT_LANGUAGES", "de,en").split(",")
+
+# In "map_reduce" mode long transcripts are split into sections of at most
+# QUIZ_SECTION_TOKENS tokens. Each section yields candidate questions in a
+# concurrent Gemini call, a final call selects QUIZ_QUESTION_COUNT of them.
+# "single" sends the first 10,000 characters in one call.
+
+QUIZ_GENERATION_MODE = os.getenv("QUIZ_GENERATION_MODE", "map_reduce")
+QUIZ_SECTION_TOKENS = int(os.getenv("QUIZ_SECTION_TOKENS", "2500"))
+QUIZ_CANDIDATES_PER_SECTION = int(os.getenv("QUIZ_CANDIDATES_PER_SECTION", "5"))
+QUIZ_QUESTION_COUNT = int(os.getenv("QUIZ_QUESTION_COUNT", "10"))
+QUIZ_GENERATION_CONCURRENCY = int(os.getenv("QUIZ_GENERATION_CONCURRENCY", "8"))
+
+# Gemini answers are constrained to the quiz schema and validated. Invalid
+# answers are retried up to QUIZ_GENERATION_ATTEMPTS times per call while
+# the generation step stays within QUIZ_GENERATION_TIME_BUDGET_SECONDS.
+# Every call makes at least one attempt.
+
+QUIZ_GENERATION_ATTEMPTS = int(os.getenv("QUIZ_GENERATION_ATTEMPTS", "3"))
+QUIZ_GENERATION_TIME_BUDGET_SECONDS = float(os.getenv("QUIZ_GENERATION_TIME_BUDGET_SECONDS", "180"))
+
+# One Gemini client per process is shared by all generations. It keeps up
+# to GEMINI_MAX_CONCURRENCY connections open and never runs more requests
+# at once; each request times out after GEMINI_TIMEOUT_SECONDS.
+
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+
+# The async createQuiz view runs its blocking yt-dlp calls (URL validation,
+# metadata, captions, downloads) in a dedicated pool of at most
+# QUIZ_ASYNC_YTDLP_WORKERS threads per process.
+
+QUIZ_ASYNC_YTDLP_WORKERS = int(os.getenv("QUIZ_ASYNC_YTDLP_WORKERS", "8"))
+
+# Admission control for createQuiz: a user may have at most
+# QUIZ_MAX_ACTIVE_JOBS_PER_USER pending or running jobs, the queue at most
+# QUIZ_MAX_ACTIVE_JOBS. Further requests get HTTP 429 with Retry-After.
+
+QUIZ_MAX_ACTIVE_JOBS = int(os.getenv("QUIZ_MAX_ACTIVE_JOBS", "100"))
+QUIZ_MAX_ACTIVE_JOBS_PER_USER = int(os.getenv("QUIZ_MAX_ACTIVE_JOBS_PER_USER", "3"))
+QUIZ_ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("QUIZ_ADMISSION_RETRY_AFTER_SECONDS", "30"))
+
+# Pending jobs are scheduled shortest-job-first by their estimated cost:
+# QUIZ_COST_CACHED_SECONDS for a cached quiz, QUIZ_COST_GENERATION_SECONDS
+# for the Gemini step, plus QUIZ_COST_TRANSCRIPTION_FACTOR times the video
+# length if it has to be transcribed. A job is overtaken only by jobs that
+# arrive within QUIZ_SCHEDULER_AGING_FACTOR times its own estimate.
+# Before that order, workers prefer the jobs of users with the fewest
+# running jobs, so one user's batch cannot take every worker.
+
+QUIZ_COST_CACHED_SECONDS = float(os.getenv("QUIZ_COST_CACHED_SECONDS", "1"))
+QUIZ_COST_GENERATION_SECONDS = float(os.getenv("QUIZ_COST_GENERATION_SECONDS", "20"))
+QUIZ_COST_TRANSCRIPTION_FACTOR = float(os.getenv("QUIZ_COST_TRANSCRIPTION_FACTOR", "0.5"))
+QUIZ_SCHEDULER_AGING_FACTOR = float(os.getenv("QUIZ_SCHEDULER_AGING_FACTOR", "2"))
+
+# A batch accepts up to QUIZ_BATCH_MAX_URLS URLs, validated by up to
+# QUIZ_BATCH_VALIDATION_WORKERS concurrent metadata lookups. A user may have
+# QUIZ_MAX_ACTIVE_BATCHES_PER_USER unfinished batches.
+
+QUIZ_BATCH_MAX_URLS = int(os.getenv("QUIZ_BATCH_MAX_URLS", "50"))
+QUIZ_BATCH_VALIDATION_WORKERS = int(os.getenv("QUIZ_BATCH_VALIDATION_WORKERS", "8"))
+QUIZ_MAX_ACTIVE_BATCHES_PER_USER = int(os.getenv("QUIZ_MAX_ACTIVE_BATCHES_PER_USER", "1"))
+
+# Progress endpoints poll the rows of all watched jobs with one query
+# every QUIZ_PROGRESS_POLL_SECONDS.
+# A long-poll request waits at most QUIZ_LONG_POLL_TIMEOUT_SECONDS for a
+# change; an idle SSE stream sends a keep-alive every QUIZ_SSE_HEARTBEAT_SECONDS.
+
+QUIZ_PROGRESS_POLL_SECONDS = float(os.getenv("QUIZ_PROGRESS_POLL_SECONDS", "0.5"))
+QUIZ_LONG_POLL_TIMEOUT_SECONDS = float(os.getenv("QUIZ_LONG_POLL_TIMEOUT_SECONDS", "25"))
+QUIZ_SSE_HEARTBEAT_SECONDS = float(os.getenv("QUIZ_SSE_HEARTBEAT_SECONDS", "15"))
+
+# Every pipeline stage of a job is timed and stored as a StageTiming row.
+# The staff-only metrics endpoint aggregates them into histograms with these
+# upper bounds (in seconds) for the stage durations.
+
+QUIZ_METRICS_STAGE_BUCKETS = [
+    float(bound) for bound in os.getenv("QUIZ_METRICS_STAGE_BUCKETS", "1,5,15,30,60,120,300,600,1800").split(",")
+]
+
+# The quiz list is paginated with opaque cursors, newest first. Clients may
+# ask for up to QUIZ_LIST_MAX_PAGE_SIZE quizzes per page via `page_size`.
+
+QUIZ_LIST_PAGE_SIZE = int(os.getenv("QUIZ_LIST_PAGE_SIZE", "20"))
+QUIZ_LIST_MAX_PAGE_SIZE = int(os.getenv("QUIZ_LIST_MAX_PAGE_SIZE", "100"))
@@ -1,5 +1,14 @@
 from django.contrib import admin
-from .models import Question, Quiz
+from .models import (
+    AudioCacheEntry, GeneratedQuizCache, Question, Quiz, QuizBatch, QuizJob,
+    StageTiming, TranscriptCache
+)
 
 admin.site.register(Question)
 admin.site.register(Quiz)
+admin.site.register(QuizJob)
+admin.site.register(QuizBatch)
+admin.site.register(TranscriptCache)
+admin.site.register(GeneratedQuizCache)
+admin.site.register(AudioCacheEntry)
+admin.site.register(StageTiming)
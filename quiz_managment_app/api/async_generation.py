@@ -0,0 +1,173 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from quiz_managment_app.models import QuizJob
+
+from .audio import decode_audio_async, decode_audio_stream_async, smallest_audio_format
+from .audio_cache import fetch_cached_audio
+from .captions import fetch_captions
+from .gemini import async_gemini_slot, get_client
+from .jobs import video_id_from_url
+from .prompts import merge_prompt, quiz_prompt, section_prompt
+from .quiz_cache import get_cached_quiz, store_quiz
+from .schemas import GeneratedQuiz, QuestionCandidates
+from .transcripts import get_cached_transcript, store_transcript
+from .utils import GeminiAttempts, QuizGenerationError, QuizGenerator, structured_config
+from .youtube import extract_video_info
+
+
+_whisper_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+_ytdlp_executor = ThreadPoolExecutor(max_workers=settings.QUIZ_ASYNC_YTDLP_WORKERS, thread_name_prefix="yt-dlp")
+
+
+async def run_ytdlp(func, *args):
+    """
+    Runs a blocking yt-dlp call (URL validation, metadata, captions or a
+    download) in the dedicated yt-dlp pool, so these calls never take more
+    than QUIZ_ASYNC_YTDLP_WORKERS threads and never queue behind other
+    work in the loop's default executor.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_ytdlp_executor, func, *args)
+
+
+class AsyncQuizGenerator(QuizGenerator):
+    """
+    QuizGenerator whose Gemini calls use the SDK's async client, so a
+    generation waiting for the model holds no thread.
+    """
+    async def agenerate_quiz(self):
+        """
+        Async counterpart of `generate_quiz` with the same sections, retry
+        budget and output file.
+        """
+        sections = self.transcript_sections()
+        self.deadline = time.monotonic() + settings.QUIZ_GENERATION_TIME_BUDGET_SECONDS
+        if len(sections) > 1:
+            quiz = await self.agenerate_from_sections(sections)
+        else:
+            quiz = await self.aask_gemini(quiz_prompt(sections[0]), GeneratedQuiz)
+        return self.save_quiz(quiz)
+
+    async def agenerate_from_sections(self, sections):
+        """
+        Awaits the candidate questions of all sections concurrently (map)
+        and the final selection (reduce).
+        """
+        candidates = await asyncio.gather(*map(self.asection_candidates, sections))
+        questions = [question.model_dump() for section in candidates for question in section]
+        prompt = merge_prompt(questions, settings.QUIZ_QUESTION_COUNT)
+        return await self.aask_gemini(prompt, GeneratedQuiz)
+
+    async def asection_candidates(self, section):
+        """
+        Returns the candidate questions for one section, or none if the
+        retry budget is exhausted.
+        """
+        count = settings.QUIZ_CANDIDATES_PER_SECTION
+        try:
+            return (await self.aask_gemini(section_prompt(section, count), QuestionCandidates)).questions
+        except QuizGenerationError:
+            return []
+
+    async def aask_gemini(self, prompt, schema):
+        """
+        Async counterpart of `ask_gemini` with the same attempt and time budget.
+        """
+        attempts = GeminiAttempts(self.deadline)
+        for attempt in attempts:
+            try:
+                return await self.arequest_structured(prompt, schema)
+            except Exception as error:
+                attempts.failed(attempt, error)
+        raise attempts.exhausted()
+
+    async def afetch_audio_from_url(self, url, info):
+        """
+        Async counterpart of `fetch_audio_from_url`. Cached and streamed
+        audio is decoded by an ffmpeg subprocess the event loop awaits;
+        only the yt-dlp downloads run in the yt-dlp pool.
+        """
+        self.progress.stage(QuizJob.Stage.DOWNLOADING)
+        if settings.QUIZ_AUDIO_CACHE_ENABLED:
+            cached_audio = await run_ytdlp(fetch_cached_audio, info, [self.progress.download_hook])
+            if cached_audio is not None:
+                with cached_audio:
+                    return await decode_audio_async(cached_audio, on_progress=self.decode_hook(info))
+        audio_format = smallest_audio_format(info) if settings.QUIZ_AUDIO_IN_MEMORY else None
+        if audio_format is not None:
+            audio = await decode_audio_stream_async(audio_format, self.decode_hook(info))
+            self.progress.add_bytes(audio.nbytes)
+            return audio
+        return await run_ytdlp(self.download_audio_file, url, info)
+
+    async def arequest_structured(self, prompt, schema):
+        """
+        Awaits a schema-constrained answer and validates it in memory.
+        """
+        async with async_gemini_slot():
+            response = await get_client().aio.models.generate_content(
+                model=settings.GEMINI_MODEL, contents=prompt, config=structured_config(schema),
+            )
+        return schema.model_validate_json(response.text)
+
+
+async def generate_quiz_async(url):
+    """
+    Returns the quiz JSON for a video URL. A cached quiz is reused;
+    otherwise the pipeline runs without holding a thread while it waits
+    for Gemini, and its result is cached.
+    """
+    video_id = video_id_from_url(url)
+    generated_quiz = await sync_to_async(get_cached_quiz)(video_id)
+    if generated_quiz is None:
+        generated_quiz = await run_pipeline_async(url, video_id)
+        await sync_to_async(store_quiz)(video_id, generated_quiz)
+    return generated_quiz
+
+
+async def run_pipeline_async(url, video_id):
+    """
+    Obtains the transcript and generates the quiz in a fresh workspace.
+    """
+    processor = AsyncQuizGenerator()
+    try:
+        await load_transcript_async(processor, url, video_id)
+        return await processor.agenerate_quiz()
+    finally:
+        await asyncio.to_thread(processor.cleanup)
+
+
+async def load_transcript_async(processor, url, video_id):
+    """
+    Async counterpart of `jobs.load_transcript`: the cached transcript is
+    reused, otherwise it is fetched and cached.
+    """
+    text, _ = await sync_to_async(get_cached_transcript)(video_id)
+    if text is None:
+        text, source = await fetch_transcript_async(processor, url, video_id)
+        await sync_to_async(store_transcript)(video_id, text, source)
+    processor.write_file(processor.transcript_file, text)
+    return text
+
+
+async def fetch_transcript_async(processor, url, video_id):
+    """
+    Async counterpart of `jobs.fetch_transcript`, returning the transcript
+    and its source. yt-dlp has no async API, so metadata and captions are
+    fetched in the yt-dlp pool; the audio stream is decoded without a
+    thread (see `afetch_audio_from_url`). Whisper runs in a single
+    dedicated thread, where the per-model lock serializes it anyway.
+    """
+    info = await run_ytdlp(extract_video_info, video_id)
+    source, text = await run_ytdlp(fetch_captions, info, settings.QUIZ_TRANSCRIPT_LANGUAGES)
+    if text:
+        return text, source
+    audio = await processor.afetch_audio_from_url(url, info)
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(_whisper_executor, processor.transcribe_audio, audio)
+    return text, QuizJob.TranscriptSource.WHISPER
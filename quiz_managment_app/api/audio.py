@@ -0,0 +1,160 @@
+import asyncio
+import math
+import os
+import subprocess
+import tempfile
+
+import numpy as np
+
+
+SAMPLE_RATE = 16000
+PCM_BYTES_PER_SECOND = SAMPLE_RATE * 2
+PCM_READ_BYTES = 2**16
+
+
+def is_audio_only(audio_format):
+    """
+    Returns `True` for formats that carry an audio track but no video.
+    """
+    has_audio = audio_format.get("acodec") not in (None, "none")
+    has_video = audio_format.get("vcodec") not in (None, "none")
+    return has_audio and not has_video and bool(audio_format.get("url"))
+
+
+def estimated_size(audio_format, duration):
+    """
+    Returns the (estimated) size of a format in bytes, derived from the
+    average bitrate if yt-dlp does not report a file size.
+    """
+    size = audio_format.get("filesize") or audio_format.get("filesize_approx")
+    if size:
+        return size
+    bitrate = audio_format.get("abr") or audio_format.get("tbr")
+    return bitrate * 1000 / 8 * (duration or 1) if bitrate else math.inf
+
+
+def smallest_audio_format(info):
+    """
+    Returns the smallest audio-only format of a yt-dlp info dict, or `None`
+    if the video offers no audio-only stream.
+    """
+    formats = [f for f in info.get("formats") or [] if is_audio_only(f)]
+    if not formats:
+        return None
+    return min(formats, key=lambda f: estimated_size(f, info.get("duration")))
+
+
+def ffmpeg_headers(audio_format):
+    """
+    Formats the HTTP headers yt-dlp requires for a stream as an ffmpeg
+    `-headers` argument.
+    """
+    headers = audio_format.get("http_headers") or {}
+    return "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+
+
+def audio_size(audio):
+    """
+    Returns the size in bytes of an audio file path or a decoded array.
+    """
+    if isinstance(audio, str):
+        return os.path.getsize(audio) if os.path.exists(audio) else 0
+    return audio.nbytes
+
+
+def decode_command(source, headers=""):
+    """
+    Returns the ffmpeg command that decodes a URL, a file path or an open
+    file into 16-bit mono PCM at Whisper's sample rate on stdout, and the
+    file to feed through stdin (`None` unless `source` is an open file).
+    """
+    stdin = None
+    if hasattr(source, "read"):
+        source, stdin = "pipe:0", source
+    cmd = ["ffmpeg", "-loglevel", "error"] + (["-nostdin"] if stdin is None else [])
+    if headers:
+        cmd += ["-headers", headers]
+    cmd += [
+        "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+        "-",
+    ]
+    return cmd, stdin
+
+
+def pcm_to_array(pcm):
+    """
+    Converts 16-bit PCM bytes into the float32 array Whisper expects.
+    """
+    return np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+
+
+def report_decoded(pcm, on_progress):
+    """
+    Passes the seconds of audio decoded so far to `on_progress`, if given.
+    """
+    if on_progress:
+        on_progress(len(pcm) / PCM_BYTES_PER_SECOND)
+
+
+def decode_audio(source, headers="", on_progress=None):
+    """
+    Decodes a URL, a file path or an open file with ffmpeg in a single pass
+    into a float32 mono array at Whisper's sample rate. An open file is fed
+    through stdin, so it stays readable even if it was deleted meanwhile.
+    The output is read in blocks and `on_progress(decoded_seconds)` is
+    called after each one, which for a stream also tracks the download.
+    """
+    cmd, stdin = decode_command(source, headers)
+    with tempfile.TemporaryFile() as errors:
+        process = subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=errors)
+        pcm = bytearray()
+        for block in iter(lambda: process.stdout.read(PCM_READ_BYTES), b""):
+            pcm += block
+            report_decoded(pcm, on_progress)
+        process.stdout.close()
+        check_decoded(process.wait(), cmd, errors)
+    return pcm_to_array(pcm)
+
+
+async def decode_audio_async(source, headers="", on_progress=None):
+    """
+    Async counterpart of `decode_audio`: the event loop awaits the ffmpeg
+    subprocess, so decoding a stream holds no thread.
+    """
+    cmd, stdin = decode_command(source, headers)
+    with tempfile.TemporaryFile() as errors:
+        process = await asyncio.create_subprocess_exec(
+            *cmd, stdin=stdin, stdout=asyncio.subprocess.PIPE, stderr=errors,
+        )
+        pcm = bytearray()
+        while block := await process.stdout.read(PCM_READ_BYTES):
+            pcm += block
+            report_decoded(pcm, on_progress)
+        check_decoded(await process.wait(), cmd, errors)
+    return pcm_to_array(pcm)
+
+
+def check_decoded(returncode, cmd, errors):
+    """
+    Raises `CalledProcessError` with ffmpeg's error output if it failed.
+    ffmpeg writes its errors to a temporary file rather than a pipe, so
+    it can never block on a full pipe while its output is being read.
+    """
+    if returncode:
+        errors.seek(0)
+        raise subprocess.CalledProcessError(returncode, cmd, stderr=errors.read())
+
+
+def decode_audio_stream(audio_format, on_progress=None):
+    """
+    Streams a format with ffmpeg and decodes it without any file on disk.
+    """
+    return decode_audio(audio_format["url"], ffmpeg_headers(audio_format), on_progress)
+
+
+async def decode_audio_stream_async(audio_format, on_progress=None):
+    """
+    Async counterpart of `decode_audio_stream`.
+    """
+    return await decode_audio_async(audio_format["url"], ffmpeg_headers(audio_format), on_progress)
@@ -0,0 +1,159 @@
+import os
+import socket
+import uuid
+
+import yt_dlp
+from django.conf import settings
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from quiz_managment_app.models import AudioCacheEntry
+from .audio import smallest_audio_format
+from .metrics import record_cache_lookup
+
+
+def audio_cache_dir():
+    """
+    Returns this host's audio cache directory. The cache index lives in the
+    shared database, so every host only uses entries for its own disk.
+    """
+    return os.path.join(str(settings.QUIZ_AUDIO_CACHE_ROOT), socket.gethostname())
+
+
+def cached_audio_path(video_id):
+    """
+    Returns the path of a video's cached audio file.
+    """
+    return os.path.join(audio_cache_dir(), f"{video_id}.audio")
+
+
+def host_entries():
+    """
+    Returns the cache entries of this host.
+    """
+    return AudioCacheEntry.objects.filter(host=socket.gethostname())
+
+
+def get_cached_audio(video_id):
+    """
+    Returns a video's cached audio file opened for reading and counts a
+    hit, or returns `None` on a miss. Both are counted in the `audio`
+    cache metrics as well. A hit refreshes the entry's LRU time.
+    The file is opened before anything else happens, so another process
+    evicting it afterwards cannot take it away; if it was evicted before,
+    that is a miss.
+    """
+    entry = host_entries().filter(video_id=video_id)
+    try:
+        audio = open(cached_audio_path(video_id), "rb") if entry.exists() else None
+    except FileNotFoundError:
+        audio = None
+    record_cache_lookup("audio", audio is not None)
+    if audio is not None:
+        entry.update(hits=F("hits") + 1, last_used_at=timezone.now())
+    return audio
+
+
+def download_audio(info, audio_format, hooks=()):
+    """
+    Downloads an audio-only format as it is (no re-encoding) into the cache
+    directory. The file is written under a temporary name and moved into
+    place with an atomic rename, so concurrent readers, also in other
+    processes, never see a partial file. Returns the file opened for
+    reading; it is opened before the rename, so an eviction right after
+    the download cannot take it away.
+    """
+    path = cached_audio_path(info["id"])
+    partial = f"{path}.{uuid.uuid4().hex}.part"
+    options = {
+        "format": audio_format["format_id"], "outtmpl": partial,
+        "progress_hooks": list(hooks), "quiet": True, "no_warnings": True,
+    }
+    os.makedirs(audio_cache_dir(), exist_ok=True)
+    try:
+        with yt_dlp.YoutubeDL(options) as ydl:
+            ydl.process_ie_result(dict(info), download=True)
+        audio = open(partial, "rb")
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return audio
+
+
+def store_audio(video_id, audio):
+    """
+    Records a downloaded file as a miss and evicts the least recently used
+    other files until this host's cache fits its size limit. The entry is
+    created with `get_or_create`, so concurrent downloads of the same
+    video (e.g. on the async path) do not collide on the unique constraint.
+    """
+    now = timezone.now()
+    fields = {"size_bytes": os.fstat(audio.fileno()).st_size, "created_at": now, "last_used_at": now}
+    _, created = AudioCacheEntry.objects.get_or_create(
+        video_id=video_id, host=socket.gethostname(), defaults=dict(fields, misses=1)
+    )
+    if not created:
+        host_entries().filter(video_id=video_id).update(misses=F("misses") + 1, **fields)
+    evict_audio(keep=video_id)
+
+
+def fetch_cached_audio(info, hooks=()):
+    """
+    Returns the compact audio file of a video opened for reading,
+    downloading it into the cache on a miss (including a file evicted by
+    another process since it was looked up), or `None` if the video
+    offers no audio-only stream. The caller closes the file.
+    """
+    audio = get_cached_audio(info["id"])
+    if audio is not None:
+        return audio
+    audio_format = smallest_audio_format(info)
+    if audio_format is None:
+        return None
+    audio = download_audio(info, audio_format, hooks)
+    store_audio(info["id"], audio)
+    return audio
+
+
+def evict_audio(keep=None):
+    """
+    Deletes the least recently used files of this host until the total
+    size fits into QUIZ_AUDIO_CACHE_MAX_BYTES. The file of video `keep`,
+    the one just stored, is never deleted, even if it alone exceeds the
+    limit. Returns the number of deleted files.
+    """
+    total = host_entries().aggregate(total=Sum("size_bytes"))["total"] or 0
+    excess = total - settings.QUIZ_AUDIO_CACHE_MAX_BYTES
+    victims = []
+    lru = host_entries().exclude(video_id=keep).order_by("last_used_at", "id").values_list(
+        "id", "video_id", "size_bytes"
+    )
+    for entry_id, video_id, size_bytes in lru.iterator():
+        if excess <= 0:
+            break
+        victims.append(entry_id)
+        excess -= size_bytes
+        remove_audio_file(video_id)
+    return host_entries().filter(id__in=victims).delete()[0]
+
+
+def remove_audio_file(video_id):
+    """
+    Deletes a cached audio file if it exists. Processes that already
+    opened it keep reading it.
+    """
+    try:
+        os.remove(cached_audio_path(video_id))
+    except FileNotFoundError:
+        pass
+
+
+def audio_cache_stats():
+    """
+    Returns the number of files, their total size and the hit and miss
+    counters of this host's audio cache.
+    """
+    return host_entries().aggregate(
+        files=Count("id"), bytes=Sum("size_bytes"), hits=Sum("hits"), misses=Sum("misses")
+    )
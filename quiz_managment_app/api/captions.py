@@ -0,0 +1,67 @@
+import html
+import re
+
+import yt_dlp
+
+
+CAPTION_TRACKS = (("captions", "subtitles"), ("auto_captions", "automatic_captions"))
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def find_caption_track(info, languages):
+    """
+    Returns the source ("captions" for uploaded subtitles, "auto_captions"
+    for YouTube's generated ones) and the WebVTT track of the first
+    requested language that is available, or `(None, None)`. Works on
+    full info dicts and on cached metadata, whose tracks have no URL.
+    """
+    for source, key in CAPTION_TRACKS:
+        tracks = info.get(key) or {}
+        for language in languages:
+            for track in tracks.get(language) or []:
+                if track.get("ext") == "vtt":
+                    return source, track
+    return None, None
+
+
+def is_cue_text(line):
+    """
+    Returns `False` for WebVTT header, cue number, timing and empty lines.
+    """
+    if not line or "-->" in line or line.isdigit():
+        return False
+    return not line.startswith(("WEBVTT", "Kind:", "Language:", "NOTE"))
+
+
+def vtt_to_text(vtt):
+    """
+    Converts WebVTT captions to plain text. Inline timing tags are removed
+    and the lines repeated by YouTube's rolling auto captions are dropped.
+    """
+    lines = []
+    for line in vtt.splitlines():
+        line = html.unescape(TAG_PATTERN.sub("", line)).strip()
+        if is_cue_text(line) and (not lines or lines[-1] != line):
+            lines.append(line)
+    return " ".join(lines)
+
+
+def download_caption(track):
+    """
+    Downloads only the caption file of a track, using yt-dlp's HTTP stack
+    so the headers and cookies YouTube expects are sent.
+    """
+    with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+        return ydl.urlopen(track["url"]).read().decode("utf-8")
+
+
+def fetch_captions(info, languages):
+    """
+    Returns the source and plain text transcript from the video's captions
+    in one of the requested languages, or `(None, None)` if there are none.
+    """
+    source, track = find_caption_track(info, languages)
+    if track is None:
+        return None, None
+    text = vtt_to_text(download_caption(track))
+    return (source, text) if text else (None, None)
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+from django.conf import settings
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+_client = None
+_slots = None
+_client_lock = threading.Lock()
+_async_slots = weakref.WeakKeyDictionary()
+
+
+def create_client():
+    """
+    Creates a Gemini API client using the 'GEMINI_API_KEY' from environment
+    variables. Its HTTP connection pool keeps up to GEMINI_MAX_CONCURRENCY
+    connections alive, and every request is bounded by GEMINI_TIMEOUT_SECONDS.
+    """
+    import httpx
+    from google import genai
+    from google.genai import types
+    connections = settings.GEMINI_MAX_CONCURRENCY
+    http_options = types.HttpOptions(
+        timeout=int(settings.GEMINI_TIMEOUT_SECONDS * 1000),
+        client_args={"limits": httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections,
+        )},
+    )
+    return genai.Client(api_key=os.getenv("GEMINI_API_KEY"), http_options=http_options)
+
+
+def get_client():
+    """
+    Returns the process-wide Gemini client, creating it on first use only.
+    The client is thread-safe, so all generations of a worker share its
+    open connections instead of paying for a new TLS handshake each time.
+    """
+    global _client, _slots
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            _slots = threading.BoundedSemaphore(settings.GEMINI_MAX_CONCURRENCY)
+            _client = create_client()
+    return _client
+
+
+@contextmanager
+def gemini_slot():
+    """
+    Holds one of the GEMINI_MAX_CONCURRENCY request slots of this process
+    while the block runs, so bursts of generations queue up here instead
+    of exceeding the connection pool or the API rate limits.
+    """
+    get_client()
+    with _slots:
+        yield
+
+
+def async_gemini_slot():
+    """
+    Returns the semaphore that limits the concurrent requests of the
+    running event loop to GEMINI_MAX_CONCURRENCY. Coroutines waiting for
+    a slot do not block the loop, unlike `gemini_slot`.
+    """
+    loop = asyncio.get_running_loop()
+    if loop not in _async_slots:
+        _async_slots[loop] = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+    return _async_slots[loop]
+
+
+def reset_client():
+    """
+    Drops the shared client, e.g. after the settings changed in tests.
+    The next call to `get_client` creates a new one.
+    """
+    global _client, _slots
+    with _client_lock:
+        _client, _slots = None, None
@@ -0,0 +1,400 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework.exceptions import Throttled
+
+from quiz_managment_app.models import QuizBatch, QuizJob
+from .captions import fetch_captions
+from .metrics import record_finished
+from .progress import ProgressReporter
+from .quiz_cache import get_cached_quiz, store_quiz
+from .scheduler import schedule_fields
+from .serializers import YTURLSerializer
+from .throttles import admission_denied, batch_admission_denied
+from .transcripts import get_cached_transcript, store_transcript
+from .utils import QuizGenerator
+from .youtube import extract_video_info, peek_video_info
+
+
+logger = logging.getLogger(__name__)
+
+CLAIM_CANDIDATES = 10
+
+
+def default_worker_id():
+    """
+    Returns an identifier for the current worker process that is unique
+    across nodes sharing the same database.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def lease_expiry(now=None):
+    """
+    Returns the point in time at which a lease taken now runs out.
+    """
+    now = now or timezone.now()
+    return now + timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+
+
+def video_id_from_url(url):
+    """
+    Returns the video ID of a canonical YouTube URL.
+    """
+    return YTURLSerializer().extract_video_id(urlparse(url))
+
+
+def new_quiz_job(owner, url, batch=None, info=None):
+    """
+    Returns an unsaved pending QuizJob for a canonical YouTube URL, scheduled
+    by the cost estimated from the given metadata or, by default, the
+    metadata that the URL validation cached.
+    """
+    video_id = video_id_from_url(url)
+    return QuizJob(
+        owner=owner, batch=batch, url=url, video_id=video_id,
+        **schedule_fields(video_id, info or peek_video_info(video_id)),
+    )
+
+
+def enqueue_quiz_job(owner, url):
+    """
+    Creates a pending QuizJob for the given user and canonical YouTube URL.
+    The admission limits are checked again while the user's row is locked,
+    so simultaneous requests that all passed the throttle cannot exceed them.
+    """
+    with transaction.atomic():
+        User.objects.select_for_update().filter(id=owner.id).first()
+        if admission_denied(owner):
+            raise Throttled(wait=settings.QUIZ_ADMISSION_RETRY_AFTER_SECONDS)
+        job = new_quiz_job(owner, url)
+        job.save()
+        return job
+
+
+def enqueue_quiz_batch(owner, urls, rejected=(), durations=None):
+    """
+    Creates a QuizBatch with one pending job per canonical URL. The jobs
+    are independent queue entries, so all available workers share them.
+    Known durations (e.g. from a playlist) are used for scheduling.
+    """
+    durations = durations or {}
+    with transaction.atomic():
+        User.objects.select_for_update().filter(id=owner.id).first()
+        if batch_admission_denied(owner, len(urls)):
+            raise Throttled(wait=settings.QUIZ_ADMISSION_RETRY_AFTER_SECONDS)
+        batch = QuizBatch.objects.create(owner=owner, rejected=list(rejected))
+        QuizJob.objects.bulk_create([
+            new_quiz_job(owner, url, batch, {"duration": durations[url]} if url in durations else None)
+            for url in urls
+        ])
+        return batch
+
+
+def batches_with_jobs():
+    """
+    Returns batches with their jobs prefetched in the order of the request.
+    """
+    return QuizBatch.objects.prefetch_related(
+        Prefetch("jobs", queryset=QuizJob.objects.order_by("id"))
+    )
+
+
+def claimable_jobs(now):
+    """
+    Returns jobs that are waiting for a worker: pending jobs and running
+    jobs whose lease expired, as long as they have attempts left.
+
+    Jobs for a video that another worker is generating right now are held
+    back (single flight): they are claimed once that generation finished
+    and are then served from the generated-quiz cache. The subquery only
+    skips them early; the unique constraint on running jobs per video
+    makes two concurrent claims for one video exclusive (see `try_claim`).
+    """
+    waiting = Q(status=QuizJob.Status.PENDING)
+    abandoned = Q(status=QuizJob.Status.RUNNING, lease_expires_at__lt=now)
+    in_flight = QuizJob.objects.filter(
+        status=QuizJob.Status.RUNNING, lease_expires_at__gte=now
+    ).values("video_id")
+    return QuizJob.objects.filter(
+        waiting | abandoned, attempts__lt=settings.QUIZ_JOB_MAX_ATTEMPTS
+    ).exclude(video_id__in=in_flight)
+
+
+def owner_running_jobs(now):
+    """
+    Returns a subquery expression for the number of jobs the owner of a
+    job has running under a valid lease.
+    """
+    running = QuizJob.objects.filter(
+        owner=OuterRef("owner"), status=QuizJob.Status.RUNNING, lease_expires_at__gte=now
+    ).order_by().values("owner").annotate(count=Count("id")).values("count")
+    return Coalesce(Subquery(running), 0)
+
+
+def fail_exhausted_jobs(now):
+    """
+    Marks running jobs as failed when their lease expired and no attempts
+    are left, so a job that keeps crashing workers is not retried forever.
+    The stage the last worker reached is recorded as the failed stage;
+    the jobs are updated per stage so each failure is counted there.
+    """
+    exhausted = QuizJob.objects.filter(
+        status=QuizJob.Status.RUNNING,
+        lease_expires_at__lt=now,
+        attempts__gte=settings.QUIZ_JOB_MAX_ATTEMPTS,
+    )
+    failed = 0
+    for stage in exhausted.order_by().values_list("stage", flat=True).distinct():
+        count = exhausted.filter(stage=stage).update(
+            status=QuizJob.Status.FAILED, stage=QuizJob.Stage.FAILED, failed_stage=stage,
+            error="Quiz generation was interrupted too many times.",
+            progress_version=F("progress_version") + 1, updated_at=now,
+        )
+        record_finished(QuizJob.Status.FAILED, stage, count)
+        failed += count
+    return failed
+
+
+def try_claim(job_id, worker_id, now):
+    """
+    Atomically takes the lease on a job with a conditional UPDATE. Returns
+    `True` only for the one worker whose update matched the row. An update
+    that would leave two running jobs for the same video violates the
+    unique constraint and counts as not claimed.
+    """
+    try:
+        with transaction.atomic():
+            return claimable_jobs(now).filter(id=job_id).update(
+                status=QuizJob.Status.RUNNING,
+                lease_owner=worker_id,
+                lease_expires_at=lease_expiry(now),
+                attempts=F("attempts") + 1,
+                started_at=now,
+                updated_at=now,
+            ) == 1
+    except IntegrityError:
+        return False
+
+
+def claim_next_job(worker_id):
+    """
+    Claims a claimable job for the given worker and returns it, or `None`
+    if the queue is empty or every candidate was taken first. Jobs of
+    owners with the fewest running jobs go first (fair share), so a large
+    batch cannot occupy every worker while other users wait; among those
+    the earliest scheduling key wins (see `scheduler.schedule_fields`).
+    """
+    now = timezone.now()
+    fail_exhausted_jobs(now)
+    candidates = claimable_jobs(now).annotate(
+        owner_running=owner_running_jobs(now)
+    ).order_by("owner_running", "scheduled_at", "id")
+    for job_id in candidates.values_list("id", flat=True)[:CLAIM_CANDIDATES]:
+        if try_claim(job_id, worker_id, now):
+            return QuizJob.objects.get(id=job_id)
+    return None
+
+
+def renew_lease(job, worker_id):
+    """
+    Extends the lease of a job still held by the given worker. Returns
+    `False` if the lease was lost to another worker.
+    """
+    return QuizJob.objects.filter(
+        id=job.id, status=QuizJob.Status.RUNNING, lease_owner=worker_id
+    ).update(lease_expires_at=lease_expiry(), updated_at=timezone.now()) == 1
+
+
+class LeaseHeartbeat:
+    """
+    Context manager that keeps renewing a job's lease from a background
+    thread while the (long-running) generation pipeline is executing.
+    """
+    def __init__(self, job, worker_id):
+        """
+        Stores the job and worker and prepares the heartbeat thread.
+        """
+        self.job = job
+        self.worker_id = worker_id
+        self.interval = settings.QUIZ_JOB_LEASE_SECONDS / 3
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        """
+        Renews the lease every third of the lease duration until stopped.
+        Closes the thread's own database connection on exit.
+        """
+        try:
+            while not self.stopped.wait(self.interval):
+                renew_lease(self.job, self.worker_id)
+        finally:
+            connection.close()
+
+
+def load_transcript(processor, url):
+    """
+    Provides the transcript for the generation and returns it together
+    with its original source and whether it was cached. A transcript
+    cached for the video is reused; otherwise it is fetched and cached for
+    all users.
+    """
+    video_id = video_id_from_url(url)
+    text, source = get_cached_transcript(video_id)
+    cached = text is not None
+    if not cached:
+        text, source = fetch_transcript(processor, url, video_id)
+        store_transcript(video_id, text, source)
+    processor.write_file(processor.transcript_file, text)
+    return text, source, cached
+
+
+def fetch_transcript(processor, url, video_id):
+    """
+    Uses the video's uploaded or automatic captions if available in one of
+    QUIZ_TRANSCRIPT_LANGUAGES. Only without captions is the audio
+    downloaded and transcribed with Whisper. The info dict is extracted
+    here rather than taken from the metadata cache, because the signed
+    caption and stream URLs only work from this host for a limited time.
+    """
+    processor.progress.stage(QuizJob.Stage.VALIDATING)
+    info = extract_video_info(video_id)
+    source, text = fetch_captions(info, settings.QUIZ_TRANSCRIPT_LANGUAGES)
+    if text:
+        return text, source
+    audio = processor.fetch_audio_from_url(url, info)
+    return processor.transcribe_audio(audio), QuizJob.TranscriptSource.WHISPER
+
+
+def generate_quiz_data(job, progress=None):
+    """
+    Returns the quiz JSON for a job's video. A quiz generated earlier for
+    the same video, prompt version and model is reused; otherwise the
+    pipeline runs and its result is cached.
+    """
+    generated_quiz = get_cached_quiz(job.video_id)
+    if generated_quiz is None:
+        generated_quiz = run_pipeline(job, progress)
+        store_quiz(job.video_id, generated_quiz)
+    return generated_quiz
+
+
+def run_pipeline(job, progress=None):
+    """
+    Runs the generation pipeline for a job: obtains the transcript (from
+    the cache, the captions or by transcribing the audio), records its
+    source and whether it was cached, and generates the validated quiz
+    via AI. Invalid AI answers are retried inside `generate_quiz`, never
+    by rerunning the download or the transcription. Stages are reported
+    to `progress`, by default a new reporter for the job.
+    """
+    processor = QuizGenerator(progress=progress or ProgressReporter(job.id))
+    try:
+        _, source, cached = load_transcript(processor, job.url)
+        QuizJob.objects.filter(id=job.id).update(transcript_source=source, transcript_cached=cached)
+        return processor.generate_quiz()
+    finally:
+        processor.cleanup()
+
+
+def complete_job(job, worker_id, generated_quiz, progress=None):
+    """
+    Saves the generated quiz and marks the job as done in one transaction.
+    Nothing is saved if the worker lost the lease in the meantime. The
+    save is timed as the last stage of the job.
+    """
+    progress = progress or ProgressReporter(job.id)
+    progress.stage(QuizJob.Stage.SAVING)
+    progress.add_bytes(len(json.dumps(generated_quiz).encode("utf-8")))
+    with transaction.atomic():
+        held = QuizJob.objects.select_for_update().filter(
+            id=job.id, status=QuizJob.Status.RUNNING, lease_owner=worker_id
+        )
+        if held.first() is None:
+            return False
+        quiz = YTURLSerializer().create(
+            {"url": job.url, "owner": job.owner, "generated_quiz": generated_quiz}
+        )
+        held.update(
+            status=QuizJob.Status.DONE, stage=QuizJob.Stage.DONE, quiz=quiz, error="",
+            progress_version=F("progress_version") + 1, updated_at=timezone.now(),
+        )
+        record_finished(QuizJob.Status.DONE)
+    progress.finish()
+    return True
+
+
+def fail_job(job, worker_id, error, stage=None):
+    """
+    Marks a job held by the given worker as failed with an error message
+    and the pipeline stage in which it failed.
+    """
+    failed = QuizJob.objects.filter(
+        id=job.id, status=QuizJob.Status.RUNNING, lease_owner=worker_id
+    ).update(
+        status=QuizJob.Status.FAILED, stage=QuizJob.Stage.FAILED, error=error,
+        failed_stage=stage or "", progress_version=F("progress_version") + 1, updated_at=timezone.now(),
+    )
+    record_finished(QuizJob.Status.FAILED, stage or "", failed)
+
+
+def process_job(job, worker_id):
+    """
+    Runs the pipeline for a claimed job while keeping its lease alive and
+    stores the result or the error on the job. One reporter follows the
+    job through all stages, so each is timed and a failure is attributed
+    to the stage it happened in.
+    """
+    progress = ProgressReporter(job.id)
+    with LeaseHeartbeat(job, worker_id):
+        try:
+            generated_quiz = generate_quiz_data(job, progress)
+            return complete_job(job, worker_id, generated_quiz, progress)
+        except Exception as e:
+            logger.exception("Quiz job %s failed", job.id)
+            return fail_job(job, worker_id, str(e), progress.finish(succeeded=False))
+
+
+def process_next_job(worker_id):
+    """
+    Claims and processes a single job. Returns the processed job, or
+    `None` if there was nothing to do.
+    """
+    job = claim_next_job(worker_id)
+    if job is not None:
+        process_job(job, worker_id)
+    return job
+
+
+def run_worker(worker_id, poll_seconds, once=False):
+    """
+    Processes jobs until stopped, sleeping `poll_seconds` whenever the queue
+    is empty. With `once`, returns as soon as the queue is drained.
+    """
+    while True:
+        if process_next_job(worker_id) is not None:
+            continue
+        if once:
+            return
+        time.sleep(poll_seconds)
@@ -0,0 +1,305 @@
+import os
+import resource
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from quiz_managment_app.models import MetricCounter, QuizJob, StageTiming
+
+
+LIVE_STATUSES = [QuizJob.Status.PENDING, QuizJob.Status.RUNNING]
+CACHES = ("transcript", "quiz", "audio")
+COUNTER_METRICS = {
+    "quiz_jobs_finished_total": ("counter", "Finished quiz generation jobs by status."),
+    "quiz_job_failures_total": ("counter", "Failed quiz generation jobs by pipeline stage."),
+    "quiz_stage_cpu_seconds_total": ("counter", "CPU time of pipeline stages."),
+    "quiz_stage_bytes_total": ("counter", "Bytes processed by pipeline stages."),
+    "quiz_stage_peak_rss_bytes": ("gauge", "Highest peak RSS reached during a stage."),
+}
+
+
+def cpu_seconds():
+    """
+    Returns the user and system CPU time of this process and of its
+    finished child processes (e.g. ffmpeg).
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def reset_peak_rss():
+    """
+    Resets the peak resident set size of this process (VmHWM) to its
+    current size, so the next `peak_rss_bytes` covers only what follows.
+    Returns `False` where the kernel does not support it.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss_bytes():
+    """
+    Returns the peak resident set size of this process since the last
+    `reset_peak_rss`. Without /proc this falls back to the lifetime peak
+    (`ru_maxrss`, reported in KiB on Linux).
+    """
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def update_sample(name, labels, value, expression):
+    """
+    Applies `expression` (an update of the stored value) to one sample, or
+    creates the sample with `value`. Two processes creating the same
+    sample at once collide on the unique constraint; the loser updates.
+    """
+    key = format_labels(labels)
+    samples = MetricCounter.objects.filter(name=name, labels=key)
+    if samples.update(value=expression):
+        return
+    try:
+        with transaction.atomic():
+            MetricCounter.objects.create(name=name, labels=key, value=value)
+    except IntegrityError:
+        samples.update(value=expression)
+
+
+def increment(name, labels=None, amount=1):
+    """
+    Adds `amount` to a counter sample.
+    """
+    if amount:
+        update_sample(name, labels, amount, F("value") + amount)
+
+
+def raise_to(name, labels, value):
+    """
+    Raises a gauge sample to `value` if that is higher than its maximum.
+    """
+    update_sample(name, labels, value, Greatest(F("value"), value))
+
+
+def histogram_bucket(seconds):
+    """
+    Returns the `le` label of the smallest QUIZ_METRICS_STAGE_BUCKETS bound
+    that `seconds` fits into, or `None` if it exceeds all of them.
+    """
+    for bound in settings.QUIZ_METRICS_STAGE_BUCKETS:
+        if seconds <= bound:
+            return f"{bound:g}"
+    return None
+
+
+def record_stage(timing):
+    """
+    Adds one `StageTiming` to the stage counters. A measurement counts
+    towards its own bucket only; the buckets are made cumulative when
+    they are scraped.
+    """
+    labels = {"stage": timing.stage}
+    increment("quiz_stage_duration_seconds_count", labels)
+    increment("quiz_stage_duration_seconds_sum", labels, timing.wall_seconds)
+    bucket = histogram_bucket(timing.wall_seconds)
+    if bucket is not None:
+        increment("quiz_stage_duration_seconds_bucket", dict(labels, le=bucket))
+    increment("quiz_stage_cpu_seconds_total", labels, timing.cpu_seconds)
+    increment("quiz_stage_bytes_total", labels, timing.bytes_processed)
+    raise_to("quiz_stage_peak_rss_bytes", labels, timing.peak_rss_bytes)
+
+
+def record_finished(status, stage="", count=1):
+    """
+    Counts jobs that finished with `status`; failed jobs are counted
+    per failed stage as well.
+    """
+    increment("quiz_jobs_finished_total", {"status": status}, count)
+    if status == QuizJob.Status.FAILED:
+        increment("quiz_job_failures_total", {"stage": stage}, count)
+
+
+def record_cache_lookup(cache, hit):
+    """
+    Counts one hit or miss of `cache`.
+    """
+    increment("quiz_cache_hits_total" if hit else "quiz_cache_misses_total", {"cache": cache})
+
+
+class StageTimer:
+    """
+    Measures the pipeline stages of a job one after another and stores a
+    `StageTiming` for each, which is added to the stage counters as well;
+    starting a stage ends the previous one. The peak memory is reset when
+    a stage starts, so each stage reports its own peak rather than the
+    highest one of the worker's lifetime. CPU time and peak memory are
+    measured for the whole process, so stages of concurrent jobs in the
+    same worker are included. Without a job id nothing is stored.
+    """
+    def __init__(self, job_id=None):
+        """
+        Initializes the timer for the given job with no stage running.
+        """
+        self.job_id = job_id
+        self.stage = None
+        self.bytes = 0
+
+    def start(self, stage):
+        """
+        Ends the running stage successfully and starts measuring `stage`.
+        Repeated reports of the running stage keep its measurement.
+        """
+        if stage == self.stage:
+            return
+        self.stop()
+        self.stage, self.bytes = stage, 0
+        reset_peak_rss()
+        self.wall, self.cpu = time.perf_counter(), cpu_seconds()
+
+    def add_bytes(self, count):
+        """
+        Adds to the bytes processed by the running stage.
+        """
+        self.bytes += count
+
+    def stop(self, succeeded=True):
+        """
+        Stores the measurement of the running stage and returns the stage,
+        or `None` if no stage was running.
+        """
+        stage, self.stage = self.stage, None
+        if stage is not None and self.job_id is not None:
+            timing = StageTiming.objects.create(
+                job_id=self.job_id, stage=stage, succeeded=succeeded,
+                wall_seconds=time.perf_counter() - self.wall,
+                cpu_seconds=cpu_seconds() - self.cpu,
+                peak_rss_bytes=peak_rss_bytes(), bytes_processed=self.bytes,
+            )
+            record_stage(timing)
+        return stage
+
+
+def format_labels(labels):
+    """
+    Returns Prometheus label syntax, e.g. `{stage="generating"}`.
+    """
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def format_value(value):
+    """
+    Returns a sample value, without a fraction for whole numbers.
+    """
+    value = value or 0
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def metric_lines(name, kind, help_text, samples):
+    """
+    Returns the HELP and TYPE header and one line per `(suffix, labels,
+    value)` sample of a metric in the Prometheus text format, where
+    `labels` is already in label syntax.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        lines.append(f"{name}{suffix}{labels} {format_value(value)}")
+    return lines
+
+
+def counter_values():
+    """
+    Returns the stored samples as a dict from `(name, labels)` to value.
+    """
+    rows = MetricCounter.objects.values_list("name", "labels", "value")
+    return {(name, labels): value for name, labels, value in rows}
+
+
+def job_metrics():
+    """
+    Returns the number of waiting and running jobs per status, read live
+    from the jobs table.
+    """
+    jobs = QuizJob.objects.filter(status__in=LIVE_STATUSES)
+    statuses = dict(jobs.values_list("status").annotate(Count("id")))
+    return metric_lines("quiz_jobs", "gauge", "Waiting and running quiz generation jobs by status.", [
+        ("", format_labels({"status": status}), statuses.get(status)) for status in LIVE_STATUSES
+    ])
+
+
+def counter_metrics(values):
+    """
+    Returns every stored metric of COUNTER_METRICS with all its samples.
+    """
+    lines = []
+    for name, (kind, help_text) in COUNTER_METRICS.items():
+        samples = [("", labels, value) for (key, labels), value in sorted(values.items()) if key == name]
+        lines += metric_lines(name, kind, help_text, samples)
+    return lines
+
+
+def histogram_samples(values, stage):
+    """
+    Returns the cumulative bucket, sum and count samples of one stage's
+    wall time histogram.
+    """
+    name, labels = "quiz_stage_duration_seconds", {"stage": stage}
+    count = values[(f"{name}_count", format_labels(labels))]
+    samples, total = [], 0
+    for bound in settings.QUIZ_METRICS_STAGE_BUCKETS:
+        bucket = format_labels(dict(labels, le=f"{bound:g}"))
+        total += values.get((f"{name}_bucket", bucket), 0)
+        samples.append(("_bucket", bucket, total))
+    samples.append(("_bucket", format_labels(dict(labels, le="+Inf")), count))
+    key = format_labels(labels)
+    return samples + [("_sum", key, values.get((f"{name}_sum", key))), ("_count", key, count)]
+
+
+def stage_metrics(values):
+    """
+    Returns the wall time histogram of every stage measured so far.
+    """
+    stages = [
+        stage for stage in QuizJob.Stage.values
+        if ("quiz_stage_duration_seconds_count", format_labels({"stage": stage})) in values
+    ]
+    return metric_lines(
+        "quiz_stage_duration_seconds", "histogram", "Wall time of pipeline stages.",
+        [sample for stage in stages for sample in histogram_samples(values, stage)],
+    )
+
+
+def cache_metrics(values):
+    """
+    Returns the hits and misses of the transcript, generated-quiz and
+    audio caches, including caches without any lookup yet.
+    """
+    lines = []
+    for name, help_text in (("quiz_cache_hits_total", "Cache hits by cache."),
+                            ("quiz_cache_misses_total", "Cache misses by cache.")):
+        labels = [format_labels({"cache": cache}) for cache in CACHES]
+        lines += metric_lines(name, "counter", help_text, [("", key, values.get((name, key))) for key in labels])
+    return lines
+
+
+def render_metrics():
+    """
+    Returns all metrics in the Prometheus text exposition format. The
+    counters are read from the `MetricCounter` table that every worker
+    process adds to, so they cover all workers and never decrease.
+    """
+    values = counter_values()
+    lines = job_metrics() + counter_metrics(values) + stage_metrics(values) + cache_metrics(values)
+    return "\n".join(lines) + "\n"
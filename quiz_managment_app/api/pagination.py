@@ -0,0 +1,14 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class QuizCursorPagination(CursorPagination):
+    """
+    Keyset pagination of quizzes, newest first. The cursor encodes the
+    position in (`created_at`, `id`) order, so pages stay stable while new
+    quizzes are generated and deep pages cost as much as the first one.
+    """
+    ordering = ("-created_at", "-id")
+    page_size = settings.QUIZ_LIST_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.QUIZ_LIST_MAX_PAGE_SIZE
@@ -0,0 +1,254 @@
+import asyncio
+import json
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from quiz_managment_app.models import QuizJob
+from .metrics import StageTimer
+
+
+class ProgressReporter:
+    """
+    Records the stage and progress of a job on its row, where the SSE and
+    long-poll endpoints pick it up. Every update increments the job's
+    `progress_version`. Frequent updates such as download progress are
+    written at most every `min_interval` seconds. Each stage is timed by a
+    `StageTimer` from its report until the next stage or `finish`. Without
+    a job id all reports are ignored, so the generator also works outside
+    the queue.
+    """
+    def __init__(self, job_id=None, min_interval=1.0):
+        """
+        Initializes the reporter for the given job.
+        """
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.last_write = 0.0
+        self.timer = StageTimer(job_id)
+
+    def stage(self, stage, **progress):
+        """
+        Records a stage transition with optional progress details.
+        """
+        self.timer.start(stage)
+        if self.job_id is None:
+            return
+        QuizJob.objects.filter(id=self.job_id).update(
+            stage=stage,
+            progress=progress,
+            progress_version=F("progress_version") + 1,
+            updated_at=timezone.now(),
+        )
+        self.last_write = time.monotonic()
+
+    def update(self, stage, **progress):
+        """
+        Records progress within a stage unless the last write was less
+        than `min_interval` seconds ago.
+        """
+        if time.monotonic() - self.last_write >= self.min_interval:
+            self.stage(stage, **progress)
+
+    def add_bytes(self, count):
+        """
+        Adds to the bytes processed by the current stage.
+        """
+        self.timer.add_bytes(count)
+
+    def finish(self, succeeded=True):
+        """
+        Ends the timing of the current stage and returns that stage.
+        """
+        return self.timer.stop(succeeded)
+
+    def download_hook(self, status):
+        """
+        yt-dlp progress hook that reports the downloaded bytes and percentage,
+        and counts the size of every finished download.
+        """
+        if status.get("status") == "finished":
+            self.add_bytes(status.get("total_bytes") or status.get("downloaded_bytes") or 0)
+        if status.get("status") != "downloading":
+            return
+        total = status.get("total_bytes") or status.get("total_bytes_estimate")
+        done = status.get("downloaded_bytes") or 0
+        percent = round(done * 100 / total, 1) if total else None
+        self.update(QuizJob.Stage.DOWNLOADING, downloaded_bytes=done, total_bytes=total, percent=percent)
+
+    def decode_hook(self, decoded_seconds, duration_seconds=None):
+        """
+        Reports the seconds of audio ffmpeg decoded so far while it streams
+        a format, with the percentage of the video's duration if known.
+        """
+        percent = round(min(decoded_seconds * 100 / duration_seconds, 100), 1) if duration_seconds else None
+        self.update(
+            QuizJob.Stage.DOWNLOADING,
+            decoded_seconds=round(decoded_seconds, 1), duration_seconds=duration_seconds, percent=percent,
+        )
+
+    def transcription_hook(self, segments_done, segments_total):
+        """
+        Reports the number of transcribed segments. The last segment is
+        always written, so clients see the final count.
+        """
+        report = self.stage if segments_done == segments_total else self.update
+        report(QuizJob.Stage.TRANSCRIBING, segments_done=segments_done, segments_total=segments_total)
+
+
+def job_progress(job):
+    """
+    Returns the progress payload of a job for the SSE and long-poll endpoints.
+    """
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress,
+        "version": job.progress_version,
+        "quiz_id": job.quiz_id,
+        "error": job.error,
+    }
+
+
+def is_finished(job):
+    """
+    Returns `True` once a job is done or failed.
+    """
+    return job.status in (QuizJob.Status.DONE, QuizJob.Status.FAILED)
+
+
+_progress_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress")
+_pollers = weakref.WeakKeyDictionary()
+
+
+async def run_in_progress_thread(func, *args):
+    """
+    Runs a blocking database call of the progress endpoints in their one
+    shared thread, so all waiting clients of a process together use a
+    single thread and database connection.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_progress_executor, in_progress_thread, func, args)
+
+
+def in_progress_thread(func, args):
+    """
+    Calls `func` in the progress thread. That thread lives outside the
+    request cycle, so a connection that is broken or past CONN_MAX_AGE is
+    replaced here first.
+    """
+    close_old_connections()
+    return func(*args)
+
+
+def fetch_jobs(job_ids):
+    """
+    Returns the given jobs by id, loaded with one query.
+    """
+    return QuizJob.objects.in_bulk(job_ids)
+
+
+class ProgressPoller:
+    """
+    Polls the jobs all progress clients of one event loop are waiting for
+    with a single query every QUIZ_PROGRESS_POLL_SECONDS and wakes each
+    client once its job changed. The poll task runs only while clients
+    are waiting.
+    """
+    def __init__(self):
+        """
+        Initializes the poller with no waiting clients.
+        """
+        self.waiters = {}
+        self.task = None
+
+    async def wait(self, job_id, since, timeout):
+        """
+        Returns the job once its `progress_version` exceeds `since` or it is
+        finished, or `None` after `timeout` seconds.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[future] = (job_id, since)
+        if self.task is None:
+            self.task = asyncio.create_task(self.poll())
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self.waiters.pop(future, None)
+            if not self.waiters and self.task is not None:
+                self.task.cancel()
+                self.task = None
+
+    async def poll(self):
+        """
+        Loads the watched jobs every tick until no client is waiting. An
+        error is passed on to every waiting client.
+        """
+        while self.waiters:
+            await asyncio.sleep(settings.QUIZ_PROGRESS_POLL_SECONDS)
+            job_ids = {job_id for job_id, _ in self.waiters.values()}
+            try:
+                self.notify(await run_in_progress_thread(fetch_jobs, job_ids))
+            except Exception as error:
+                self.notify({}, error)
+
+    def notify(self, jobs, error=None):
+        """
+        Resolves the waiting clients whose job changed, finished or was
+        deleted (with `None`), or fails all of them with `error`.
+        """
+        for future, (job_id, since) in list(self.waiters.items()):
+            job = jobs.get(job_id)
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            elif job is None or job.progress_version > since or is_finished(job):
+                future.set_result(job)
+
+
+def progress_poller():
+    """
+    Returns the poller of the running event loop, creating it on first use.
+    """
+    return _pollers.setdefault(asyncio.get_running_loop(), ProgressPoller())
+
+
+async def wait_for_progress(job, since, timeout):
+    """
+    Returns the job as soon as its `progress_version` exceeds `since` or it
+    is finished, or after `timeout` seconds. `job` is the current row, so
+    a changed job is returned without waiting; otherwise the shared
+    `ProgressPoller` of the event loop watches it. Returns the latest
+    known row, which is `job` itself after a timeout or if it was deleted.
+    """
+    if job.progress_version > since or is_finished(job) or timeout <= 0:
+        return job
+    return await progress_poller().wait(job.id, since, timeout) or job
+
+
+async def progress_events(job, since=-1):
+    """
+    Yields Server-Sent Events for every progress update of a job, starting
+    from its current row, and a comment every QUIZ_SSE_HEARTBEAT_SECONDS to
+    keep idle connections open, until the job is finished. The event id is
+    the progress version, so a reconnecting client continues via its
+    Last-Event-ID header.
+    """
+    while True:
+        job = await wait_for_progress(job, since, settings.QUIZ_SSE_HEARTBEAT_SECONDS)
+        if job.progress_version > since or is_finished(job):
+            since = job.progress_version
+            yield f"id: {since}\nevent: progress\ndata: {json.dumps(job_progress(job))}\n\n"
+        else:
+            yield ": keep-alive\n\n"
+        if is_finished(job):
+            return
@@ -0,0 +1,78 @@
+import json
+
+
+QUIZ_FORMAT = """
+        {
+        "title": "string",
+        "description": "string",
+        "questions": [
+            {
+            "question_title": "string",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "MUSS EXAKT EIN ELEMENT AUS question_options SEIN"
+            }
+        ]
+        }
+"""
+
+QUESTIONS_FORMAT = """
+        {
+        "questions": [
+            {
+            "question_title": "string",
+            "question_options": ["A", "B", "C", "D"],
+            "answer": "MUSS EXAKT EIN ELEMENT AUS question_options SEIN"
+            }
+        ]
+        }
+"""
+
+JSON_ONLY = """
+        Gib die Antwort **AUSSCHLIESSLICH** als gültiges JSON im folgenden Format zurück.
+        Keinen zusätzlichen Text, keine Erklärungen, keinen Markdown, keine ```-Codeblöcke.
+
+        Beispiel des genauen erwarteten JSON-Formats:
+"""
+
+
+def quiz_prompt(transcript):
+    """
+    Returns the prompt that generates a complete quiz from a transcript
+    in a single call.
+    """
+    return f"""
+        Erstelle ein Quiz basierend auf folgendem Transkript.
+        {JSON_ONLY}{QUIZ_FORMAT}
+        Hier ist das Transkript:
+        {transcript}
+        """
+
+
+def section_prompt(section, count):
+    """
+    Returns the prompt that generates candidate questions for one section
+    of a long transcript (map step).
+    """
+    return f"""
+        Erstelle {count} Quizfragen zu folgendem Abschnitt eines Transkripts.
+        Die Fragen sollen nur Inhalte dieses Abschnitts abfragen.
+        {JSON_ONLY}{QUESTIONS_FORMAT}
+        Hier ist der Abschnitt:
+        {section}
+        """
+
+
+def merge_prompt(candidates, count):
+    """
+    Returns the prompt that selects the final questions from the candidates
+    of all sections and adds title and description (reduce step).
+    """
+    return f"""
+        Die folgenden Quizfragen wurden zu den Abschnitten eines Videos erstellt.
+        Wähle daraus {count} Fragen aus, die das gesamte Video möglichst
+        gleichmäßig abdecken und sich nicht wiederholen. Übernimm die Fragen
+        unverändert und erstelle einen passenden Titel und eine Beschreibung.
+        {JSON_ONLY}{QUIZ_FORMAT}
+        Hier sind die Fragen:
+        {json.dumps(candidates, ensure_ascii=False)}
+        """
@@ -0,0 +1,47 @@
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from quiz_managment_app.models import Question, Quiz
+
+
+QUIZ_COLUMNS = ("id", "title", "description", "created_at", "updated_at", "video_url")
+
+
+def owned_quizzes(owner, fields=None):
+    """
+    Returns the quizzes of a user. With `fields`, only those columns are
+    loaded, plus the ones the cursor pagination orders by.
+    """
+    quizzes = Quiz.objects.filter(owner=owner)
+    if fields:
+        quizzes = quizzes.only("id", "created_at", *[name for name in fields if name in QUIZ_COLUMNS])
+    return quizzes
+
+
+def quizzes_with_questions(owner, fields=None):
+    """
+    Returns the quizzes of a user with their questions prefetched in id
+    order, so serializing any number of quizzes takes two queries. The
+    questions are skipped if `fields` does not include them.
+    """
+    quizzes = owned_quizzes(owner, fields)
+    if fields and "questions" not in fields:
+        return quizzes
+    return quizzes.prefetch_related(
+        Prefetch("questions", queryset=Question.objects.order_by("id"))
+    )
+
+
+def quiz_summaries(owner, fields=None):
+    """
+    Returns the quizzes of a user for the summary representation. The
+    number of questions is counted by the database in the same query, so
+    no `Question` rows are loaded. A correlated subquery instead of a
+    GROUP BY lets the page be read in index order and only its quizzes
+    be counted.
+    """
+    quizzes = owned_quizzes(owner, fields)
+    if fields and "question_count" not in fields:
+        return quizzes
+    counts = Question.objects.filter(quiz=OuterRef("pk")).values("quiz").annotate(count=Count("id"))
+    return quizzes.annotate(question_count=Coalesce(Subquery(counts.values("count")), 0))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db.models import F
+
+from quiz_managment_app.models import GeneratedQuizCache
+from .metrics import record_cache_lookup
+from .utils import PROMPT_VERSION
+
+
+def cached_quizzes(video_id):
+    """
+    Returns the cache entries for a video that were generated with the
+    current prompt version and the configured Gemini model.
+    """
+    return GeneratedQuizCache.objects.filter(
+        video_id=video_id,
+        prompt_version=PROMPT_VERSION,
+        model_name=settings.GEMINI_MODEL,
+    )
+
+
+def get_cached_quiz(video_id):
+    """
+    Returns the generated quiz JSON for a video, or `None` on a miss.
+    """
+    payload = cached_quizzes(video_id).values_list("payload", flat=True).first()
+    record_cache_lookup("quiz", payload is not None)
+    if payload is not None:
+        cached_quizzes(video_id).update(hits=F("hits") + 1)
+    return payload
+
+
+def store_quiz(video_id, generated_quiz):
+    """
+    Stores the generated quiz JSON of a video for later requests.
+    """
+    GeneratedQuizCache.objects.update_or_create(
+        video_id=video_id,
+        prompt_version=PROMPT_VERSION,
+        model_name=settings.GEMINI_MODEL,
+        defaults={"payload": generated_quiz},
+    )
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from quiz_managment_app.models import QuizJob
+from .captions import find_caption_track
+from .quiz_cache import cached_quizzes
+from .transcripts import cached_transcripts
+
+
+UNKNOWN_DURATION_SECONDS = 15 * 60
+
+
+def estimate_seconds(video_id, info):
+    """
+    Estimates the processing time of a video: almost nothing for a cached
+    quiz, one Gemini generation for a cached transcript or captions, plus
+    the Whisper pass proportional to the duration otherwise. Videos of
+    unknown duration are assumed to be as long as the URL validation allows.
+    """
+    if cached_quizzes(video_id).exists():
+        return settings.QUIZ_COST_CACHED_SECONDS
+    generation = settings.QUIZ_COST_GENERATION_SECONDS
+    if cached_transcripts(video_id).exists():
+        return generation
+    info = info or {}
+    if find_caption_track(info, settings.QUIZ_TRANSCRIPT_LANGUAGES)[1] is not None:
+        return generation
+    duration = info.get("duration") or UNKNOWN_DURATION_SECONDS
+    return generation + duration * settings.QUIZ_COST_TRANSCRIPTION_FACTOR
+
+
+def schedule_fields(video_id, info, now=None):
+    """
+    Returns the scheduling fields of a new job. Jobs are claimed in order
+    of `scheduled_at`, the enqueue time plus QUIZ_SCHEDULER_AGING_FACTOR
+    times the estimate: short jobs overtake long ones, but a long job is
+    overtaken only by jobs enqueued within that delay, so it cannot starve.
+    """
+    now = now or timezone.now()
+    estimated = estimate_seconds(video_id, info)
+    return {
+        "duration_seconds": (info or {}).get("duration"),
+        "estimated_seconds": estimated,
+        "scheduled_at": now + timedelta(seconds=estimated * settings.QUIZ_SCHEDULER_AGING_FACTOR),
+    }
+
+
+def remaining_seconds(job, now):
+    """
+    Returns the estimated remaining processing time of a running job.
+    """
+    started_at = job.started_at or now
+    elapsed = (now - started_at).total_seconds()
+    return max(0.0, job.estimated_seconds - elapsed)
+
+
+def estimated_times(job, now=None):
+    """
+    Returns the estimated start and finish time of an unfinished job, or
+    `(None, None)`. A pending job starts once the running jobs and all
+    jobs ahead of it are done, shared among the currently active workers.
+    """
+    now = now or timezone.now()
+    if job.status == QuizJob.Status.RUNNING:
+        return job.started_at, now + timedelta(seconds=remaining_seconds(job, now))
+    if job.status != QuizJob.Status.PENDING:
+        return None, None
+    running = list(QuizJob.objects.filter(status=QuizJob.Status.RUNNING, lease_expires_at__gte=now))
+    workers = max(1, len({other.lease_owner for other in running}))
+    backlog = sum(remaining_seconds(other, now) for other in running)
+    backlog += job.jobs_ahead().aggregate(total=Sum("estimated_seconds"))["total"] or 0
+    start = now + timedelta(seconds=backlog / workers)
+    return start, start + timedelta(seconds=job.estimated_seconds)
@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field, model_validator
+
+
+class GeneratedQuestion(BaseModel):
+    """
+    Response schema of a single question, matching the `Question` model:
+    exactly 4 options and an answer that is one of them.
+    """
+    question_title: str = Field(min_length=1, max_length=255)
+    question_options: list[str] = Field(min_length=4, max_length=4)
+    answer: str = Field(min_length=1, max_length=255)
+
+    @model_validator(mode="after")
+    def answer_in_options(self):
+        """
+        Rejects questions whose answer is not one of the options.
+        """
+        if self.answer.strip() not in [option.strip() for option in self.question_options]:
+            raise ValueError("Answer must be one of the question options.")
+        return self
+
+
+class QuestionCandidates(BaseModel):
+    """
+    Response schema of the candidate questions for one transcript section.
+    """
+    questions: list[GeneratedQuestion]
+
+
+class GeneratedQuiz(BaseModel):
+    """
+    Response schema of a complete quiz, matching the `Quiz` model.
+    """
+    title: str = Field(min_length=1, max_length=255)
+    description: str = Field(max_length=255)
+    questions: list[GeneratedQuestion] = Field(min_length=1)
@@ -0,0 +1,63 @@
+import re
+from functools import lru_cache
+
+
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+@lru_cache(maxsize=1)
+def token_encoding():
+    """
+    Returns the tiktoken encoding used to measure transcript sections.
+    It is not Gemini's own tokenizer, but close enough to bound sections.
+    """
+    import tiktoken
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text):
+    """
+    Returns the number of tokens of a text.
+    """
+    return len(token_encoding().encode(text))
+
+
+def split_long_sentence(sentence, max_tokens, count):
+    """
+    Splits a sentence that exceeds the token limit (e.g. unpunctuated auto
+    captions) at word boundaries into pieces of roughly equal size.
+    """
+    words = sentence.split()
+    pieces = -(-count(sentence) // max_tokens) + 1
+    size = max(1, -(-len(words) // pieces))
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+
+def sentence_pieces(transcript, max_tokens, count):
+    """
+    Yields the sentences of a transcript, split further where a single
+    sentence does not fit into a section.
+    """
+    for sentence in SENTENCE_END.split(transcript.strip()):
+        if count(sentence) > max_tokens:
+            yield from split_long_sentence(sentence, max_tokens, count)
+        else:
+            yield sentence
+
+
+def split_transcript(transcript, max_tokens, count=count_tokens):
+    """
+    Splits a transcript into consecutive sections of at most `max_tokens`
+    tokens. Sections end at sentence boundaries wherever possible.
+    """
+    sections, current, current_tokens = [], [], 0
+    for sentence in sentence_pieces(transcript, max_tokens, count):
+        tokens = count(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            sections.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        sections.append(" ".join(current))
+    return sections
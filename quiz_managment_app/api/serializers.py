@@ -1,7 +1,12 @@
+import yt_dlp
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
-from quiz_managment_app.models import Question, Quiz
-import yt_dlp
+from quiz_managment_app.models import Question, Quiz, QuizBatch, QuizJob
+from .scheduler import estimated_times
+from .youtube import extract_playlist_entries, get_video_info
 
 
 class YTURLSerializer(serializers.Serializer):
@@ -52,19 +57,10 @@ class YTURLSerializer(serializers.Serializer):
     def validate_video_duration(self, video_id):
         """
         Checks the duration of the YouTube video. Raises a validation error
-        if the duration cannot be read or exceeds 15 minutes.
+        if the duration cannot be read or exceeds 15 minutes. The metadata
+        is cached and reused for scheduling the job.
         """
-        video_url = f"https://www.youtube.com/watch?v={video_id}"
-
-        opts = {
-            "format": "bestaudio/best",
-            "quiet": True,
-            "skip_download": True,
-            "no_warnings": True,
-        }
-
-        with yt_dlp.YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
+        info = get_video_info(video_id)
 
         duration = info.get("duration")
         if duration is None:
@@ -90,10 +86,12 @@ class YTURLSerializer(serializers.Serializer):
     def create(self, validated_data):
         """
         Creates a Quiz instance with the validated YouTube URL and associates
-        provided questions. Requires 'generated_quiz' in serializer context.
+        provided questions. Requires 'owner' and 'generated_quiz' in the
+        validated data, so queue workers can persist quizzes without a request.
+        The questions are normalized in memory first; the quiz and all its
+        questions are then inserted in one transaction with a single bulk
+        INSERT, so a crash never leaves a half-populated quiz.
         """
-        user = self.context["request"].user
-
         generated_quiz = validated_data.pop("generated_quiz", None)
 
         if generated_quiz is None:
@@ -101,36 +99,41 @@ class YTURLSerializer(serializers.Serializer):
                 "generated_quiz must be provided when calling serializer.save()."
             )
 
-        quiz = Quiz.objects.create(
-            owner=user,
-            title=generated_quiz.get("title", "Untitled Quiz"),
-            description=generated_quiz.get("description", ""),
-            video_url=validated_data["url"]
-        )
-
-        for q in generated_quiz.get("questions", []):
-            options = q.get("question_options", [])
-            answer = q.get("answer", "")
-
-            options = [opt.strip() for opt in options]
-            answer = answer.strip()
-
-            if answer not in options:
-                lowered_options = {opt.lower(): opt for opt in options}
-                if answer.lower() in lowered_options:
-                    answer = lowered_options[answer.lower()]
-                else:
-                    continue
-
-            Question.objects.create(
-                quiz=quiz,
-                question_title=q.get("question_title", "Untitled Question"),
-                question_options=options,
-                answer=answer
+        questions = [
+            question for question in map(self.normalize_question, generated_quiz.get("questions", []))
+            if question is not None
+        ]
+        with transaction.atomic():
+            quiz = Quiz.objects.create(
+                owner=validated_data["owner"],
+                title=generated_quiz.get("title", "Untitled Quiz"),
+                description=generated_quiz.get("description", ""),
+                video_url=validated_data["url"]
             )
-
+            Question.objects.bulk_create([Question(quiz=quiz, **question) for question in questions])
         return quiz
 
+    def normalize_question(self, q):
+        """
+        Returns the model fields of a generated question with stripped
+        options and an answer matched to its option case-insensitively,
+        or `None` if the answer is not one of the options.
+        """
+        options = [opt.strip() for opt in q.get("question_options", [])]
+        answer = q.get("answer", "").strip()
+
+        if answer not in options:
+            lowered_options = {opt.lower(): opt for opt in options}
+            if answer.lower() not in lowered_options:
+                return None
+            answer = lowered_options[answer.lower()]
+
+        return {
+            "question_title": q.get("question_title", "Untitled Question"),
+            "question_options": options,
+            "answer": answer,
+        }
+
     
 class QuestionSerializer(serializers.ModelSerializer):
     """
@@ -164,7 +167,24 @@ class QuestionSerializer(serializers.ModelSerializer):
         return attrs
     
 
-class QuizSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """
+    Serializer mixin that drops every field not listed in the `fields`
+    context entry, so clients receive only the columns they asked for.
+    Without that entry all fields are serialized.
+    """
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the serializer and removes the fields not requested.
+        """
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+class QuizSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for the Quiz model, including its related questions
     using `QuestionSerializer`. All fields are read-only.
@@ -185,6 +205,27 @@ class QuizSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
+class QuizSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Lightweight serializer for quiz listings: the quiz without its
+    questions, plus their number from the `question_count` annotation.
+    """
+    question_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Quiz
+        fields = [
+            "id",
+            "title",
+            "description",
+            "created_at",
+            "updated_at",
+            "video_url",
+            "question_count",
+        ]
+        read_only_fields = fields
+
+
 class QuizPatchSerializer(serializers.ModelSerializer):
     """
     Serializer for partially updating a Quiz instance, allowing only
@@ -215,4 +256,206 @@ class QuizPatchSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 {"details": "Only title and description is editable!"}
             )
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+class QuizJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the QuizJob model, exposing the job state and, once the
+    job is done, the generated quiz using `QuizSerializer`.
+    """
+    job_id = serializers.IntegerField(source="id", read_only=True)
+    queue_position = serializers.IntegerField(read_only=True, allow_null=True)
+    estimated_start = serializers.SerializerMethodField()
+    estimated_finish = serializers.SerializerMethodField()
+    quiz = QuizSerializer(read_only=True)
+
+    class Meta:
+        model = QuizJob
+        fields = [
+            "job_id",
+            "status",
+            "stage",
+            "progress",
+            "queue_position",
+            "duration_seconds",
+            "estimated_seconds",
+            "estimated_start",
+            "estimated_finish",
+            "url",
+            "error",
+            "transcript_source",
+            "transcript_cached",
+            "created_at",
+            "updated_at",
+            "quiz",
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        """
+        Computes the scheduler estimates once per job, so both estimate
+        fields share one set of scheduler queries.
+        """
+        self.estimates = estimated_times(instance)
+        return super().to_representation(instance)
+
+    def get_estimated_start(self, obj):
+        """
+        Returns the estimated start time of an unfinished job.
+        """
+        return self.format_estimate(self.estimates[0])
+
+    def get_estimated_finish(self, obj):
+        """
+        Returns the estimated finish time of an unfinished job.
+        """
+        return self.format_estimate(self.estimates[1])
+
+    def format_estimate(self, value):
+        """
+        Formats an estimate like the other timestamps, keeping `None`.
+        """
+        return serializers.DateTimeField().to_representation(value) if value else None
+
+
+class QuizBatchCreateSerializer(serializers.Serializer):
+    """
+    Serializer for requesting quizzes for many YouTube URLs at once. Every
+    URL is validated like a single request, with the metadata lookups done
+    concurrently. Valid URLs are deduplicated by video; invalid ones are
+    reported per item instead of failing the whole batch.
+    """
+    urls = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False,
+        max_length=settings.QUIZ_BATCH_MAX_URLS,
+    )
+
+    def validate(self, attrs):
+        """
+        Validates all URLs and returns the unique canonical URLs as
+        'accepted' and the invalid ones with their error as 'rejected'.
+        Raises a validation error if no URL is valid.
+        """
+        urls = attrs["urls"]
+        workers = min(len(urls), settings.QUIZ_BATCH_VALIDATION_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(self.check_url, urls))
+        accepted = list(dict.fromkeys(url for url, error in results if error is None))
+        rejected = [{"url": url, "error": error} for url, (_, error) in zip(urls, results) if error]
+        if not accepted:
+            raise serializers.ValidationError({"urls": rejected})
+        return {"accepted": accepted, "rejected": rejected}
+
+    def check_url(self, url):
+        """
+        Returns the canonical URL and `None`, or the URL and its first
+        validation error. A video whose metadata cannot be read (private,
+        removed, geo-blocked) is rejected like any other invalid URL.
+        """
+        serializer = YTURLSerializer(data={"url": url})
+        try:
+            if serializer.is_valid():
+                return serializer.validated_data["url"], None
+        except yt_dlp.utils.DownloadError:
+            return url, "The video could not be read."
+        return url, str(serializer.errors["url"][0])
+
+
+class PlaylistURLSerializer(serializers.Serializer):
+    """
+    Serializer for requesting one quiz per video of a YouTube playlist.
+    The entries are enumerated with a single flat extraction, and videos
+    longer than `YTURLSerializer.MAX_DURATION` are rejected based on the
+    duration in the playlist data.
+    """
+    url = serializers.CharField(max_length=255)
+
+    def validate_url(self, url):
+        """
+        Validates that the URL belongs to a valid YouTube domain and contains
+        a playlist ID. Returns the playlist ID.
+        """
+        parsed = urlparse(url)
+        if parsed.netloc not in YTURLSerializer.VALID_DOMAINS:
+            raise serializers.ValidationError("Invalid YouTube URL domain.")
+        playlist_id = parse_qs(parsed.query).get("list", [None])[0]
+        if not playlist_id:
+            raise serializers.ValidationError("No playlist ID found in URL.")
+        return playlist_id
+
+    def validate(self, attrs):
+        """
+        Returns the canonical URLs of the accepted videos with their
+        durations and the rejected entries with their error, like
+        `QuizBatchCreateSerializer`. Only the first QUIZ_BATCH_MAX_URLS
+        entries are read.
+        """
+        try:
+            entries = extract_playlist_entries(attrs["url"], settings.QUIZ_BATCH_MAX_URLS)
+        except yt_dlp.utils.DownloadError:
+            raise serializers.ValidationError({"url": ["The playlist could not be read."]})
+        durations, rejected = {}, []
+        for entry in entries:
+            error = self.entry_error(entry)
+            if error:
+                rejected.append({"url": self.entry_url(entry), "error": error})
+            else:
+                durations.setdefault(self.entry_url(entry), entry["duration"])
+        if not durations:
+            raise serializers.ValidationError({"url": rejected or ["The playlist is empty."]})
+        return {"accepted": list(durations), "rejected": rejected, "durations": durations}
+
+    def entry_error(self, entry):
+        """
+        Returns why a playlist entry cannot be used, or `None`.
+        """
+        if entry.get("duration") is None:
+            return "The length of the video could not be read."
+        if entry["duration"] > YTURLSerializer.MAX_DURATION:
+            return "Video is longer than 15 minutes."
+        return None
+
+    def entry_url(self, entry):
+        """
+        Returns the canonical URL of a playlist entry.
+        """
+        return YTURLSerializer().build_clean_url(entry["id"])
+
+
+class QuizBatchItemSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a job within a batch, exposing its state and the id of
+    the generated quiz once it is done.
+    """
+    job_id = serializers.IntegerField(source="id", read_only=True)
+
+    class Meta:
+        model = QuizJob
+        fields = ["job_id", "url", "video_id", "status", "error", "quiz_id"]
+        read_only_fields = fields
+
+
+class QuizBatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the QuizBatch model with the state of every item and
+    the number of jobs per status.
+    """
+    batch_id = serializers.IntegerField(source="id", read_only=True)
+    items = QuizBatchItemSerializer(source="jobs", many=True, read_only=True)
+    counts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizBatch
+        fields = ["batch_id", "created_at", "counts", "items", "rejected"]
+        read_only_fields = fields
+
+    def get_counts(self, obj):
+        """
+        Returns the number of jobs per status, e.g. {"pending": 3, "done": 2}.
+        """
+        counts = {status: 0 for status in QuizJob.Status.values}
+        for job in obj.jobs.all():
+            counts[job.status] += 1
+        return counts
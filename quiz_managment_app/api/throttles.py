@@ -0,0 +1,111 @@
+import threading
+from collections import Counter
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from quiz_managment_app.models import QuizBatch, QuizJob
+
+
+ACTIVE_STATUSES = [QuizJob.Status.PENDING, QuizJob.Status.RUNNING]
+
+_in_request_lock = threading.Lock()
+_in_request = Counter()
+
+
+def active_jobs():
+    """
+    Returns the jobs that are waiting for or held by a worker.
+    """
+    return QuizJob.objects.filter(status__in=ACTIVE_STATUSES)
+
+
+def in_request_generations(user=None):
+    """
+    Returns the number of generations running inside requests of this
+    process (see `admit_in_request`), for one user or in total.
+    """
+    if user is not None:
+        return _in_request[user.id]
+    return sum(_in_request.values())
+
+
+def admission_denied(user):
+    """
+    Returns `True` if the user already has QUIZ_MAX_ACTIVE_JOBS_PER_USER
+    active single jobs or the queue holds QUIZ_MAX_ACTIVE_JOBS in total.
+    Generations running inside requests count as active jobs. Jobs of a
+    batch are limited by `batch_admission_denied` instead.
+    """
+    jobs = active_jobs()
+    own = jobs.filter(owner=user, batch__isnull=True).count() + in_request_generations(user)
+    if own >= settings.QUIZ_MAX_ACTIVE_JOBS_PER_USER:
+        return True
+    return jobs.count() + in_request_generations() >= settings.QUIZ_MAX_ACTIVE_JOBS
+
+
+def admit_in_request(user):
+    """
+    Reserves a slot for a generation that runs inside the request (the
+    async createQuiz path, which queues no job) if the admission limits
+    allow it. Returns `False` otherwise. Slots are counted per process,
+    so other ASGI processes see only each other's queued jobs.
+    """
+    with _in_request_lock:
+        if admission_denied(user):
+            return False
+        _in_request[user.id] += 1
+        return True
+
+
+def release_in_request(user):
+    """
+    Frees the slot reserved by `admit_in_request`.
+    """
+    with _in_request_lock:
+        _in_request[user.id] -= 1
+        if _in_request[user.id] <= 0:
+            del _in_request[user.id]
+
+
+def batch_admission_denied(user, size=1):
+    """
+    Returns `True` if the user already has QUIZ_MAX_ACTIVE_BATCHES_PER_USER
+    unfinished batches or `size` more jobs would exceed QUIZ_MAX_ACTIVE_JOBS.
+    """
+    batches = QuizBatch.objects.filter(owner=user, jobs__status__in=ACTIVE_STATUSES).distinct()
+    if batches.count() >= settings.QUIZ_MAX_ACTIVE_BATCHES_PER_USER:
+        return True
+    return active_jobs().count() + size > settings.QUIZ_MAX_ACTIVE_JOBS
+
+
+class GenerationAdmissionThrottle(BaseThrottle):
+    """
+    Throttle that rejects new quiz generations with HTTP 429 and a
+    Retry-After header while the user or the whole queue is at its limit.
+    DRF runs throttles before the view, so rejected requests never reach
+    the URL validation and its call to yt-dlp.
+    """
+    def allow_request(self, request, view):
+        """
+        Admits the request if neither limit is reached.
+        """
+        return not admission_denied(request.user)
+
+    def wait(self):
+        """
+        Returns the number of seconds a rejected client should wait.
+        """
+        return settings.QUIZ_ADMISSION_RETRY_AFTER_SECONDS
+
+
+class BatchAdmissionThrottle(GenerationAdmissionThrottle):
+    """
+    Throttle for batch creation that rejects a user with an unfinished
+    batch, or any user while the queue is full, before the URLs are validated.
+    """
+    def allow_request(self, request, view):
+        """
+        Admits the request if neither limit is reached.
+        """
+        return not batch_admission_denied(request.user)
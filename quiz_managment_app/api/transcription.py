@@ -0,0 +1,163 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from django.conf import settings
+
+from .audio import SAMPLE_RATE
+from .whisper_models import transcribe
+
+
+FRAME_SECONDS = 0.03
+
+_pool = None
+_pool_lock = threading.Lock()
+_worker_model = None
+
+
+def frame_energy(audio, frame_length):
+    """
+    Returns the RMS energy of consecutive, non-overlapping frames.
+    """
+    frames = len(audio) // frame_length
+    framed = audio[:frames * frame_length].reshape(frames, frame_length)
+    return np.sqrt(np.mean(framed ** 2, axis=1))
+
+
+def quietest_cut(energy, start, end, frame_length):
+    """
+    Returns the sample position of the quietest frame between the frame
+    indices `start` and `end`.
+    """
+    return (start + int(np.argmin(energy[start:end]))) * frame_length
+
+
+def split_on_silence(audio, chunk_seconds, search_seconds=None, sample_rate=SAMPLE_RATE):
+    """
+    Splits audio into chunks of at most `chunk_seconds`. Each cut is placed
+    at the lowest-energy frame within the last `search_seconds` of the
+    chunk, so words are not cut in half. Returns the chunks in order.
+    """
+    frame_length = int(FRAME_SECONDS * sample_rate)
+    energy = frame_energy(audio, frame_length)
+    chunk_frames = int(chunk_seconds * sample_rate) // frame_length
+    search_frames = int((search_seconds or chunk_seconds / 4) * sample_rate) // frame_length
+    search_frames = min(search_frames, chunk_frames - 1)
+    chunks, start = [], 0
+    while len(audio) - start > chunk_frames * frame_length:
+        first = start // frame_length
+        cut = quietest_cut(energy, first + chunk_frames - search_frames, first + chunk_frames, frame_length)
+        chunks.append(audio[start:cut])
+        start = cut
+    return chunks + [audio[start:]]
+
+
+def init_worker(model_name, device, threads):
+    """
+    Loads a private Whisper model in a pool process and limits its torch
+    threads, so the workers together do not oversubscribe the CPU cores.
+    """
+    global _worker_model
+    import torch
+    import whisper
+    torch.set_num_threads(threads)
+    _worker_model = whisper.load_model(model_name, device=device)
+
+
+def transcribe_chunk(chunk):
+    """
+    Transcribes one chunk with the model of the current pool process.
+    """
+    return _worker_model.transcribe(chunk)["text"].strip()
+
+
+def worker_ready(_):
+    """
+    No-op task used to start the pool processes ahead of the first job.
+    """
+    return os.getpid()
+
+
+def create_pool(workers, model_name=None):
+    """
+    Starts a process pool in which every process holds its own model.
+    Processes are spawned, because forking a process that already runs
+    torch threads is unsafe.
+    """
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(model_name or settings.WHISPER_MODEL, settings.WHISPER_DEVICE, threads),
+    )
+
+
+def get_pool():
+    """
+    Returns the process-wide transcription pool, creating it on first use
+    so the worker models are loaded only once.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = create_pool(settings.WHISPER_PARALLEL_WORKERS)
+        return _pool
+
+
+def warm_up_pool(pool, workers):
+    """
+    Starts all pool processes (and loads their models) before timing or
+    serving the first transcription.
+    """
+    return list(pool.map(worker_ready, range(workers)))
+
+
+def transcribe_parallel(audio, pool=None, chunk_seconds=None, on_progress=None):
+    """
+    Splits the audio at silent points, transcribes the chunks concurrently
+    in the process pool and stitches the texts in their original order.
+    `on_progress(done, total)` is called as the chunks arrive.
+    """
+    chunk_seconds = chunk_seconds or settings.WHISPER_CHUNK_SECONDS
+    chunks = split_on_silence(audio, chunk_seconds)
+    texts = []
+    for text in (pool or get_pool()).map(transcribe_chunk, chunks):
+        texts.append(text)
+        if on_progress:
+            on_progress(len(texts), len(chunks))
+    return " ".join(text for text in texts if text)
+
+
+def transcribe_serial(audio, chunk_seconds=None, on_progress=None):
+    """
+    Splits the audio at silent points and transcribes the chunks one after
+    another with the shared model, so `on_progress(done, total)` is called
+    after every chunk rather than once at the end. Audio shorter than one
+    chunk is transcribed in a single call, as before.
+    """
+    chunks = split_on_silence(audio, chunk_seconds or settings.WHISPER_CHUNK_SECONDS)
+    texts = []
+    for chunk in chunks:
+        texts.append(transcribe(chunk)["text"].strip())
+        if on_progress:
+            on_progress(len(texts), len(chunks))
+    return " ".join(text for text in texts if text)
+
+
+def transcribe_text(audio, on_progress=None):
+    """
+    Transcribes an audio array or file and returns the text. The audio is
+    split into chunks of at most WHISPER_CHUNK_SECONDS, which are
+    transcribed in parallel if WHISPER_PARALLEL_WORKERS is above one and
+    serially with the shared model otherwise. `on_progress(done, total)`
+    receives the number of transcribed chunks.
+    """
+    if isinstance(audio, str):
+        import whisper
+        audio = whisper.load_audio(audio, sr=SAMPLE_RATE)
+    if settings.WHISPER_PARALLEL_WORKERS <= 1:
+        return transcribe_serial(audio, on_progress=on_progress)
+    return transcribe_parallel(audio, on_progress=on_progress)
@@ -0,0 +1,116 @@
+from datetime import timedelta
+from importlib import metadata
+
+from django.conf import settings
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from quiz_managment_app.models import QuizJob, TranscriptCache
+from .metrics import record_cache_lookup
+
+
+def whisper_version():
+    """
+    Returns the installed Whisper package version without importing the
+    package (and torch) itself.
+    """
+    try:
+        return metadata.version("openai-whisper")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def transcript_model(source):
+    """
+    Returns the model name and version a transcript from `source` is
+    cached under. Captions do not depend on Whisper, so they are stored
+    without a model and stay valid when the model changes.
+    """
+    if source == QuizJob.TranscriptSource.WHISPER:
+        return settings.WHISPER_MODEL, whisper_version()
+    return "", ""
+
+
+def cached_transcripts(video_id):
+    """
+    Returns the cache entries for a video that are usable right now: the
+    caption entries and those produced by the configured Whisper model and
+    the installed Whisper version. Caption entries come first.
+    """
+    model_name, model_version = transcript_model(QuizJob.TranscriptSource.WHISPER)
+    return TranscriptCache.objects.filter(
+        Q(model_name="", model_version="") | Q(model_name=model_name, model_version=model_version),
+        video_id=video_id,
+    ).order_by("model_name", "id")
+
+
+def get_cached_transcript(video_id):
+    """
+    Returns the cached transcript for a video and the source it originally
+    came from, or `(None, None)` on a miss. Expired entries count as a
+    miss. A hit refreshes the entry's LRU time.
+    """
+    oldest = timezone.now() - timedelta(seconds=settings.TRANSCRIPT_CACHE_MAX_AGE_SECONDS)
+    entry = cached_transcripts(video_id).filter(created_at__gte=oldest).first()
+    record_cache_lookup("transcript", entry is not None)
+    if entry is None:
+        return None, None
+    TranscriptCache.objects.filter(id=entry.id).update(last_used_at=timezone.now())
+    return entry.text, entry.source
+
+
+def store_transcript(video_id, text, source):
+    """
+    Stores (or replaces) the transcript of a video together with its source
+    under the model that produced it (see `transcript_model`) and evicts
+    entries until the cache fits its age and size limits.
+    """
+    model_name, model_version = transcript_model(source)
+    TranscriptCache.objects.update_or_create(
+        video_id=video_id,
+        model_name=model_name,
+        model_version=model_version,
+        defaults={
+            "text": text,
+            "source": source,
+            "size_bytes": len(text.encode("utf-8")),
+            "created_at": timezone.now(),
+            "last_used_at": timezone.now(),
+        },
+    )
+    evict_transcripts()
+
+
+def evict_transcripts():
+    """
+    Deletes expired entries, then the least recently used entries until
+    the cache fits its size limit. Returns the number of deleted entries.
+    """
+    return evict_expired_transcripts() + evict_least_recently_used()
+
+
+def evict_expired_transcripts():
+    """
+    Deletes entries older than TRANSCRIPT_CACHE_MAX_AGE_SECONDS.
+    """
+    oldest = timezone.now() - timedelta(seconds=settings.TRANSCRIPT_CACHE_MAX_AGE_SECONDS)
+    return TranscriptCache.objects.filter(created_at__lt=oldest).delete()[0]
+
+
+def evict_least_recently_used():
+    """
+    Deletes the least recently used entries until the total transcript
+    size fits into TRANSCRIPT_CACHE_MAX_BYTES.
+    """
+    total = TranscriptCache.objects.aggregate(total=Sum("size_bytes"))["total"] or 0
+    excess = total - settings.TRANSCRIPT_CACHE_MAX_BYTES
+    if excess <= 0:
+        return 0
+    victims = []
+    lru = TranscriptCache.objects.order_by("last_used_at", "id").values_list("id", "size_bytes")
+    for entry_id, size_bytes in lru.iterator():
+        victims.append(entry_id)
+        excess -= size_bytes
+        if excess <= 0:
+            break
+    return TranscriptCache.objects.filter(id__in=victims).delete()[0]
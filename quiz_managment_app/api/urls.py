@@ -1,8 +1,20 @@
 from django.urls import path
-from .views import QuizCreateView, QuizListView, QuizDetailView
+from .views import (
+    QuizCreateView, QuizCreateAsyncView, QuizListView, QuizDetailView, QuizJobDetailView,
+    QuizBatchCreateView, QuizBatchDetailView, QuizPlaylistCreateView,
+    QuizJobProgressView, QuizJobEventsView, QuizMetricsView,
+)
 
 urlpatterns = [
     path('createQuiz/', QuizCreateView.as_view(), name='create-quiz'),
+    path('createQuiz/async/', QuizCreateAsyncView.as_view(), name='create-quiz-async'),
     path('quizzes/', QuizListView.as_view(), name='quiz-list'),
     path('quizzes/<int:pk>/', QuizDetailView.as_view(), name='quiz-detail'),
+    path('quizJobs/<int:pk>/', QuizJobDetailView.as_view(), name='quiz-job-detail'),
+    path('quizJobs/<int:pk>/progress/', QuizJobProgressView.as_view(), name='quiz-job-progress'),
+    path('quizJobs/<int:pk>/events/', QuizJobEventsView.as_view(), name='quiz-job-events'),
+    path('createQuizBatch/', QuizBatchCreateView.as_view(), name='create-quiz-batch'),
+    path('createQuizPlaylist/', QuizPlaylistCreateView.as_view(), name='create-quiz-playlist'),
+    path('quizBatches/<int:pk>/', QuizBatchDetailView.as_view(), name='quiz-batch-detail'),
+    path('internal/metrics/', QuizMetricsView.as_view(), name='quiz-metrics'),
 ]
\ No newline at end of file
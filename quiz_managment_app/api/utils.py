@@ -1,20 +1,84 @@
+import functools
+import logging
 import os
+import time
 import yt_dlp
-import re
+from concurrent.futures import ThreadPoolExecutor
 
-from dotenv import load_dotenv
+from django.conf import settings
 
+from quiz_managment_app.models import QuizJob
+from .audio import audio_size, decode_audio, decode_audio_stream, smallest_audio_format
+from .audio_cache import fetch_cached_audio
+from .gemini import gemini_slot, get_client
+from .progress import ProgressReporter
+from .prompts import merge_prompt, quiz_prompt, section_prompt
+from .schemas import GeneratedQuiz, QuestionCandidates
+from .sections import split_transcript
+from .transcription import transcribe_text
+from .workspace import create_workspace, remove_workspace
 
-load_dotenv()
 
-def get_client():
+logger = logging.getLogger(__name__)
+
+PROMPT_VERSION = "3"
+
+
+class QuizGenerationError(Exception):
+    """
+    Raised when Gemini returned no valid quiz within the attempt and time
+    budget of the generation step.
+    """
+
+
+class GeminiAttempts:
     """
-    Initializes and returns a Google Gemini API client using the
-    'GEMINI_API_KEY' from environment variables.
+    Attempt and time budget of one Gemini call, shared by the sync and the
+    async generator. Iterating yields the attempt numbers: at least one,
+    at most QUIZ_GENERATION_ATTEMPTS, and none after a failed attempt once
+    the deadline has passed.
     """
-    from google import genai
-    api_key = os.getenv("GEMINI_API_KEY")
-    return genai.Client(api_key=api_key)
+    def __init__(self, deadline):
+        """
+        Initializes the budget for a call that must end by `deadline`
+        (a `time.monotonic()` value).
+        """
+        self.deadline = deadline
+        self.last_error = None
+
+    def __iter__(self):
+        """
+        Yields the attempt numbers while the budget lasts.
+        """
+        for attempt in range(1, max(1, settings.QUIZ_GENERATION_ATTEMPTS) + 1):
+            yield attempt
+            if time.monotonic() >= self.deadline:
+                return
+
+    def failed(self, attempt, error):
+        """
+        Logs a failed attempt and remembers its error.
+        """
+        logger.warning("Gemini attempt %s failed: %s", attempt, error)
+        self.last_error = error
+
+    def exhausted(self):
+        """
+        Returns the error to raise once no attempt produced a valid answer.
+        """
+        return QuizGenerationError(f"No valid quiz was generated: {self.last_error}")
+
+
+def structured_config(schema):
+    """
+    Returns the Gemini request config that constrains the answer to JSON
+    matching the given pydantic schema.
+    """
+    from google.genai import types
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=schema,
+    )
 
 
 class QuizGenerator:
@@ -22,20 +86,55 @@ class QuizGenerator:
     Class to generate quizzes from YouTube video URLs by downloading
     audio, transcribing it, and generating a quiz via an AI model.
     """
-    def __init__(self):
+    def __init__(self, workspace_root=None, progress=None):
         """
-        Initializes file paths and ensures the media directory exists.
+        Initializes file paths inside a uniquely named scratch directory,
+        so concurrent generations never share or delete each other's files.
+        Stages are reported to the given `ProgressReporter`, if any.
         """
-        self.media_dir = "media"
+        self.media_dir = create_workspace(workspace_root)
+        self.progress = progress or ProgressReporter()
         self.audio_file = "audio_track.wav"
         self.transcript_file = "transcript.txt"
         self.output_file = "quiz_output.txt"
-        os.makedirs(self.media_dir, exist_ok=True)
 
-    def fetch_audio_from_url(self, url):
+    def fetch_audio_from_url(self, url, info=None):
+        """
+        Fetches the audio of the provided YouTube URL. With the info dict of
+        the video at hand, the smallest audio-only stream is taken from (or
+        added to) the audio cache if QUIZ_AUDIO_CACHE_ENABLED, or decoded
+        straight into a 16 kHz mono array if QUIZ_AUDIO_IN_MEMORY;
+        otherwise the audio is downloaded as a WAV file. The progress of
+        the decode or the download is reported to the job.
+        Returns the audio array or the full file path.
+        """
+        self.progress.stage(QuizJob.Stage.DOWNLOADING)
+        if settings.QUIZ_AUDIO_CACHE_ENABLED and info is not None:
+            cached_audio = fetch_cached_audio(info, [self.progress.download_hook])
+            if cached_audio is not None:
+                with cached_audio:
+                    return decode_audio(cached_audio, on_progress=self.decode_hook(info))
+        if settings.QUIZ_AUDIO_IN_MEMORY and info is not None:
+            audio_format = smallest_audio_format(info)
+            if audio_format is not None:
+                audio = decode_audio_stream(audio_format, self.decode_hook(info))
+                self.progress.add_bytes(audio.nbytes)
+                return audio
+        return self.download_audio_file(url, info)
+
+    def decode_hook(self, info):
+        """
+        Returns the ffmpeg progress callback for the video of `info`, which
+        reports the decoded seconds against the video's duration.
+        """
+        return functools.partial(self.progress.decode_hook, duration_seconds=info.get("duration"))
+
+    def download_audio_file(self, url, info=None):
         """
         Downloads audio from the provided YouTube URL as a WAV file
-        using yt_dlp and returns the full file path.
+        using yt_dlp and returns the full file path. If the info dict of
+        the video was already extracted, it is reused instead of parsing
+        the YouTube page and player again.
         """
 
         output_path = os.path.join(self.media_dir, "audio_track")
@@ -43,6 +142,7 @@ class QuizGenerator:
         ydl_opts = {
             "format": "bestaudio/best",
             "outtmpl": output_path,
+            "progress_hooks": [self.progress.download_hook],
             "postprocessors": [
                 {
                     "key": "FFmpegExtractAudio",
@@ -53,87 +153,118 @@ class QuizGenerator:
         }
 
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.extract_info(url, download=True)
+            if info is None:
+                ydl.extract_info(url, download=True)
+            else:
+                ydl.process_ie_result(info, download=True)
 
         return self.build_path(self.audio_file)
 
-    def transcribe_audio(self):
+    def transcribe_audio(self, audio=None):
         """
-        Uses the Whisper model to transcribe the audio file to text,
-        removes the audio file afterward, and saves the transcript to a file.
+        Uses Whisper to transcribe the given audio array (or the downloaded
+        audio file) to text, serially or in parallel chunks depending on
+        WHISPER_PARALLEL_WORKERS, removes the audio file afterward, and
+        saves the transcript to a file.
         """
-        import whisper
-        model = whisper.load_model("small", device="cpu")
-        audio_path = self.build_path(self.audio_file)
-        result = model.transcribe(audio_path)
-        self.remove_file(audio_path)
+        self.progress.stage(QuizJob.Stage.TRANSCRIBING)
+        audio = self.build_path(self.audio_file) if audio is None else audio
+        self.progress.add_bytes(audio_size(audio))
+        text = transcribe_text(audio, self.progress.transcription_hook)
+        self.remove_file(self.build_path(self.audio_file))
 
-        text = result["text"]
         self.write_file(self.transcript_file, text)
         return text
 
     def generate_quiz(self):
         """
-        Generates a quiz JSON from the transcript using the Gemini AI model.
-        Saves the raw output to a file and returns it as a string.
+        Generates a quiz from the transcript using the Gemini AI model.
+        Transcripts longer than one section are covered completely by
+        `generate_from_sections`. All Gemini calls share a budget of
+        QUIZ_GENERATION_TIME_BUDGET_SECONDS.
+        Saves the validated quiz to a file and returns it as a dict.
+        Increase `PROMPT_VERSION` whenever the prompts change, so cached
+        quizzes of the old prompts are no longer served.
         """
-        client = get_client()
-        transcript = self.read_file(self.transcript_file)
+        sections = self.transcript_sections()
+        self.progress.stage(QuizJob.Stage.GENERATING, sections=len(sections))
+        self.progress.add_bytes(sum(len(section.encode("utf-8")) for section in sections))
+        self.deadline = time.monotonic() + settings.QUIZ_GENERATION_TIME_BUDGET_SECONDS
+        if len(sections) > 1:
+            quiz = self.generate_from_sections(sections)
+        else:
+            quiz = self.ask_gemini(quiz_prompt(sections[0]), GeneratedQuiz)
+        return self.save_quiz(quiz)
 
-        prompt = f"""
-        Erstelle ein Quiz basierend auf folgendem Transkript.
-
-        Gib die Antwort **AUSSCHLIESSLICH** als gültiges JSON im folgenden Format zurück.
-        Keinen zusätzlichen Text, keine Erklärungen, keinen Markdown, keine ```-Codeblöcke.
-
-        Beispiel des genauen erwarteten JSON-Formats:
-
-        {{
-        "title": "string",
-        "description": "string",
-        "questions": [
-            {{
-            "question_title": "string",
-            "question_options": ["A", "B", "C", "D"],
-            "answer": "MUSS EXAKT EIN ELEMENT AUS question_options SEIN"
-            }}
-        ]
-        }}
-
-        Hier ist das Transkript:
-        {transcript[:10000]}
+    def transcript_sections(self):
         """
+        Returns the transcript split into sections in "map_reduce" mode;
+        otherwise a single section with its first 10,000 characters.
+        """
+        transcript = self.read_file(self.transcript_file)
+        if settings.QUIZ_GENERATION_MODE == "map_reduce":
+            return split_transcript(transcript, settings.QUIZ_SECTION_TOKENS)
+        return [transcript[:10000]]
 
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-        )
-
-        text = response.text.strip()
-
-        match = re.search(r"\{.*\}", text, re.DOTALL)
-        if match:
-            text = match.group(0)
-        self.write_file(self.output_file, text)
-        return text
+    def save_quiz(self, quiz):
+        """
+        Saves a validated quiz to the output file and returns it as a dict.
+        """
+        self.write_file(self.output_file, quiz.model_dump_json(indent=2))
+        return quiz.model_dump()
 
-    def clean_quiz_text(self):
+    def generate_from_sections(self, sections):
         """
-        Cleans the quiz output file by removing any Markdown code blocks
-        and extracting valid JSON, then saves the cleaned content.
+        Generates candidate questions for all sections concurrently (map)
+        and lets a final call select the questions and write title and
+        description (reduce). Wall time is about two calls, independent
+        of the number of sections.
         """
-        content = self.read_file(self.output_file)
+        workers = min(len(sections), settings.QUIZ_GENERATION_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            candidates = pool.map(self.section_candidates, sections)
+            questions = [question.model_dump() for section in candidates for question in section]
+        prompt = merge_prompt(questions, settings.QUIZ_QUESTION_COUNT)
+        return self.ask_gemini(prompt, GeneratedQuiz)
 
-        content = content.replace("```json", "")
-        content = content.replace("```", "")
+    def section_candidates(self, section):
+        """
+        Returns the candidate questions for one section. A section without
+        a valid answer within the retry budget contributes no candidates.
+        """
+        count = settings.QUIZ_CANDIDATES_PER_SECTION
+        try:
+            return self.ask_gemini(section_prompt(section, count), QuestionCandidates).questions
+        except QuizGenerationError:
+            return []
 
-        match = re.search(r"\{.*\}", content, re.DOTALL)
-        if match:
-            content = match.group(0)
+    def ask_gemini(self, prompt, schema):
+        """
+        Sends a prompt to the Gemini AI model and returns the answer
+        validated against the pydantic `schema`. Invalid answers and API
+        errors are retried up to QUIZ_GENERATION_ATTEMPTS times while the
+        generation budget lasts (see `GeminiAttempts`); then
+        `QuizGenerationError` is raised.
+        """
+        attempts = GeminiAttempts(self.deadline)
+        for attempt in attempts:
+            try:
+                return self.request_structured(prompt, schema)
+            except Exception as error:
+                attempts.failed(attempt, error)
+        raise attempts.exhausted()
 
-        content = content.strip()
-        self.write_file(self.output_file, content)
-        return content
+    def request_structured(self, prompt, schema):
+        """
+        Requests a JSON answer constrained to the response schema and
+        validates it in memory, raising `ValidationError` if it does not
+        match (e.g. an answer that is not one of the options).
+        """
+        with gemini_slot():
+            response = get_client().models.generate_content(
+                model=settings.GEMINI_MODEL, contents=prompt, config=structured_config(schema),
+            )
+        return schema.model_validate_json(response.text)
 
     def build_path(self, filename):
         """
@@ -164,8 +295,7 @@ class QuizGenerator:
 
     def cleanup(self):
         """
-        Removes all temporary files used during quiz generation
-        (audio, transcript, and output files).
+        Removes the scratch directory of this generation together with all
+        temporary files (audio, transcript, and output files).
         """
-        for file in [self.audio_file, self.transcript_file, self.output_file]:
-            self.remove_file(self.build_path(file))
\ No newline at end of file
+        remove_workspace(self.media_dir)
\ No newline at end of file
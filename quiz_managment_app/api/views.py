@@ -1,28 +1,52 @@
 import json
-from django.db import DatabaseError
+import math
+
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, transaction
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed, ParseError, PermissionDenied
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
-from quiz_managment_app.models import Quiz
-from .serializers import YTURLSerializer, QuizSerializer, QuizPatchSerializer
-from .utils import QuizGenerator
+from quiz_managment_app.models import Quiz, QuizJob
+from .async_generation import generate_quiz_async, run_ytdlp
+from .jobs import batches_with_jobs, enqueue_quiz_batch, enqueue_quiz_job
+from .metrics import render_metrics
+from .pagination import QuizCursorPagination
+from .serializers import (
+    YTURLSerializer, QuizSerializer, QuizPatchSerializer, QuizJobSerializer,
+    QuizBatchCreateSerializer, QuizBatchSerializer, PlaylistURLSerializer, QuizSummarySerializer
+)
 from .permissions import CookieJWTAuthentication, IsOwner
+from .progress import job_progress, progress_events, run_in_progress_thread, wait_for_progress
+from .queries import owned_quizzes, quiz_summaries, quizzes_with_questions
+from .throttles import (
+    BatchAdmissionThrottle, GenerationAdmissionThrottle, admit_in_request, release_in_request
+)
+from .utils import QuizGenerationError
 
 
 
 class QuizCreateView(APIView):
     """
-    API view to create a Quiz from a YouTube URL. The process involves
-    downloading audio, transcribing it, generating a quiz via AI, and
-    saving it to the database.
+    API view to request a Quiz from a YouTube URL. The URL is validated and
+    a generation job is queued; worker processes download the audio,
+    transcribe it, generate the quiz via AI and save it to the database.
+    Requests beyond the admission limits are rejected with HTTP 429.
     """
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
+    throttle_classes = [GenerationAdmissionThrottle]
 
     def post(self, request):
         """
@@ -30,72 +54,400 @@ class QuizCreateView(APIView):
 
         Steps:
         1. Validates the provided YouTube URL using `YTURLSerializer`.
-        2. Uses `QuizGenerator` to download audio, transcribe, and generate quiz JSON.
-        3. Cleans the generated text and parses it as JSON.
-        4. Saves the quiz and returns serialized data.
+        2. Enqueues a `QuizJob` for the canonical URL.
+        3. Returns the job, which can be polled via `QuizJobDetailView`.
 
         Returns:
-            Response: Serialized quiz data with HTTP 201 on success,
-                      or an error response on failure.
+            Response: Serialized job data including its queue position with
+                      HTTP 202 on success, validation errors with HTTP 400,
+                      or HTTP 429 with Retry-After if the limits are reached.
         """
         serializer = YTURLSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
-        url = serializer.validated_data["url"]
-        processor = QuizGenerator()
+        job = enqueue_quiz_job(request.user, serializer.validated_data["url"])
+        return Response(
+            QuizJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("quiz-job-detail", args=[job.id])},
+        )
+
 
+class AsyncJWTView(View):
+    """
+    Base class for async views, which hold no thread while they wait when
+    served by an ASGI server. DRF views are synchronous, so the access
+    token cookie is authenticated by hand.
+    """
+    def authenticate(self, request):
+        """
+        Returns the user of the access token cookie, or `None`.
+        """
         try:
-            processor.fetch_audio_from_url(url)
+            result = CookieJWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
 
-            processor.transcribe_audio()
+    def unauthenticated(self):
+        """
+        Returns the HTTP 401 response for requests without valid credentials.
+        """
+        return JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
 
-            processor.generate_quiz()
 
-            final_text = processor.clean_quiz_text()
+@method_decorator(csrf_exempt, name="dispatch")
+class QuizCreateAsyncView(AsyncJWTView):
+    """
+    Async variant of `QuizCreateView` for ASGI servers. The quiz is
+    generated within the request and returned directly. Gemini calls and
+    the ffmpeg stream decode are awaited without a thread; the blocking
+    yt-dlp calls, including URL validation, run in the bounded yt-dlp
+    pool (see `async_generation.run_ytdlp`).
+    """
+    async def post(self, request):
+        """
+        Handles POST requests to create a quiz. The generation holds an
+        admission slot while it runs, so the per-user and global limits
+        of the queued path apply here as well.
 
-            try:
-                generated_quiz = json.loads(final_text)
-            except Exception:
-                return Response(
-                    {"detail": "Generated quiz is not valid JSON."},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        Returns:
+            JsonResponse: The serialized quiz with HTTP 201, HTTP 401 without
+                          valid credentials, HTTP 429 with Retry-After at the
+                          admission limits, HTTP 400 for an invalid URL, or
+                          HTTP 502 if Gemini returned no valid quiz.
+        """
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None:
+            return self.unauthenticated()
+        if not await sync_to_async(admit_in_request)(user):
+            return self.throttled()
+        try:
+            return await self.create_quiz(request, user)
+        finally:
+            release_in_request(user)
 
-            quiz = serializer.save(generated_quiz=generated_quiz)
-            return Response(QuizSerializer(quiz).data, status=status.HTTP_201_CREATED)
+    async def create_quiz(self, request, user):
+        """
+        Validates the URL, generates the quiz and saves it for the user.
+        """
+        serializer = YTURLSerializer(data=self.parse_body(request))
+        if not await run_ytdlp(serializer.is_valid):
+            return JsonResponse(serializer.errors, status=400)
+        try:
+            generated_quiz = await generate_quiz_async(serializer.validated_data["url"])
+        except QuizGenerationError as e:
+            return JsonResponse({"detail": str(e)}, status=502)
+        data = await sync_to_async(self.save_quiz)(user, serializer.validated_data["url"], generated_quiz)
+        return JsonResponse(data, status=201)
 
-        finally:
-            processor.cleanup()
+    def throttled(self):
+        """
+        Returns the HTTP 429 response for requests beyond the admission limits.
+        """
+        wait = settings.QUIZ_ADMISSION_RETRY_AFTER_SECONDS
+        response = JsonResponse(
+            {"detail": f"Request was throttled. Expected available in {wait} seconds."}, status=429
+        )
+        response["Retry-After"] = str(wait)
+        return response
+
+    def parse_body(self, request):
+        """
+        Returns the JSON request body, or an empty dict if it is invalid.
+        """
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def save_quiz(self, user, url, generated_quiz):
+        """
+        Saves the generated quiz for the user and returns its serialized data.
+        """
+        quiz = YTURLSerializer().create({"url": url, "owner": user, "generated_quiz": generated_quiz})
+        return QuizSerializer(quiz).data
+
+
+class AsyncJobView(AsyncJWTView):
+    """
+    Base class for the async progress endpoints of a job.
+    """
+    async def get_owned_job(self, request, pk):
+        """
+        Returns the job with the given id if it belongs to the authenticated
+        user and `None`, or `None` and the HTTP 401, 403 or 404 response.
+        The lookups run in the shared progress thread, so a waiting client
+        never holds a thread or database connection of its own.
+        """
+        return await run_in_progress_thread(self.owned_job, request, pk)
+
+    def owned_job(self, request, pk):
+        """
+        Blocking part of `get_owned_job`.
+        """
+        user = self.authenticate(request)
+        if user is None:
+            return None, self.unauthenticated()
+        job = QuizJob.objects.filter(id=pk).first()
+        if job is None:
+            return None, JsonResponse({"detail": "No QuizJob matches the given query."}, status=404)
+        if job.owner_id != user.id:
+            return None, JsonResponse({"detail": "You do not have permission to access this job."}, status=403)
+        return job, None
+
+    def version(self, value):
+        """
+        Parses a progress version from the request, `-1` if missing or invalid.
+        """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return -1
+
+
+class QuizJobProgressView(AsyncJobView):
+    """
+    Long-poll endpoint for the progress of a job. The request returns as
+    soon as the job's progress changed since the version the client saw.
+    """
+    async def get(self, request, pk):
+        """
+        Handles GET requests with the optional query parameters `since`
+        (the last seen version) and `timeout` (seconds to wait at most).
+
+        Returns:
+            JsonResponse: The progress with HTTP 200 (unchanged if the
+                          timeout passed), HTTP 400 for an invalid timeout,
+                          or HTTP 401, 403 or 404.
+        """
+        job, error = await self.get_owned_job(request, pk)
+        if error:
+            return error
+        timeout = self.timeout(request.GET.get("timeout"))
+        if timeout is None:
+            return JsonResponse({"detail": "timeout must be a finite number of seconds."}, status=400)
+        since = self.version(request.GET.get("since"))
+        job = await wait_for_progress(job, since, timeout)
+        return JsonResponse(job_progress(job))
+
+    def timeout(self, value):
+        """
+        Parses the requested timeout, clamped to the range from zero to
+        QUIZ_LONG_POLL_TIMEOUT_SECONDS, which is also the default. Returns
+        `None` for values that are not finite numbers, e.g. `nan`.
+        """
+        if value is None:
+            return settings.QUIZ_LONG_POLL_TIMEOUT_SECONDS
+        try:
+            seconds = float(value)
+        except ValueError:
+            return None
+        if not math.isfinite(seconds):
+            return None
+        return min(max(seconds, 0.0), settings.QUIZ_LONG_POLL_TIMEOUT_SECONDS)
+
+
+class QuizJobEventsView(AsyncJobView):
+    """
+    Server-Sent Events stream of the stage transitions and progress of a
+    job, closed once the job is done or failed.
+    """
+    async def get(self, request, pk):
+        """
+        Handles GET requests. A reconnecting client continues after the
+        version in its Last-Event-ID header.
+
+        Returns:
+            StreamingHttpResponse: The `text/event-stream`, or HTTP 401, 403 or 404.
+        """
+        job, error = await self.get_owned_job(request, pk)
+        if error:
+            return error
+        since = self.version(request.headers.get("Last-Event-ID"))
+        response = StreamingHttpResponse(progress_events(job, since), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class QuizJobDetailView(APIView):
+    """
+    API view to poll the status of a quiz generation job. Once the job is
+    done, the response contains the generated quiz.
+    """
+    permission_classes = [IsAuthenticated, IsOwner]
+    authentication_classes = [CookieJWTAuthentication]
+
+    def get(self, request, pk):
+        """
+        Handles GET requests for a job owned by the authenticated user.
+
+        Returns:
+            Response: Serialized job data with HTTP 200, HTTP 403 if the job
+                      belongs to another user, or HTTP 404 if it does not exist.
+        """
+        job = get_object_or_404(QuizJob.objects.select_related("quiz"), id=pk)
+        if job.owner_id != request.user.id:
+            raise PermissionDenied("You do not have permission to access this job.")
+        return Response(
+            QuizJobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_200_OK,
+        )
+
+
+class QuizBatchCreateView(APIView):
+    """
+    API view to request quizzes for many YouTube URLs at once. All URLs are
+    validated concurrently and one generation job is queued per video.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+    throttle_classes = [BatchAdmissionThrottle]
+    serializer_class = QuizBatchCreateSerializer
+
+    def post(self, request):
+        """
+        Handles POST requests with a list of URLs.
+
+        Returns:
+            Response: Serialized batch with one item per accepted video and
+                      the rejected URLs with HTTP 202, validation errors
+                      with HTTP 400, or HTTP 429 if the limits are reached.
+        """
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        batch = enqueue_quiz_batch(
+            request.user, data["accepted"], data["rejected"], data.get("durations")
+        )
+        return Response(
+            QuizBatchSerializer(batches_with_jobs().get(id=batch.id)).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": reverse("quiz-batch-detail", args=[batch.id])},
+        )
+
+
+class QuizPlaylistCreateView(QuizBatchCreateView):
+    """
+    API view to request one quiz per video of a YouTube playlist. The
+    playlist is read with a single flat extraction and its videos are
+    queued as a batch, whose progress is available while they generate.
+    """
+    serializer_class = PlaylistURLSerializer
+
+
+class QuizBatchDetailView(APIView):
+    """
+    API view to poll the progress of a batch. Items report their status and
+    the id of their quiz as soon as it is generated.
+    """
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CookieJWTAuthentication]
+
+    def get(self, request, pk):
+        """
+        Handles GET requests for a batch owned by the authenticated user.
+
+        Returns:
+            Response: Serialized batch with HTTP 200, HTTP 403 if the batch
+                      belongs to another user, or HTTP 404 if it does not exist.
+        """
+        batch = get_object_or_404(batches_with_jobs(), id=pk)
+        if batch.owner_id != request.user.id:
+            raise PermissionDenied("You do not have permission to access this batch.")
+        return Response(QuizBatchSerializer(batch).data, status=status.HTTP_200_OK)
+
+
+class QuizMetricsView(APIView):
+    """
+    Internal API view exposing the pipeline metrics in the Prometheus text
+    format. Only staff users may read it; scrapers authenticate with a
+    bearer token, browsers with the access token cookie.
+    """
+    permission_classes = [IsAdminUser]
+    authentication_classes = [CookieJWTAuthentication, JWTAuthentication]
+
+    def get(self, request):
+        """
+        Handles GET requests for the metrics.
+
+        Returns:
+            HttpResponse: The metrics as text with HTTP 200, or HTTP 401/403
+                          for anonymous or non-staff users.
+        """
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 class QuizListView(generics.ListAPIView):
     """
-    API view to list all quizzes owned by the authenticated user.
+    API view to list the quizzes owned by the authenticated user, newest
+    first, in cursor-paginated pages. The questions of a page are loaded
+    with one prefetch query, so the query count does not grow with the
+    size of the library. `?view=summary` returns the quizzes without their
+    questions but with `question_count`, and `?fields=` restricts either
+    representation to the given comma-separated fields.
     """
     permission_classes = [IsAuthenticated]
     authentication_classes = [CookieJWTAuthentication]
+    pagination_class = QuizCursorPagination
+
+    def is_summary(self):
+        """
+        Returns `True` if the summary representation was requested.
+        """
+        return self.request.query_params.get("view") == "summary"
+
+    def get_serializer_class(self):
+        """
+        Returns the serializer of the requested representation.
+        """
+        return QuizSummarySerializer if self.is_summary() else QuizSerializer
+
+    def requested_fields(self):
+        """
+        Returns the fields named by the `fields` query parameter, or `None`
+        if it is absent. Raises `ParseError` for unknown field names.
+        """
+        param = self.request.query_params.get("fields")
+        if not param:
+            return None
+        fields = [name.strip() for name in param.split(",") if name.strip()]
+        unknown = set(fields) - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ParseError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+        return fields
+
+    def get_serializer_context(self):
+        """
+        Adds the requested fields to the serializer context.
+        """
+        return dict(super().get_serializer_context(), fields=self.requested_fields())
+
+    def get_queryset(self):
+        """
+        Returns the authenticated user's quizzes, loading only what the
+        requested representation and fields need.
+        """
+        load = quiz_summaries if self.is_summary() else quizzes_with_questions
+        return load(self.request.user, self.requested_fields())
 
     def get(self, request, *args, **kwargs):
         """
-        Handles GET requests to retrieve all quizzes for the authenticated user.
+        Handles GET requests to retrieve a page of the user's quizzes.
 
         Returns:
-            Response: Serialized list of quizzes with HTTP 200 on success,
-                      or an error response with HTTP 500 if an exception occurs.
+            Response: `next` and `previous` cursor links and the serialized
+                      quizzes as `results` with HTTP 200, or an error
+                      response with HTTP 500 if a database error occurs.
         """
         try:
-            quiz = Quiz.objects.filter(owner=self.request.user)
-            serializer = QuizSerializer(
-                quiz, many=True, context={"request": request}
-            )
-            return Response(
-                serializer.data,
-                status=status.HTTP_200_OK
-                )
-
-        except Exception as e:
+            return self.list(request, *args, **kwargs)
+        except DatabaseError as e:
             return Response(
-                {"detail": {str(e)}},
+                {"detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
@@ -108,15 +460,21 @@ class QuizDetailView(APIView):
     permission_classes = [IsAuthenticated, IsOwner]
     authentication_classes = [CookieJWTAuthentication]
 
-    def get_object(self, pk):
+    def get_object(self, pk, queryset=None):
         """
-        Retrieves the Quiz object by primary key and checks ownership.
-        Raises PermissionDenied if the authenticated user is not the owner.
+        Retrieves the Quiz object by primary key from a queryset scoped to
+        the authenticated user, by default with its questions prefetched,
+        so a hit takes one query per table. Only on a miss is the quiz
+        looked up unscoped: PermissionDenied is raised if another user
+        owns it, Http404 if it does not exist.
         """
-        quiz = get_object_or_404(Quiz, id=pk)
-        if quiz.owner != self.request.user:
-            raise PermissionDenied("You do not have permission to access this quiz.")
-        return quiz
+        queryset = quizzes_with_questions(self.request.user) if queryset is None else queryset
+        try:
+            return queryset.get(id=pk)
+        except Quiz.DoesNotExist:
+            if Quiz.objects.filter(id=pk).exists():
+                raise PermissionDenied("You do not have permission to access this quiz.")
+            raise Http404("No Quiz matches the given query.")
 
     def get(self, request, pk):
         """
@@ -151,14 +509,16 @@ class QuizDetailView(APIView):
     def delete(self, request, pk):
         """
         Handles DELETE requests to remove a quiz and its associated questions.
+        The questions are removed by the cascade of the quiz deletion, all
+        in one transaction, so a failure leaves the quiz intact.
 
         Returns:
             Response: HTTP 204 on success, or HTTP 500 if a database error occurs.
         """
-        quiz = self.get_object(pk)
-        quiz.questions.all().delete()
+        quiz = self.get_object(pk, owned_quizzes(request.user))
         try:
-            quiz.delete()
+            with transaction.atomic():
+                quiz.delete()
         except DatabaseError as e:
             return Response(
                 {"error": f"An unexpected error occurred.: {str(e)}"},
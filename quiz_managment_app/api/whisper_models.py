@@ -0,0 +1,92 @@
+import logging
+import os
+import resource
+import threading
+import time
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_models = {}
+_model_locks = {}
+_model_stats = {}
+_registry_lock = threading.Lock()
+
+
+def resident_memory_bytes():
+    """
+    Returns the current resident set size of this process. Falls back to
+    the peak RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def load_whisper_model(name):
+    """
+    Loads a Whisper model from disk, stores it in the registry and records
+    the load time and the resident memory after loading.
+    """
+    import whisper
+    started = time.perf_counter()
+    model = whisper.load_model(name, device=settings.WHISPER_DEVICE)
+    stats = {
+        "load_seconds": round(time.perf_counter() - started, 3),
+        "rss_bytes": resident_memory_bytes(),
+    }
+    _models[name], _model_locks[name], _model_stats[name] = model, threading.Lock(), stats
+    logger.info(
+        "Loaded Whisper model '%s' in %.2fs (resident memory %.0f MB)",
+        name, stats["load_seconds"], stats["rss_bytes"] / 2**20,
+    )
+    return model
+
+
+def get_whisper_model(name=None):
+    """
+    Returns the process-wide instance of the given (or configured) Whisper
+    model, loading it on first use only.
+    """
+    name = name or settings.WHISPER_MODEL
+    model = _models.get(name)
+    if model is not None:
+        return model
+    with _registry_lock:
+        if name not in _models:
+            load_whisper_model(name)
+        return _models[name]
+
+
+def transcribe(audio, name=None):
+    """
+    Transcribes audio with a shared model. Whisper installs decoding hooks
+    on the model during `transcribe`, so calls on the same model are
+    serialized; different model sizes run independently.
+    """
+    name = name or settings.WHISPER_MODEL
+    model = get_whisper_model(name)
+    with _model_locks[name]:
+        return model.transcribe(audio)
+
+
+def warm_up(names=None):
+    """
+    Loads the given (or preconfigured) models ahead of the first request
+    and returns their load statistics.
+    """
+    names = names or settings.WHISPER_PRELOAD_MODELS
+    for name in names:
+        get_whisper_model(name)
+    return loaded_models()
+
+
+def loaded_models():
+    """
+    Returns load time and resident memory per loaded model.
+    """
+    return {name: dict(stats) for name, stats in _model_stats.items()}
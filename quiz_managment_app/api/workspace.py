@@ -0,0 +1,94 @@
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import time
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_PREFIX = "quiz-"
+
+
+def host_workspace_dir(root=None):
+    """
+    Returns the directory holding this host's workspaces below the given
+    (or configured) root. Separating hosts lets several nodes share a root
+    without mistaking each other's live workspaces for stale ones.
+    """
+    root = root or settings.QUIZ_WORKSPACE_ROOT
+    return os.path.join(str(root), socket.gethostname())
+
+
+def create_workspace(root=None):
+    """
+    Creates a uniquely named scratch directory for a single generation and
+    returns its path. The name contains the pid of the creating process.
+    """
+    host_dir = host_workspace_dir(root)
+    os.makedirs(host_dir, exist_ok=True)
+    prefix = f"{WORKSPACE_PREFIX}{os.getpid()}-"
+    return tempfile.mkdtemp(prefix=prefix, dir=host_dir)
+
+
+def remove_workspace(path):
+    """
+    Deletes a workspace directory and everything in it.
+    """
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def workspace_pid(name):
+    """
+    Extracts the pid of the creating process from a workspace name, or
+    returns `None` if the name does not follow the workspace pattern.
+    """
+    pid = name[len(WORKSPACE_PREFIX):].split("-", 1)[0]
+    return int(pid) if pid.isdigit() else None
+
+
+def process_alive(pid):
+    """
+    Returns `True` if a process with the given pid exists on this host.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_stale(path, max_age):
+    """
+    A workspace is stale if the process that created it is gone or if it
+    was not touched for longer than `max_age` seconds.
+    """
+    pid = workspace_pid(os.path.basename(path))
+    if pid is not None and not process_alive(pid):
+        return True
+    return time.time() - os.path.getmtime(path) > max_age
+
+
+def purge_stale_workspaces(root=None, max_age=None):
+    """
+    Removes workspaces left behind by crashed or killed processes on this
+    host and returns the number of removed directories.
+    """
+    host_dir = host_workspace_dir(root)
+    if not os.path.isdir(host_dir):
+        return 0
+    max_age = max_age or settings.QUIZ_WORKSPACE_MAX_AGE_SECONDS
+    stale = [
+        entry.path for entry in os.scandir(host_dir)
+        if entry.name.startswith(WORKSPACE_PREFIX) and is_stale(entry.path, max_age)
+    ]
+    for path in stale:
+        remove_workspace(path)
+    if stale:
+        logger.info("Removed %d stale quiz workspaces from %s", len(stale), host_dir)
+    return len(stale)
@@ -0,0 +1,116 @@
+import yt_dlp
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+INFO_OPTIONS = {
+    "format": "bestaudio/best",
+    "quiet": True,
+    "skip_download": True,
+    "no_warnings": True,
+}
+
+METADATA_KEYS = ("id", "title", "duration")
+CAPTION_KEYS = ("subtitles", "automatic_captions")
+STREAM_KEYS = ("url", "manifest_url", "fragment_base_url", "fragments", "http_headers")
+
+PLAYLIST_OPTIONS = {
+    "extract_flat": "in_playlist",
+    "quiet": True,
+    "skip_download": True,
+    "no_warnings": True,
+}
+
+
+def info_cache_key(video_id):
+    """
+    Returns the cache key of the metadata of a video.
+    """
+    return f"youtube-info:{video_id}"
+
+
+def video_url(video_id):
+    """
+    Returns the canonical watch URL of a video.
+    """
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+
+def playlist_url(playlist_id):
+    """
+    Returns the canonical URL of a playlist.
+    """
+    return f"https://www.youtube.com/playlist?list={playlist_id}"
+
+
+def extract_video_info(video_id):
+    """
+    Extracts the info dict of a video (duration, title, available formats,
+    subtitles, ...) with yt-dlp without downloading anything. The result
+    is sanitized so it can be passed to the download. Its stream and
+    caption URLs are signed for the extracting IP and expire, so it is
+    only used right away and never cached (see `video_metadata`).
+    """
+    with yt_dlp.YoutubeDL(INFO_OPTIONS) as ydl:
+        info = ydl.extract_info(video_url(video_id), download=False)
+        return ydl.sanitize_info(info)
+
+
+def without_stream_urls(entry):
+    """
+    Returns a format or caption track of an info dict without its signed
+    URLs and request headers.
+    """
+    return {key: value for key, value in entry.items() if key not in STREAM_KEYS}
+
+
+def video_metadata(info):
+    """
+    Returns the part of an info dict that stays valid on every host: id,
+    title, duration, the formats and the WebVTT caption tracks per
+    language, all without their URLs.
+    """
+    metadata = {key: info.get(key) for key in METADATA_KEYS}
+    metadata["formats"] = [without_stream_urls(f) for f in info.get("formats") or []]
+    for key in CAPTION_KEYS:
+        metadata[key] = {
+            language: [without_stream_urls(track) for track in tracks if track.get("ext") == "vtt"]
+            for language, tracks in (info.get(key) or {}).items()
+        }
+    return metadata
+
+
+def extract_playlist_entries(playlist_id, limit):
+    """
+    Returns the first `limit` entries of a playlist (id, title, duration)
+    using flat extraction, which reads only the playlist pages instead of
+    extracting every video.
+    """
+    options = dict(PLAYLIST_OPTIONS, playlistend=limit)
+    with yt_dlp.YoutubeDL(options) as ydl:
+        info = ydl.extract_info(playlist_url(playlist_id), download=False)
+    return [entry for entry in info.get("entries") or [] if entry]
+
+
+def get_video_info(video_id):
+    """
+    Returns the metadata of a video (see `video_metadata`) from the cache,
+    or extracts and caches it for YOUTUBE_INFO_TTL_SECONDS. It serves URL
+    validation and scheduling; the download stage extracts fresh stream
+    URLs with `extract_video_info`.
+    """
+    key = info_cache_key(video_id)
+    metadata = cache.get(key)
+    if metadata is None:
+        metadata = video_metadata(extract_video_info(video_id))
+        cache.set(key, metadata, settings.YOUTUBE_INFO_TTL_SECONDS)
+    return metadata
+
+
+def peek_video_info(video_id):
+    """
+    Returns the cached metadata of a video, or `None` if it is not cached.
+    Never calls YouTube.
+    """
+    return cache.get(info_cache_key(video_id))
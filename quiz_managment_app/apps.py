@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class QuizManagmentAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quiz_managment_app'
+
+    def ready(self):
+        """
+        Removes scratch directories left behind by crashed generation
+        processes when the application starts and optionally pre-loads the
+        configured Whisper models (with gunicorn's `--preload` the weights
+        are then shared by all forked workers).
+        """
+        if settings.QUIZ_WORKSPACE_PURGE_ON_STARTUP:
+            from .api.workspace import purge_stale_workspaces
+            purge_stale_workspaces()
+        if settings.WHISPER_PRELOAD_MODELS:
+            from .api.whisper_models import warm_up
+            warm_up()
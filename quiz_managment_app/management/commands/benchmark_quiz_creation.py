@@ -0,0 +1,112 @@
+import asyncio
+import itertools
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class Command(BaseCommand):
+    """
+    Management command that sends concurrent quiz creation requests to a
+    running WSGI server (queued `createQuiz/` path, polled until the job is
+    done) and a running ASGI server (`createQuiz/async/`), and compares
+    their latency and throughput. Repeated videos are served from the
+    quiz cache, so pass distinct videos to measure full generations.
+    Both paths admit at most QUIZ_MAX_ACTIVE_JOBS_PER_USER generations of
+    one user at a time and answer the rest with HTTP 429, so the default
+    concurrency is that limit; raise the limit on both servers to test
+    with more concurrent requests.
+    """
+    help = "Load-tests the WSGI and the async ASGI quiz creation paths."
+
+    def add_arguments(self, parser):
+        """
+        Adds the video URLs and options for the user, both server addresses,
+        the number of requests, the concurrency and the poll interval.
+        """
+        parser.add_argument("video_urls", nargs="+")
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--wsgi-base", default="http://127.0.0.1:8000")
+        parser.add_argument("--asgi-base", default="http://127.0.0.1:8001")
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument(
+            "--concurrency", type=int, default=settings.QUIZ_MAX_ACTIVE_JOBS_PER_USER,
+            help="Concurrent requests (default QUIZ_MAX_ACTIVE_JOBS_PER_USER). Requests beyond "
+                 "the per-user admission limit of the servers are rejected with HTTP 429.",
+        )
+        parser.add_argument("--poll-seconds", type=float, default=1.0)
+        parser.add_argument("--skip-wsgi", action="store_true")
+        parser.add_argument("--skip-asgi", action="store_true")
+
+    def handle(self, *args, **options):
+        """
+        Runs the load test against each server and prints the results.
+        """
+        user = get_user_model().objects.get(username=options["username"])
+        self.cookies = {"access_token": str(AccessToken.for_user(user))}
+        self.options = options
+        for name, base, create in (
+            ("WSGI", options["wsgi_base"], self.create_queued),
+            ("ASGI", options["asgi_base"], self.create_async),
+        ):
+            if not options[f"skip_{name.lower()}"]:
+                self.report(name, *asyncio.run(self.run_load(base, create)))
+
+    async def run_load(self, base, create):
+        """
+        Sends the requests with the configured concurrency and returns the
+        wall time and the latencies of the successful requests.
+        """
+        import httpx
+        limit = asyncio.Semaphore(self.options["concurrency"])
+        urls = itertools.islice(itertools.cycle(self.options["video_urls"]), self.options["requests"])
+        timeout = httpx.Timeout(None)
+        async with httpx.AsyncClient(base_url=base, cookies=self.cookies, timeout=timeout) as client:
+            started = time.perf_counter()
+            results = await asyncio.gather(*(self.timed(limit, create, client, url) for url in urls))
+            return time.perf_counter() - started, [latency for latency in results if latency]
+
+    async def timed(self, limit, create, client, url):
+        """
+        Returns the latency of one successful creation, or `None`.
+        """
+        async with limit:
+            started = time.perf_counter()
+            ok = await create(client, url)
+            return time.perf_counter() - started if ok else None
+
+    async def create_queued(self, client, url):
+        """
+        Queues a job on the WSGI path and polls it until it is finished.
+        """
+        response = await client.post("/api/createQuiz/", json={"url": url})
+        if response.status_code != 202:
+            return False
+        job_url = response.headers["Location"]
+        while response.json()["status"] not in ("done", "failed"):
+            await asyncio.sleep(self.options["poll_seconds"])
+            response = await client.get(job_url)
+        return response.json()["status"] == "done"
+
+    async def create_async(self, client, url):
+        """
+        Creates a quiz on the async ASGI path.
+        """
+        response = await client.post("/api/createQuiz/async/", json={"url": url})
+        return response.status_code == 201
+
+    def report(self, name, wall_seconds, latencies):
+        """
+        Prints the success count, throughput and latency percentiles.
+        """
+        ok = len(latencies)
+        self.stdout.write(f"{name}: {ok}/{self.options['requests']} ok in {wall_seconds:.1f}s "
+                          f"({ok / wall_seconds:.2f} quizzes/s)")
+        if ok > 1:
+            cuts = statistics.quantiles(latencies, n=20)
+            self.stdout.write(f"  latency p50 {statistics.median(latencies):.1f}s, "
+                              f"p95 {cuts[18]:.1f}s, max {max(latencies):.1f}s")
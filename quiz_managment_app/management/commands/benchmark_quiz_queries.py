@@ -0,0 +1,136 @@
+import statistics
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from quiz_managment_app.api.queries import quiz_summaries, quizzes_with_questions
+from quiz_managment_app.models import Question, Quiz
+
+
+FOREIGN_KEY_INDEXES = {
+    Quiz: models.Index(fields=["owner"], name="benchmark_quiz_owner_idx"),
+    Question: models.Index(fields=["quiz"], name="benchmark_question_quiz_idx"),
+}
+
+class Command(BaseCommand):
+    """
+    Management command that shows the query plans and latencies of the
+    quiz list and question queries without and with the composite indexes
+    on `Quiz` and `Question`. Without them, the plain foreign key indexes
+    they replace are created, as before the indexes were added. A large
+    dataset is seeded and the indexes are swapped inside one transaction
+    that is rolled back, so the database is left unchanged. Works on
+    SQLite and PostgreSQL.
+    """
+    help = "Benchmarks the quiz queries without and with the composite indexes."
+
+    def add_arguments(self, parser):
+        """
+        Adds options for the size of the seeded dataset and the number of
+        timed runs per query.
+        """
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--quizzes-per-user", type=int, default=200)
+        parser.add_argument("--questions-per-quiz", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        """
+        Seeds the data, reports the queries without and with the indexes
+        and rolls everything back. Foreign key checks are disabled first,
+        because SQLite cannot alter tables inside a transaction otherwise.
+        """
+        self.options = options
+        connection.disable_constraint_checking()
+        try:
+            with transaction.atomic():
+                owner = self.seed()
+                self.swap_indexes(composite=False)
+                self.report("Foreign key indexes only", owner)
+                self.swap_indexes(composite=True)
+                self.report("With composite indexes", owner)
+                transaction.set_rollback(True)
+        finally:
+            connection.enable_constraint_checking()
+
+    def seed(self):
+        """
+        Creates the users, their quizzes and questions in bulk, refreshes
+        the planner statistics and returns the user whose library is queried.
+        """
+        prefix = uuid.uuid4().hex[:8]
+        users = get_user_model().objects.bulk_create([
+            get_user_model()(username=f"benchmark-{prefix}-{index}", password="!")
+            for index in range(self.options["users"])
+        ])
+        quizzes = Quiz.objects.bulk_create([
+            Quiz(owner=user, title=f"Quiz {index}", description="Benchmark", video_url="")
+            for user in users for index in range(self.options["quizzes_per_user"])
+        ], batch_size=1000)
+        Question.objects.bulk_create([
+            Question(quiz=quiz, question_title=f"Question {index}", question_options=["A", "B", "C", "D"], answer="A")
+            for quiz in quizzes for index in range(self.options["questions_per_quiz"])
+        ], batch_size=1000)
+        self.analyze()
+        return users[len(users) // 2]
+
+    def swap_indexes(self, composite):
+        """
+        Replaces the foreign key indexes of `Quiz` and `Question` with their
+        composite indexes or the other way round with the schema editor,
+        then refreshes the planner statistics.
+        """
+        with connection.schema_editor() as editor:
+            for model, foreign_key_index in FOREIGN_KEY_INDEXES.items():
+                removed, added = [foreign_key_index], model._meta.indexes
+                if not composite:
+                    removed, added = added, removed
+                for index in removed:
+                    editor.remove_index(model, index)
+                for index in added:
+                    editor.add_index(model, index)
+        self.analyze()
+
+    def analyze(self):
+        """
+        Updates the statistics the query planner chooses indexes by.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def queries(self, owner):
+        """
+        Returns the benchmarked querysets: a page of the quiz list (with
+        its question prefetch), a page of summaries and one quiz's questions.
+        """
+        ordering, page_size = ("-created_at", "-id"), settings.QUIZ_LIST_PAGE_SIZE
+        quiz = Quiz.objects.filter(owner=owner).first()
+        return {
+            "Quiz list page": quizzes_with_questions(owner).order_by(*ordering)[:page_size],
+            "Quiz summary page": quiz_summaries(owner).order_by(*ordering)[:page_size],
+            "Questions of a quiz": Question.objects.filter(quiz=quiz).order_by("id"),
+        }
+
+    def report(self, title, owner):
+        """
+        Prints the median latency and the query plan of every query.
+        """
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{title} ({connection.vendor})"))
+        for name, queryset in self.queries(owner).items():
+            self.stdout.write(f"{name}: {self.median_ms(queryset):.2f} ms")
+            self.stdout.write(queryset.explain())
+
+    def median_ms(self, queryset):
+        """
+        Returns the median wall time of evaluating the queryset, in ms.
+        """
+        timings = []
+        for _ in range(self.options["repeat"]):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
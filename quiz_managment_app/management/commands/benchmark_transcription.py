@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quiz_managment_app.api.audio import SAMPLE_RATE
+from quiz_managment_app.api.transcription import create_pool, transcribe_parallel, transcribe_serial, warm_up_pool
+from quiz_managment_app.api.whisper_models import get_whisper_model
+
+
+class Command(BaseCommand):
+    """
+    Management command that compares the wall time of the serial
+    `transcribe_audio` path with the parallel chunked transcription on the
+    same audio file. Model loading is excluded from both measurements.
+    """
+    help = "Benchmarks serial against parallel chunked Whisper transcription."
+
+    def add_arguments(self, parser):
+        """
+        Adds the audio file argument and options for the worker count, the
+        chunk length and skipping the serial run.
+        """
+        parser.add_argument("audio_file")
+        parser.add_argument("--workers", type=int, default=None)
+        parser.add_argument("--chunk-seconds", type=float, default=None)
+        parser.add_argument("--skip-serial", action="store_true")
+
+    def handle(self, *args, **options):
+        """
+        Decodes the audio once, runs both modes and prints their wall times
+        and the speedup.
+        """
+        import whisper
+        audio = whisper.load_audio(options["audio_file"], sr=SAMPLE_RATE)
+        self.stdout.write(f"Audio length: {len(audio) / SAMPLE_RATE:.0f}s")
+        workers = options["workers"] or max(settings.WHISPER_PARALLEL_WORKERS, 2)
+        chunk_seconds = options["chunk_seconds"] or settings.WHISPER_CHUNK_SECONDS
+
+        parallel = self.time_parallel(audio, workers, chunk_seconds)
+        self.stdout.write(f"Parallel ({workers} workers, {chunk_seconds:.0f}s chunks): {parallel:.1f}s")
+        if not options["skip_serial"]:
+            serial = self.time_serial(audio, chunk_seconds)
+            self.stdout.write(f"Serial: {serial:.1f}s, speedup {serial / parallel:.2f}x")
+
+    def time_serial(self, audio, chunk_seconds):
+        """
+        Returns the wall time of transcribing the same chunks one after
+        another with the shared model.
+        """
+        get_whisper_model()
+        started = time.perf_counter()
+        transcribe_serial(audio, chunk_seconds)
+        return time.perf_counter() - started
+
+    def time_parallel(self, audio, workers, chunk_seconds):
+        """
+        Returns the wall time of the chunked transcription in a pool whose
+        processes were started and loaded before the measurement.
+        """
+        with create_pool(workers) as pool:
+            warm_up_pool(pool, workers)
+            started = time.perf_counter()
+            transcribe_parallel(audio, pool=pool, chunk_seconds=chunk_seconds)
+            return time.perf_counter() - started
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from quiz_managment_app.api.audio_cache import audio_cache_stats
+from quiz_managment_app.api.jobs import default_worker_id, run_worker
+from quiz_managment_app.api.transcription import get_pool, warm_up_pool
+from quiz_managment_app.api.whisper_models import warm_up
+
+
+class Command(BaseCommand):
+    """
+    Management command that starts a quiz generation worker. Any number of
+    workers on any number of nodes can run against the same database.
+    """
+    help = "Processes queued quiz generation jobs."
+
+    def add_arguments(self, parser):
+        """
+        Adds options for the worker id, the poll interval, one-shot mode
+        and skipping the Whisper warm-up.
+        """
+        parser.add_argument("--worker-id", default=None)
+        parser.add_argument("--poll-seconds", type=float, default=None)
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty."
+        )
+        parser.add_argument(
+            "--skip-warm-up", action="store_true",
+            help="Load the Whisper model on the first job instead of at boot.",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Warms up the Whisper models and runs the worker loop until
+        interrupted (or until the queue is empty when `--once` is given).
+        """
+        worker_id = options["worker_id"] or default_worker_id()
+        poll_seconds = options["poll_seconds"] or settings.QUIZ_WORKER_POLL_SECONDS
+        if not options["skip_warm_up"]:
+            self.warm_up()
+        if settings.QUIZ_AUDIO_CACHE_ENABLED:
+            self.report_audio_cache()
+        self.stdout.write(f"Quiz worker {worker_id} started.")
+        run_worker(worker_id, poll_seconds, once=options["once"])
+
+    def warm_up(self):
+        """
+        Loads the Whisper models (and starts the transcription pool in
+        parallel mode) before the first job is claimed and prints their
+        load time and the resident memory afterwards.
+        """
+        if settings.WHISPER_PARALLEL_WORKERS > 1:
+            warm_up_pool(get_pool(), settings.WHISPER_PARALLEL_WORKERS)
+            self.stdout.write(f"Started {settings.WHISPER_PARALLEL_WORKERS} transcription processes.")
+        models = [settings.WHISPER_MODEL] + settings.WHISPER_PRELOAD_MODELS
+        for name, stats in warm_up(models).items():
+            self.stdout.write(
+                f"Whisper model '{name}' loaded in {stats['load_seconds']}s, "
+                f"resident memory {stats['rss_bytes'] / 2**20:.0f} MB."
+            )
+
+    def report_audio_cache(self):
+        """
+        Prints the size and the hit and miss counters of this host's audio cache.
+        """
+        stats = audio_cache_stats()
+        self.stdout.write(
+            f"Audio cache: {stats['files']} files, {(stats['bytes'] or 0) / 2**20:.0f} MB, "
+            f"{stats['hits'] or 0} hits, {stats['misses'] or 0} misses."
+        )
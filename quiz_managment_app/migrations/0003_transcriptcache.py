@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0002_quizjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranscriptCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=64)),
+                ('model_version', models.CharField(max_length=64)),
+                ('text', models.TextField()),
+                ('size_bytes', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('video_id', 'model_name', 'model_version'), name='unique_transcript_per_video_and_model')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:11
+
+from urllib.parse import parse_qs, urlparse
+
+from django.db import migrations, models
+
+
+def fill_video_ids(apps, schema_editor):
+    QuizJob = apps.get_model('quiz_managment_app', 'QuizJob')
+    for job in QuizJob.objects.filter(video_id=''):
+        job.video_id = parse_qs(urlparse(job.url).query).get('v', [''])[0]
+        job.save(update_fields=['video_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0003_transcriptcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='video_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(fill_video_ids, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='GeneratedQuizCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=64)),
+                ('prompt_version', models.CharField(max_length=32)),
+                ('model_name', models.CharField(max_length=64)),
+                ('payload', models.JSONField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('video_id', 'prompt_version', 'model_name'), name='unique_generated_quiz_per_video_prompt_and_model')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0004_generatedquizcache_quizjob_video_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='transcript_source',
+            field=models.CharField(blank=True, choices=[('cache', 'Cache'), ('captions', 'Captions'), ('auto_captions', 'Auto Captions'), ('whisper', 'Whisper')], default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:26
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def schedule_by_arrival(apps, schema_editor):
+    QuizJob = apps.get_model('quiz_managment_app', 'QuizJob')
+    QuizJob.objects.update(scheduled_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0005_quizjob_transcript_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='duration_seconds',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='estimated_seconds',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='scheduled_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(schedule_by_arrival, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0007_quizbatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AudioCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('video_id', models.CharField(max_length=64)),
+                ('host', models.CharField(max_length=255)),
+                ('size_bytes', models.PositiveBigIntegerField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('video_id', 'host'), name='unique_audio_per_video_and_host')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0008_audiocacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='progress_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizjob',
+            name='stage',
+            field=models.CharField(choices=[('queued', 'Queued'), ('validating', 'Validating'), ('downloading', 'Downloading'), ('transcribing', 'Transcribing'), ('generating', 'Generating'), ('saving', 'Saving'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=16),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-17 07:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0009_quizjob_progress'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='failed_stage',
+            field=models.CharField(blank=True, choices=[('queued', 'Queued'), ('validating', 'Validating'), ('downloading', 'Downloading'), ('transcribing', 'Transcribing'), ('generating', 'Generating'), ('saving', 'Saving'), ('done', 'Done'), ('failed', 'Failed')], default='', max_length=16),
+        ),
+        migrations.CreateModel(
+            name='StageTiming',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(choices=[('queued', 'Queued'), ('validating', 'Validating'), ('downloading', 'Downloading'), ('transcribing', 'Transcribing'), ('generating', 'Generating'), ('saving', 'Saving'), ('done', 'Done'), ('failed', 'Failed')], max_length=16)),
+                ('wall_seconds', models.FloatField()),
+                ('cpu_seconds', models.FloatField()),
+                ('peak_rss_bytes', models.PositiveBigIntegerField()),
+                ('bytes_processed', models.PositiveBigIntegerField(default=0)),
+                ('succeeded', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stage_timings', to='quiz_managment_app.quizjob')),
+            ],
+        ),
+    ]
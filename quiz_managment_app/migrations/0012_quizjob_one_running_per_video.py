@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-17 08:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def requeue_duplicate_running_jobs(apps, schema_editor):
+    """
+    Puts all but one running job per video back into the queue, so the
+    unique constraint can be created on a database that raced before.
+    """
+    QuizJob = apps.get_model('quiz_managment_app', 'QuizJob')
+    running = QuizJob.objects.filter(status='running').exclude(video_id='').order_by('video_id', 'id')
+    seen = set()
+    for job in running.only('id', 'video_id'):
+        if job.video_id in seen:
+            QuizJob.objects.filter(id=job.id).update(status='pending', lease_owner='', lease_expires_at=None)
+        seen.add(job.video_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0011_quiz_question_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(requeue_duplicate_running_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='quizjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'running'), models.Q(('video_id', ''), _negated=True)), fields=('video_id',), name='quizjob_one_running_per_video'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-17 08:16
+
+from django.db import migrations, models
+
+
+def split_cached_source(apps, schema_editor):
+    """
+    Replaces the old "cache" transcript source of jobs with the new flag.
+    The original source of those transcripts was never stored, so cached
+    transcripts are dropped and fetched again with their source.
+    """
+    QuizJob = apps.get_model('quiz_managment_app', 'QuizJob')
+    TranscriptCache = apps.get_model('quiz_managment_app', 'TranscriptCache')
+    QuizJob.objects.filter(transcript_source='cache').update(transcript_source='', transcript_cached=True)
+    TranscriptCache.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quiz_managment_app', '0012_quizjob_one_running_per_video'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizjob',
+            name='transcript_cached',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='transcriptcache',
+            name='source',
+            field=models.CharField(choices=[('captions', 'Captions'), ('auto_captions', 'Auto Captions'), ('whisper', 'Whisper')], default='whisper', max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='quizjob',
+            name='transcript_source',
+            field=models.CharField(blank=True, choices=[('captions', 'Captions'), ('auto_captions', 'Auto Captions'), ('whisper', 'Whisper')], default='', max_length=16),
+        ),
+        migrations.RunPython(split_cached_source, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Quiz(models.Model):
     """
@@ -12,14 +13,23 @@ class Quiz(models.Model):
         created_at (DateTimeField): Timestamp when the quiz was created.
         updated_at (DateTimeField): Timestamp when the quiz was last updated.
         video_url (CharField): URL of the YouTube video associated with the quiz.
+
+    The composite index matches the quiz list: a user's quizzes, newest
+    first, in the cursor pagination's order. It starts with the owner, so
+    it also serves the foreign key and replaces its own index.
     """
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="quiz")
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="quiz", db_index=False)
     title = models.CharField(max_length=255)
     description = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     video_url = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "-created_at", "-id"], name="quiz_owner_created_idx"),
+        ]
+
 class Question(models.Model):
     """
     Represents a single question within a quiz.
@@ -31,10 +41,296 @@ class Question(models.Model):
         answer (CharField): Correct answer for the question.
         created_at (DateTimeField): Timestamp when the question was created.
         updated_at (DateTimeField): Timestamp when the question was last updated.
+
+    Questions are always read per quiz in id order, which the composite
+    index serves without a sort. It also serves the foreign key (lookups
+    and cascading deletes by quiz), which therefore has no index of its own.
     """
-    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="questions")
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name="questions", db_index=False)
     question_title = models.CharField(max_length=255)
     question_options = models.JSONField(default=list)
     answer = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["quiz", "id"], name="question_quiz_id_idx"),
+        ]
+
+
+class QuizBatch(models.Model):
+    """
+    Represents a set of quiz generations requested at once, e.g. all
+    videos of a course. Each accepted video is generated by its own job.
+
+    Attributes:
+        owner (ForeignKey): The user who requested the batch.
+        rejected (JSONField): URLs that failed validation, with their errors.
+        created_at (DateTimeField): Timestamp when the batch was created.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="quiz_batches")
+    rejected = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class QuizJob(models.Model):
+    """
+    Represents a queued quiz generation for a YouTube URL. Jobs are
+    claimed by worker processes using time-limited leases, so several
+    worker nodes can share one database.
+
+    Attributes:
+        owner (ForeignKey): The user who requested the quiz.
+        batch (ForeignKey): The batch the job belongs to, if any.
+        url (CharField): Canonical YouTube URL the quiz is generated from.
+        video_id (CharField): YouTube video ID of the URL. At most one job
+            per video can be running at a time.
+        status (CharField): Current state of the job.
+        stage (CharField): Current pipeline stage of the job.
+        progress (JSONField): Details of the current stage, e.g. downloaded bytes.
+        progress_version (PositiveIntegerField): Incremented on every stage or progress update.
+        quiz (ForeignKey): The generated quiz once the job is done.
+        error (TextField): Error message if the job failed.
+        failed_stage (CharField): The pipeline stage in which the job failed.
+        transcript_source (CharField): Where the transcript originally came from.
+        transcript_cached (BooleanField): Whether the transcript was served
+            from the transcript cache.
+        attempts (PositiveIntegerField): How often a worker claimed the job.
+        lease_owner (CharField): Identifier of the worker holding the job.
+        lease_expires_at (DateTimeField): When the current lease runs out.
+        duration_seconds (PositiveIntegerField): Length of the video, if known.
+        estimated_seconds (FloatField): Estimated processing time of the job.
+        scheduled_at (DateTimeField): Scheduling key; jobs are claimed in this order.
+        started_at (DateTimeField): When a worker last claimed the job.
+        created_at (DateTimeField): Timestamp when the job was enqueued.
+        updated_at (DateTimeField): Timestamp when the job was last updated.
+    """
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        DONE = "done"
+        FAILED = "failed"
+
+    class Stage(models.TextChoices):
+        QUEUED = "queued"
+        VALIDATING = "validating"
+        DOWNLOADING = "downloading"
+        TRANSCRIBING = "transcribing"
+        GENERATING = "generating"
+        SAVING = "saving"
+        DONE = "done"
+        FAILED = "failed"
+
+    class TranscriptSource(models.TextChoices):
+        CAPTIONS = "captions"
+        AUTO_CAPTIONS = "auto_captions"
+        WHISPER = "whisper"
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="quiz_jobs")
+    batch = models.ForeignKey(
+        QuizBatch, on_delete=models.CASCADE, null=True, blank=True, related_name="jobs"
+    )
+    url = models.CharField(max_length=255)
+    video_id = models.CharField(max_length=64, blank=True, default="")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    stage = models.CharField(max_length=16, choices=Stage.choices, default=Stage.QUEUED)
+    progress = models.JSONField(default=dict, blank=True)
+    progress_version = models.PositiveIntegerField(default=0)
+    quiz = models.ForeignKey(Quiz, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs")
+    error = models.TextField(blank=True, default="")
+    failed_stage = models.CharField(max_length=16, choices=Stage.choices, blank=True, default="")
+    transcript_source = models.CharField(
+        max_length=16, choices=TranscriptSource.choices, blank=True, default=""
+    )
+    transcript_cached = models.BooleanField(default=False)
+    attempts = models.PositiveIntegerField(default=0)
+    lease_owner = models.CharField(max_length=255, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+    estimated_seconds = models.FloatField(default=0)
+    scheduled_at = models.DateTimeField(default=timezone.now, db_index=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id"],
+                condition=models.Q(status="running") & ~models.Q(video_id=""),
+                name="quizjob_one_running_per_video",
+            ),
+        ]
+
+    def jobs_ahead(self):
+        """
+        Returns the pending jobs that workers will claim before this one,
+        by scheduling key. The fair share between owners applied when a
+        job is claimed is ignored, so positions and estimates are
+        approximate while several users have jobs queued.
+        """
+        earlier = models.Q(scheduled_at__lt=self.scheduled_at) | models.Q(
+            scheduled_at=self.scheduled_at, id__lt=self.id
+        )
+        return QuizJob.objects.filter(earlier, status=self.Status.PENDING)
+
+    def queue_position(self):
+        """
+        Returns the 1-based position of a pending job in scheduling order,
+        or `None` once a worker picked it up.
+        """
+        if self.status != self.Status.PENDING:
+            return None
+        return self.jobs_ahead().count() + 1
+
+
+class StageTiming(models.Model):
+    """
+    Records the resources one pipeline stage of a job used, so slow or
+    memory-hungry stages can be queried per quiz and aggregated into
+    metrics. A job has one record per stage and attempt.
+
+    Attributes:
+        job (ForeignKey): The job the stage belongs to.
+        stage (CharField): The measured pipeline stage.
+        wall_seconds (FloatField): Elapsed wall-clock time.
+        cpu_seconds (FloatField): CPU time of the process and its finished
+            child processes (e.g. ffmpeg) during the stage.
+        peak_rss_bytes (PositiveBigIntegerField): Peak resident memory of
+            the process during the stage.
+        bytes_processed (PositiveBigIntegerField): Bytes the stage handled,
+            e.g. downloaded audio or transcript text.
+        succeeded (BooleanField): Whether the stage finished without error.
+        created_at (DateTimeField): Timestamp when the stage ended.
+    """
+    job = models.ForeignKey(QuizJob, on_delete=models.CASCADE, related_name="stage_timings")
+    stage = models.CharField(max_length=16, choices=QuizJob.Stage.choices)
+    wall_seconds = models.FloatField()
+    cpu_seconds = models.FloatField()
+    peak_rss_bytes = models.PositiveBigIntegerField()
+    bytes_processed = models.PositiveBigIntegerField(default=0)
+    succeeded = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class MetricCounter(models.Model):
+    """
+    Holds the running value of one Prometheus sample, e.g. the failures of
+    a stage. Rows are only ever incremented (or raised, for peaks) and
+    never deleted, so counters stay monotonic when jobs and their stage
+    timings are deleted.
+
+    Attributes:
+        name (CharField): Metric name including a histogram suffix.
+        labels (CharField): Label set in Prometheus syntax, e.g.
+            `{stage="generating"}`, empty without labels.
+        value (FloatField): Current value of the sample.
+    """
+    name = models.CharField(max_length=64)
+    labels = models.CharField(max_length=255, blank=True, default="")
+    value = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["name", "labels"], name="unique_metric_sample"),
+        ]
+
+
+class TranscriptCache(models.Model):
+    """
+    Stores the transcript of a YouTube video, shared by all users, so the
+    audio download and the Whisper pass run only once per video and model.
+    Transcripts taken from captions are stored without a model.
+
+    Attributes:
+        video_id (CharField): Canonical YouTube video ID.
+        model_name (CharField): Whisper model size used for transcription,
+            empty for captions.
+        model_version (CharField): Installed Whisper package version, empty
+            for captions.
+        source (CharField): Where the transcript originally came from.
+        text (TextField): The transcript.
+        size_bytes (PositiveIntegerField): UTF-8 size of the transcript.
+        created_at (DateTimeField): Timestamp when the transcript was stored.
+        last_used_at (DateTimeField): Timestamp of the last cache hit.
+    """
+    video_id = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=64)
+    model_version = models.CharField(max_length=64)
+    source = models.CharField(
+        max_length=16, choices=QuizJob.TranscriptSource.choices, default=QuizJob.TranscriptSource.WHISPER
+    )
+    text = models.TextField()
+    size_bytes = models.PositiveIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "model_name", "model_version"],
+                name="unique_transcript_per_video_and_model",
+            )
+        ]
+
+
+class GeneratedQuizCache(models.Model):
+    """
+    Stores the AI generated quiz JSON of a video, so further requests for
+    the same video only copy the questions instead of running the pipeline.
+
+    Attributes:
+        video_id (CharField): Canonical YouTube video ID.
+        prompt_version (CharField): Version of the generation prompt.
+        model_name (CharField): Gemini model that generated the quiz.
+        payload (JSONField): Generated quiz with title, description and questions.
+        hits (PositiveIntegerField): Number of quizzes built from this entry.
+        created_at (DateTimeField): Timestamp when the quiz was generated.
+    """
+    video_id = models.CharField(max_length=64)
+    prompt_version = models.CharField(max_length=32)
+    model_name = models.CharField(max_length=64)
+    payload = models.JSONField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "prompt_version", "model_name"],
+                name="unique_generated_quiz_per_video_prompt_and_model",
+            )
+        ]
+
+
+class AudioCacheEntry(models.Model):
+    """
+    Tracks a compact audio file (the smallest audio-only stream, e.g. Opus
+    or m4a) kept on a host's disk, so retries and re-generations of a
+    video do not download it again.
+
+    Attributes:
+        video_id (CharField): Canonical YouTube video ID.
+        host (CharField): Host name of the node whose disk holds the file.
+        size_bytes (PositiveBigIntegerField): Size of the file.
+        hits (PositiveIntegerField): Number of times the file was reused.
+        misses (PositiveIntegerField): Number of times it had to be downloaded.
+        created_at (DateTimeField): Timestamp of the last download.
+        last_used_at (DateTimeField): Timestamp of the last use.
+    """
+    video_id = models.CharField(max_length=64)
+    host = models.CharField(max_length=255)
+    size_bytes = models.PositiveBigIntegerField()
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["video_id", "host"],
+                name="unique_audio_per_video_and_host",
+            )
+        ]
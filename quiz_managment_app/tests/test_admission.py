@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.exceptions import Throttled
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.jobs import enqueue_quiz_job
+from quiz_managment_app.models import QuizJob
+
+
+@override_settings(QUIZ_MAX_ACTIVE_JOBS=3, QUIZ_MAX_ACTIVE_JOBS_PER_USER=2, QUIZ_ADMISSION_RETRY_AFTER_SECONDS=15)
+class AdmissionControlTest(APITestCase):
+    """
+    Test case for the admission control of createQuiz. Verifies the per-user
+    and the global limit and the queue position of admitted jobs.
+    """
+    def setUp(self):
+        """
+        Sets up two users, authenticates as user1 and queues one job for user2.
+        """
+        self.user1 = User.objects.create_user(username="testuser1", password="testpassword1")
+        self.user2 = User.objects.create_user(username="testuser2", password="testpassword2")
+        self.client.force_authenticate(self.user1)
+        enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=other1")
+        self.url = reverse("create-quiz")
+
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    def test_admitted_job_has_queue_position(self, mock_validate_duration):
+        """
+        Ensures that an admitted request is queued behind the existing job.
+        """
+        response = self.client.post(self.url, {"url": "https://youtu.be/abc1"}, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["queue_position"], 2)
+
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    def test_user_limit_rejects_before_validation(self, mock_validate_duration):
+        """
+        Ensures that a user at the limit gets HTTP 429 with Retry-After and
+        that the URL is not validated against YouTube.
+        """
+        for video in ("abc1", "abc2"):
+            enqueue_quiz_job(self.user1, f"https://www.youtube.com/watch?v={video}")
+
+        response = self.client.post(self.url, {"url": "https://youtu.be/abc3"}, format="json")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "15")
+        mock_validate_duration.assert_not_called()
+
+    def test_global_limit_rejects_enqueue(self):
+        """
+        Ensures that no job is queued beyond the global limit, even for a
+        request that passed the throttle before the limit was reached.
+        """
+        enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=other2")
+        enqueue_quiz_job(self.user1, "https://www.youtube.com/watch?v=abc1")
+
+        with self.assertRaises(Throttled):
+            enqueue_quiz_job(self.user1, "https://www.youtube.com/watch?v=abc2")
+        self.assertEqual(QuizJob.objects.count(), 3)
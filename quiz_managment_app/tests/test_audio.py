@@ -0,0 +1,76 @@
+import asyncio
+import subprocess
+import sys
+import numpy as np
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.audio import SAMPLE_RATE, decode_audio, decode_audio_stream_async, smallest_audio_format
+
+
+WRITE_STDOUT = "import sys; sys.stdout.buffer.write(bytes.fromhex(sys.argv[1]) * int(sys.argv[2]))"
+
+
+class AudioFormatSelectionTest(SimpleTestCase):
+    """
+    Test case for choosing and decoding the stream for Whisper. Verifies
+    that the smallest audio-only format is selected and that the decoder
+    output is streamed with progress. A Python process stands in for ffmpeg.
+    """
+    def test_smallest_audio_only_format_is_selected(self):
+        """
+        Ensures that video formats are ignored and that formats without a
+        file size are compared by their bitrate.
+        """
+        info = {
+            "duration": 600,
+            "formats": [
+                {"format_id": "18", "acodec": "mp4a", "vcodec": "avc1", "url": "u", "filesize": 1000},
+                {"format_id": "140", "acodec": "mp4a", "vcodec": "none", "url": "u", "filesize": 9_000_000},
+                {"format_id": "249", "acodec": "opus", "vcodec": "none", "url": "u", "abr": 50},
+                {"format_id": "251", "acodec": "opus", "vcodec": "none", "url": "u", "abr": 130},
+            ],
+        }
+
+        self.assertEqual(smallest_audio_format(info)["format_id"], "249")
+
+    def test_no_audio_only_format(self):
+        """
+        Ensures that `None` is returned when only muxed formats exist.
+        """
+        info = {"formats": [{"acodec": "mp4a", "vcodec": "avc1", "url": "u"}]}
+
+        self.assertIsNone(smallest_audio_format(info))
+
+    @patch("quiz_managment_app.api.audio.decode_command")
+    def test_decode_reports_progress_while_reading(self, mock_command):
+        """
+        Ensures that the decoder output is read in blocks, reported as
+        decoded seconds and converted to Whisper's float32 format.
+        """
+        sample = np.int16(16384).tobytes().hex()
+        mock_command.return_value = ([sys.executable, "-c", WRITE_STDOUT, sample, str(3 * SAMPLE_RATE)], None)
+        decoded = []
+
+        audio = decode_audio("https://example.com/audio", on_progress=decoded.append)
+
+        self.assertEqual(len(audio), 3 * SAMPLE_RATE)
+        self.assertEqual(float(audio[0]), 0.5)
+        self.assertGreater(len(decoded), 1)
+        self.assertEqual(decoded[-1], 3.0)
+
+    @patch("quiz_managment_app.api.audio.decode_command")
+    def test_async_decode_matches_sync_decode(self, mock_command):
+        """
+        Ensures that the async decode awaits the same subprocess output and
+        raises `CalledProcessError` with ffmpeg's errors if it fails.
+        """
+        pcm = np.arange(1000, dtype=np.int16).tobytes()
+        mock_command.return_value = ([sys.executable, "-c", WRITE_STDOUT, pcm.hex(), "1"], None)
+        audio = asyncio.run(decode_audio_stream_async({"url": "https://example.com/audio"}))
+        np.testing.assert_array_equal(audio, decode_audio("https://example.com/audio"))
+
+        mock_command.return_value = ([sys.executable, "-c", "import sys; sys.exit('bad stream')"], None)
+        with self.assertRaises(subprocess.CalledProcessError) as failure:
+            asyncio.run(decode_audio_stream_async({"url": "https://example.com/audio"}))
+        self.assertIn(b"bad stream", failure.exception.stderr)
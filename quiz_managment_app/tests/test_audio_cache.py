@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+
+from quiz_managment_app.api.audio_cache import (
+    audio_cache_dir, audio_cache_stats, cached_audio_path, download_audio, fetch_cached_audio
+)
+
+
+def fake_download(info, audio_format, hooks=()):
+    """
+    Writes 100 bytes as the downloaded audio of a video and returns the
+    file opened for reading.
+    """
+    os.makedirs(audio_cache_dir(), exist_ok=True)
+    with open(cached_audio_path(info["id"]), "wb") as f:
+        f.write(b"x" * 100)
+    return open(cached_audio_path(info["id"]), "rb")
+
+
+class AudioCacheTest(TestCase):
+    """
+    Test case for the disk cache of compact audio files. Verifies hits,
+    LRU eviction within the byte budget and atomic downloads.
+    """
+    def setUp(self):
+        """
+        Points the cache to a temporary directory with room for two files.
+        """
+        self.root = tempfile.mkdtemp()
+        override = override_settings(QUIZ_AUDIO_CACHE_ROOT=self.root, QUIZ_AUDIO_CACHE_MAX_BYTES=250)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def tearDown(self):
+        """
+        Removes the temporary cache directory.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def info(self, video_id):
+        """
+        Returns an info dict with one audio-only format.
+        """
+        return {"id": video_id, "formats": [{"format_id": "251", "acodec": "opus", "vcodec": "none", "url": "u"}]}
+
+    @patch("quiz_managment_app.api.audio_cache.download_audio", side_effect=fake_download)
+    def test_second_fetch_is_served_from_disk(self, mock_download):
+        """
+        Ensures that a video is downloaded once and then counted as a hit.
+        """
+        with fetch_cached_audio(self.info("abc1")) as first, fetch_cached_audio(self.info("abc1")) as second:
+            self.assertEqual(first.read(), second.read())
+
+        self.assertEqual(mock_download.call_count, 1)
+        stats = audio_cache_stats()
+        self.assertEqual((stats["files"], stats["hits"], stats["misses"]), (1, 1, 1))
+
+    @patch("quiz_managment_app.api.audio_cache.download_audio", side_effect=fake_download)
+    def test_least_recently_used_file_is_evicted(self, mock_download):
+        """
+        Ensures that the oldest unused file is deleted once the budget is exceeded.
+        """
+        for video_id in ("abc1", "abc2", "abc2", "abc3"):
+            fetch_cached_audio(self.info(video_id)).close()
+
+        self.assertFalse(os.path.exists(cached_audio_path("abc1")))
+        self.assertEqual(audio_cache_stats()["bytes"], 200)
+
+    @override_settings(QUIZ_AUDIO_CACHE_MAX_BYTES=50)
+    @patch("quiz_managment_app.api.audio_cache.download_audio", side_effect=fake_download)
+    def test_file_larger_than_budget_is_kept(self, mock_download):
+        """
+        Ensures that storing a file never evicts that file itself, even if
+        it alone exceeds the budget, while older files are still evicted.
+        """
+        fetch_cached_audio(self.info("abc1")).close()
+        with fetch_cached_audio(self.info("abc2")) as audio:
+            self.assertEqual(len(audio.read()), 100)
+
+        self.assertTrue(os.path.exists(cached_audio_path("abc2")))
+        self.assertFalse(os.path.exists(cached_audio_path("abc1")))
+        self.assertEqual(audio_cache_stats()["files"], 1)
+
+    @patch("quiz_managment_app.api.audio_cache.download_audio", side_effect=fake_download)
+    def test_file_evicted_by_another_process_is_downloaded_again(self, mock_download):
+        """
+        Ensures that an entry whose file disappeared is treated as a miss.
+        """
+        fetch_cached_audio(self.info("abc1")).close()
+        os.remove(cached_audio_path("abc1"))
+
+        with fetch_cached_audio(self.info("abc1")) as audio:
+            self.assertEqual(len(audio.read()), 100)
+
+        self.assertEqual(mock_download.call_count, 2)
+        stats = audio_cache_stats()
+        self.assertEqual((stats["files"], stats["hits"], stats["misses"]), (1, 0, 2))
+
+    @patch("quiz_managment_app.api.audio_cache.yt_dlp.YoutubeDL")
+    def test_download_is_moved_into_place(self, mock_ydl):
+        """
+        Ensures that yt-dlp writes to a temporary file that is renamed to
+        the final path, leaving no partial file behind.
+        """
+        def write_partial(info, download):
+            with open(mock_ydl.call_args.args[0]["outtmpl"], "wb") as f:
+                f.write(b"audio")
+        mock_ydl.return_value.__enter__.return_value.process_ie_result.side_effect = write_partial
+
+        with download_audio(self.info("abc1"), self.info("abc1")["formats"][0]) as audio:
+            self.assertEqual(audio.read(), b"audio")
+
+        self.assertEqual(os.listdir(audio_cache_dir()), ["abc1.audio"])
@@ -0,0 +1,67 @@
+from django.test import TestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.captions import vtt_to_text
+from quiz_managment_app.api.jobs import load_transcript
+from quiz_managment_app.api.utils import QuizGenerator
+
+
+AUTO_CAPTION_VTT = """WEBVTT
+Kind: captions
+Language: de
+
+00:00:00.000 --> 00:00:02.000 align:start position:0%
+Heute<00:00:00.500><c> lernen</c><00:00:01.000><c> wir</c>
+
+00:00:02.000 --> 00:00:02.010 align:start position:0%
+Heute lernen wir
+
+00:00:02.010 --> 00:00:04.000 align:start position:0%
+Heute lernen wir
+Python &amp; Django
+"""
+
+
+class CaptionTranscriptTest(TestCase):
+    """
+    Test case for using YouTube captions as transcript source. Verifies the
+    WebVTT conversion and that captions replace download and Whisper.
+    """
+    def setUp(self):
+        """
+        Creates a QuizGenerator and video metadata with German captions.
+        """
+        self.processor = QuizGenerator()
+        self.addCleanup(self.processor.cleanup)
+        self.info = {
+            "subtitles": {},
+            "automatic_captions": {"de": [
+                {"ext": "json3", "url": "https://example.com/de.json3"},
+                {"ext": "vtt", "url": "https://example.com/de.vtt"},
+            ]},
+        }
+
+    def test_vtt_is_converted_to_plain_text(self):
+        """
+        Ensures that timing, tags and rolling duplicate lines are removed.
+        """
+        self.assertEqual(vtt_to_text(AUTO_CAPTION_VTT), "Heute lernen wir Python & Django")
+
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.fetch_audio_from_url")
+    @patch("quiz_managment_app.api.captions.download_caption")
+    @patch("quiz_managment_app.api.jobs.extract_video_info")
+    def test_captions_skip_audio_download(self, mock_info, mock_download, mock_fetch_audio):
+        """
+        Ensures that available captions are used as transcript without
+        downloading the audio and that the source is reported.
+        """
+        mock_info.return_value = self.info
+        mock_download.return_value = AUTO_CAPTION_VTT
+
+        text, source, cached = load_transcript(self.processor, "https://www.youtube.com/watch?v=abc1")
+
+        self.assertEqual(source, "auto_captions")
+        self.assertFalse(cached)
+        self.assertEqual(text, "Heute lernen wir Python & Django")
+        mock_download.assert_called_once_with(self.info["automatic_captions"]["de"][1])
+        mock_fetch_audio.assert_not_called()
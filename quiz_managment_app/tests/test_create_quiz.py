@@ -5,6 +5,9 @@ from django.urls import reverse
 from rest_framework.test import APITestCase
 from unittest.mock import patch
 
+from quiz_managment_app.api.jobs import process_next_job
+from quiz_managment_app.models import QuizJob
+
 
 class CreateQuizTest(APITestCase):
     """
@@ -29,37 +32,62 @@ class CreateQuizTest(APITestCase):
             "url": "https://www.invalid.com/watch?v=123"
         }
 
-    @patch("quiz_managment_app.api.views.QuizGenerator.fetch_audio_from_url")
-    @patch("quiz_managment_app.api.views.QuizGenerator.transcribe_audio")
-    @patch("quiz_managment_app.api.views.QuizGenerator.generate_quiz")
-    @patch("quiz_managment_app.api.views.QuizGenerator.clean_quiz_text")
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    @patch("quiz_managment_app.api.jobs.extract_video_info")
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.fetch_audio_from_url")
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.transcribe_audio")
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.generate_quiz")
 
     def test_create_quiz_success(
         self,
-        mock_clean_text,
         mock_generate_quiz,
         mock_transcribe,
         mock_fetch_audio,
+        mock_video_info,
+        mock_validate_duration,
     ):
         """
         Tests successful quiz creation by mocking audio processing,
-        transcription, and AI quiz generation.
+        transcription, and AI quiz generation. The request queues a job,
+        a worker processes it, and the job status returns the quiz.
         """
+        mock_video_info.return_value = {}
         mock_fetch_audio.return_value = None
         mock_transcribe.return_value = "Mock transcript"
-        mock_generate_quiz.return_value = "{" \
-            '"title": "Test Quiz",' \
-            '"description": "Mock description",' \
-            '"questions": [{"question_title": "What is 2+2?", "question_options": ["1","2","3","4"], "answer": "4"}]' \
-            "}"
-        mock_clean_text.return_value = mock_generate_quiz.return_value
+        mock_generate_quiz.return_value = {
+            "title": "Test Quiz",
+            "description": "Mock description",
+            "questions": [{"question_title": "What is 2+2?", "question_options": ["1","2","3","4"], "answer": "4"}],
+        }
 
         url = reverse("create-quiz")
         response = self.client.post(url, self.valid_payload, format="json")
 
-        self.assertEqual(response.status_code, 201)
-        self.assertEqual(response.data["title"], "Test Quiz")
-        self.assertEqual(len(response.data["questions"]), 1)
-        self.assertEqual(response.data["questions"][0]["question_title"], "What is 2+2?")
-        self.assertEqual(response.data["questions"][0]["question_options"], ["1","2","3","4"])
-        self.assertEqual(response.data["questions"][0]["answer"], "4")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["status"], "pending")
+
+        process_next_job("test-worker")
+
+        job_url = reverse("quiz-job-detail", args=[response.data["job_id"]])
+        response = self.client.get(job_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "done")
+        self.assertEqual(response.data["transcript_source"], "whisper")
+        quiz = response.data["quiz"]
+        self.assertEqual(quiz["title"], "Test Quiz")
+        self.assertEqual(len(quiz["questions"]), 1)
+        self.assertEqual(quiz["questions"][0]["question_title"], "What is 2+2?")
+        self.assertEqual(quiz["questions"][0]["question_options"], ["1","2","3","4"])
+        self.assertEqual(quiz["questions"][0]["answer"], "4")
+
+    def test_create_quiz_invalid_domain(self):
+        """
+        Tests that a URL outside the YouTube domains is rejected before
+        any job is queued.
+        """
+        url = reverse("create-quiz")
+        response = self.client.post(url, self.invalid_payload, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(QuizJob.objects.exists())
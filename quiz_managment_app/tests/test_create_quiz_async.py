@@ -0,0 +1,123 @@
+import json
+import threading
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from unittest.mock import AsyncMock, patch
+
+from quiz_managment_app.api.jobs import enqueue_quiz_job
+from quiz_managment_app.api.throttles import admission_denied, in_request_generations
+from quiz_managment_app.models import Quiz
+
+
+GENERATED_QUIZ = {
+    "title": "Async Quiz",
+    "description": "Mock description",
+    "questions": [{"question_title": "What is 2+2?", "question_options": ["1", "2", "3", "4"], "answer": "4"}],
+}
+
+
+class CreateQuizAsyncTest(TestCase):
+    """
+    Test case for the async QuizCreateAsyncView, verifying that the quiz
+    is generated within the request and saved for the cookie user.
+    """
+    def setUp(self):
+        """
+        Sets up the test user with an access token cookie.
+        """
+        self.user = User.objects.create_user(username="asyncuser", password="testpassword")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.user))
+        self.url = reverse("create-quiz-async")
+        self.payload = json.dumps({"url": "https://youtu.be/dQw4w9WgXcQ"})
+
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    @patch("quiz_managment_app.api.views.generate_quiz_async", new_callable=AsyncMock)
+    def test_create_quiz_async_success(self, mock_generate, mock_validate_duration):
+        """
+        Ensures that the generated quiz is returned with HTTP 201 and saved.
+        """
+        mock_generate.return_value = GENERATED_QUIZ
+
+        response = self.client.post(self.url, self.payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["title"], "Async Quiz")
+        mock_generate.assert_awaited_once_with("https://www.youtube.com/watch?v=dQw4w9WgXcQ")
+        quiz = Quiz.objects.get(owner=self.user)
+        self.assertEqual(quiz.questions.count(), 1)
+
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    @patch("quiz_managment_app.api.views.generate_quiz_async", new_callable=AsyncMock)
+    def test_url_validation_runs_in_ytdlp_pool(self, mock_generate, mock_validate_duration):
+        """
+        Ensures that the blocking metadata lookup of the URL validation
+        runs in the dedicated yt-dlp pool.
+        """
+        mock_generate.return_value = GENERATED_QUIZ
+        threads = []
+        mock_validate_duration.side_effect = lambda video_id: threads.append(threading.current_thread().name)
+
+        self.client.post(self.url, self.payload, content_type="application/json")
+
+        self.assertEqual(len(threads), 1)
+        self.assertTrue(threads[0].startswith("yt-dlp"))
+
+    def test_create_quiz_async_requires_authentication(self):
+        """
+        Ensures that requests without an access token are rejected.
+        """
+        self.client.cookies.clear()
+
+        response = self.client.post(self.url, self.payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_create_quiz_async_invalid_domain(self):
+        """
+        Ensures that URLs outside the YouTube domains are rejected.
+        """
+        payload = json.dumps({"url": "https://www.invalid.com/watch?v=123"})
+
+        response = self.client.post(self.url, payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("url", response.json())
+
+    @override_settings(QUIZ_MAX_ACTIVE_JOBS_PER_USER=1, QUIZ_ADMISSION_RETRY_AFTER_SECONDS=15)
+    @patch("quiz_managment_app.api.views.generate_quiz_async", new_callable=AsyncMock)
+    def test_create_quiz_async_respects_admission_limit(self, mock_generate):
+        """
+        Ensures that a user at the per-user limit gets HTTP 429 with
+        Retry-After before the URL is validated or a quiz is generated.
+        """
+        enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=abc1")
+
+        response = self.client.post(self.url, self.payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "15")
+        mock_generate.assert_not_awaited()
+
+    @override_settings(QUIZ_MAX_ACTIVE_JOBS_PER_USER=1)
+    @patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+    @patch("quiz_managment_app.api.views.generate_quiz_async", new_callable=AsyncMock)
+    def test_running_generation_counts_as_active(self, mock_generate, mock_validate_duration):
+        """
+        Ensures that a generation inside the request occupies the user's
+        admission slot while it runs and frees it afterwards.
+        """
+        denied_while_running = []
+
+        async def generate(url):
+            denied_while_running.append(await sync_to_async(admission_denied)(self.user))
+            return GENERATED_QUIZ
+        mock_generate.side_effect = generate
+
+        response = self.client.post(self.url, self.payload, content_type="application/json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(denied_while_running, [True])
+        self.assertEqual(in_request_generations(self.user), 0)
@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch
+
+from quiz_managment_app.api import gemini
+
+
+@override_settings(GEMINI_MAX_CONCURRENCY=2)
+class GeminiClientTest(SimpleTestCase):
+    """
+    Test case for the process-wide Gemini client. Verifies that it is
+    created once for all threads and that concurrent requests are limited.
+    """
+    def setUp(self):
+        """
+        Starts every test without a shared client.
+        """
+        gemini.reset_client()
+        self.addCleanup(gemini.reset_client)
+
+    @patch("quiz_managment_app.api.gemini.create_client")
+    def test_client_is_shared_across_threads(self, mock_create):
+        """
+        Ensures that concurrent callers receive the same client instance.
+        """
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            clients = list(pool.map(lambda _: gemini.get_client(), range(16)))
+
+        self.assertEqual(mock_create.call_count, 1)
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+    @patch("quiz_managment_app.api.gemini.create_client")
+    def test_concurrency_is_limited(self, mock_create):
+        """
+        Ensures that no more than GEMINI_MAX_CONCURRENCY slots are held.
+        """
+        with gemini.gemini_slot(), gemini.gemini_slot():
+            self.assertFalse(gemini._slots.acquire(blocking=False))
+        self.assertTrue(gemini._slots.acquire(blocking=False))
+        gemini._slots.release()
+
+    def test_client_uses_configured_timeout(self):
+        """
+        Ensures that the created client carries the request timeout.
+        """
+        with override_settings(GEMINI_TIMEOUT_SECONDS=12):
+            client = gemini.create_client()
+
+        self.assertEqual(client._api_client._http_options.timeout, 12000)
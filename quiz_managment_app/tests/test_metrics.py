@@ -0,0 +1,116 @@
+import os
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.jobs import enqueue_quiz_job, process_next_job
+from quiz_managment_app.api.metrics import StageTimer
+from quiz_managment_app.models import QuizJob, StageTiming
+
+
+GENERATED_QUIZ = {
+    "title": "Test Quiz",
+    "description": "Mock description",
+    "questions": [{"question_title": "What is 2+2?", "question_options": ["1", "2", "3", "4"], "answer": "4"}],
+}
+
+
+@patch("quiz_managment_app.api.jobs.extract_video_info", return_value={})
+@patch("quiz_managment_app.api.jobs.QuizGenerator.fetch_audio_from_url", return_value=None)
+class PipelineMetricsTest(APITestCase):
+    """
+    Test case for the per-stage timing records and the Prometheus metrics
+    endpoint.
+    """
+    def setUp(self):
+        """
+        Sets up a user with one queued job and a staff user.
+        """
+        os.environ["GOOGLE_API_KEY"] = "dummy-test-key"
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.staff = User.objects.create_user(username="staff", password="testpassword", is_staff=True)
+        self.job = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=abc1")
+
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.generate_quiz", return_value=GENERATED_QUIZ)
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.transcribe_audio", return_value="Mock transcript")
+    def test_completed_job_records_stage_timings(self, mock_transcribe, mock_generate, mock_fetch, mock_info):
+        """
+        Ensures that every reported stage of a finished job is stored with
+        its measurements, including the database save.
+        """
+        process_next_job("test-worker")
+
+        timings = {timing.stage: timing for timing in StageTiming.objects.filter(job=self.job)}
+        self.assertEqual(set(timings), {"validating", "saving"})
+        self.assertTrue(all(timing.succeeded for timing in timings.values()))
+        self.assertGreater(timings["saving"].bytes_processed, 0)
+        self.assertGreater(timings["saving"].peak_rss_bytes, 0)
+
+    @patch("quiz_managment_app.api.utils.transcribe_text", side_effect=RuntimeError("Whisper crashed"))
+    def test_failed_job_records_failed_stage(self, mock_transcribe_text, mock_fetch, mock_info):
+        """
+        Ensures that a failure is attributed to the stage it happened in.
+        """
+        process_next_job("test-worker")
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, QuizJob.Status.FAILED)
+        self.assertEqual(self.job.failed_stage, "transcribing")
+        failed = StageTiming.objects.get(job=self.job, succeeded=False)
+        self.assertEqual(failed.stage, "transcribing")
+
+    def test_peak_memory_is_measured_per_stage(self, mock_fetch, mock_info):
+        """
+        Ensures that a memory peak of one stage is not reported again by
+        the stages after it.
+        """
+        timer = StageTimer(self.job.id)
+        timer.start(QuizJob.Stage.TRANSCRIBING)
+        buffer = bytearray(200 * 2**20)
+        del buffer
+        timer.start(QuizJob.Stage.GENERATING)
+        timer.stop()
+
+        peaks = dict(StageTiming.objects.filter(job=self.job).values_list("stage", "peak_rss_bytes"))
+        self.assertGreater(peaks["transcribing"] - peaks["generating"], 100 * 2**20)
+
+    @patch("quiz_managment_app.api.utils.transcribe_text", side_effect=RuntimeError("Whisper crashed"))
+    def test_metrics_endpoint_is_staff_only(self, mock_transcribe_text, mock_fetch, mock_info):
+        """
+        Ensures that staff users get the aggregated metrics in the
+        Prometheus text format and other users are rejected.
+        """
+        process_next_job("test-worker")
+        url = reverse("quiz-metrics")
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get(url)
+        body = response.content.decode()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('quiz_job_failures_total{stage="transcribing"} 1', body)
+        self.assertIn('quiz_stage_duration_seconds_bucket{stage="transcribing",le="+Inf"} 1', body)
+        self.assertIn('quiz_cache_misses_total{cache="transcript"} 1', body)
+        self.assertIn('quiz_cache_hits_total{cache="audio"} 0', body)
+
+    @patch("quiz_managment_app.api.utils.transcribe_text", side_effect=RuntimeError("Whisper crashed"))
+    def test_counters_survive_deleted_jobs(self, mock_transcribe_text, mock_fetch, mock_info):
+        """
+        Ensures that deleting finished jobs and their stage timings does not
+        decrease the counters.
+        """
+        process_next_job("test-worker")
+        QuizJob.objects.all().delete()
+        self.assertFalse(StageTiming.objects.exists())
+
+        self.client.force_authenticate(self.staff)
+        body = self.client.get(reverse("quiz-metrics")).content.decode()
+
+        self.assertIn('quiz_jobs_finished_total{status="failed"} 1', body)
+        self.assertIn('quiz_job_failures_total{stage="transcribing"} 1', body)
+        self.assertIn('quiz_stage_duration_seconds_count{stage="transcribing"} 1', body)
@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from quiz_managment_app.models import QuizJob
+
+
+class PlaylistIngestionTest(APITestCase):
+    """
+    Test case for playlist ingestion. Verifies that the flat playlist
+    entries are filtered by duration and queued as a batch.
+    """
+    def setUp(self):
+        """
+        Sets up the test user and the playlist URL.
+        """
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("create-quiz-playlist")
+        self.payload = {"url": "https://www.youtube.com/playlist?list=PL123"}
+
+    @patch("quiz_managment_app.api.serializers.extract_playlist_entries")
+    def test_playlist_videos_are_queued(self, mock_entries):
+        """
+        Ensures that short videos are queued once each and that long or
+        unknown-length videos are rejected without extracting them.
+        """
+        mock_entries.return_value = [
+            {"id": "short1", "duration": 300},
+            {"id": "long1", "duration": 1200},
+            {"id": "short1", "duration": 300},
+            {"id": "live1", "duration": None},
+            {"id": "short2", "duration": 60},
+        ]
+
+        response = self.client.post(self.url, self.payload, format="json")
+
+        self.assertEqual(response.status_code, 202)
+        mock_entries.assert_called_once()
+        self.assertEqual(mock_entries.call_args.args[0], "PL123")
+        self.assertEqual([item["video_id"] for item in response.data["items"]], ["short1", "short2"])
+        self.assertEqual(len(response.data["rejected"]), 2)
+        self.assertEqual(QuizJob.objects.get(video_id="short2").duration_seconds, 60)
+
+    def test_url_without_playlist_is_rejected(self):
+        """
+        Ensures that a URL without a playlist ID is rejected.
+        """
+        response = self.client.post(self.url, {"url": "https://www.youtube.com/watch?v=abc1"}, format="json")
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+from unittest.mock import patch
+
+from quiz_managment_app.api.jobs import enqueue_quiz_job
+from quiz_managment_app.api.progress import ProgressReporter, fetch_jobs, wait_for_progress
+from quiz_managment_app.models import QuizJob
+
+
+@override_settings(QUIZ_PROGRESS_POLL_SECONDS=0.01)
+class JobProgressTest(TransactionTestCase):
+    """
+    Test case for job progress reporting. Verifies stage updates, the
+    long-poll endpoint and the Server-Sent Events stream. The endpoints
+    read from their own progress thread, so the data must be committed.
+    """
+    def setUp(self):
+        """
+        Sets up a user with an access token cookie and one queued job.
+        """
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.token = str(AccessToken.for_user(self.user))
+        self.client.cookies["access_token"] = self.token
+        self.job = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=abc1")
+
+    def test_download_hook_reports_percent(self):
+        """
+        Ensures that yt-dlp progress is stored with its percentage and a
+        new version.
+        """
+        ProgressReporter(self.job.id).download_hook(
+            {"status": "downloading", "downloaded_bytes": 250, "total_bytes": 1000}
+        )
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.stage, QuizJob.Stage.DOWNLOADING)
+        self.assertEqual(self.job.progress["percent"], 25.0)
+        self.assertEqual(self.job.progress_version, 1)
+
+    def test_decode_hook_reports_decoded_seconds(self):
+        """
+        Ensures that ffmpeg's decoded seconds are stored with the share of
+        the video's duration.
+        """
+        ProgressReporter(self.job.id).decode_hook(30, duration_seconds=120)
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.stage, QuizJob.Stage.DOWNLOADING)
+        self.assertEqual(self.job.progress, {"decoded_seconds": 30, "duration_seconds": 120, "percent": 25.0})
+
+    def test_long_poll_returns_newer_progress(self):
+        """
+        Ensures that a newer version is returned at once and that an
+        unchanged job is returned after the timeout.
+        """
+        ProgressReporter(self.job.id).stage(QuizJob.Stage.TRANSCRIBING)
+        url = reverse("quiz-job-progress", args=[self.job.id])
+
+        changed = self.client.get(url, {"since": 0, "timeout": 5}).json()
+        unchanged = self.client.get(url, {"since": 1, "timeout": 0.05}).json()
+
+        self.assertEqual((changed["stage"], changed["version"]), ("transcribing", 1))
+        self.assertEqual(unchanged["version"], 1)
+
+    def test_invalid_timeout_is_rejected(self):
+        """
+        Ensures that timeouts that are not finite numbers are rejected and
+        that negative ones return at once.
+        """
+        url = reverse("quiz-job-progress", args=[self.job.id])
+
+        for timeout in ("nan", "inf", "soon"):
+            self.assertEqual(self.client.get(url, {"since": 0, "timeout": timeout}).status_code, 400)
+        response = self.client.get(url, {"since": 0, "timeout": -5})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["version"], 0)
+
+    async def test_waiting_clients_share_one_poll_query(self):
+        """
+        Ensures that clients waiting for different jobs are woken by one
+        query per poll, run in the shared progress thread.
+        """
+        other = await sync_to_async(enqueue_quiz_job)(self.user, "https://www.youtube.com/watch?v=abc2")
+        jobs = [await QuizJob.objects.aget(id=self.job.id), other]
+        polls = []
+
+        def fetch(job_ids):
+            polls.append((threading.current_thread().name, set(job_ids)))
+            return fetch_jobs(job_ids)
+
+        with patch("quiz_managment_app.api.progress.fetch_jobs", side_effect=fetch):
+            waits = [asyncio.create_task(wait_for_progress(job, 0, 5)) for job in jobs]
+            await asyncio.sleep(0.05)
+            await QuizJob.objects.aupdate(progress_version=F("progress_version") + 1)
+            changed = await asyncio.gather(*waits)
+
+        self.assertEqual([job.progress_version for job in changed], [1, 1])
+        self.assertTrue(all(name.startswith("progress") for name, _ in polls))
+        self.assertTrue(all(job_ids == {self.job.id, other.id} for _, job_ids in polls))
+
+    async def test_event_stream_ends_with_finished_job(self):
+        """
+        Ensures that the stream sends the final progress of a finished job
+        and closes.
+        """
+        await QuizJob.objects.filter(id=self.job.id).aupdate(
+            status=QuizJob.Status.FAILED, stage=QuizJob.Stage.FAILED, progress_version=3
+        )
+        self.async_client.cookies["access_token"] = self.token
+
+        response = await self.async_client.get(reverse("quiz-job-events", args=[self.job.id]))
+        events = [chunk.decode() async for chunk in response.streaming_content]
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(len(events), 1)
+        self.assertTrue(events[0].startswith("id: 3\nevent: progress\n"))
+        self.assertEqual(json.loads(events[0].split("data: ")[1])["stage"], "failed")
+
+    def test_progress_of_other_user_is_forbidden(self):
+        """
+        Ensures that another user cannot follow the job.
+        """
+        other = User.objects.create_user(username="otheruser", password="testpassword")
+        self.client.cookies["access_token"] = str(AccessToken.for_user(other))
+
+        response = self.client.get(reverse("quiz-job-progress", args=[self.job.id]), {"timeout": 0})
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,108 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+from yt_dlp.utils import DownloadError
+
+from quiz_managment_app.api.jobs import claim_next_job, complete_job
+from quiz_managment_app.models import QuizJob
+
+
+GENERATED_QUIZ = {
+    "title": "Batch Quiz",
+    "description": "Mock description",
+    "questions": [{"question_title": "Q", "question_options": ["A", "B", "C", "D"], "answer": "A"}],
+}
+
+
+@patch("quiz_managment_app.api.serializers.YTURLSerializer.validate_video_duration")
+class QuizBatchTest(APITestCase):
+    """
+    Test case for batch quiz creation. Verifies per-item validation,
+    deduplication by video, the batch limit and progress reporting.
+    """
+    def setUp(self):
+        """
+        Sets up two users and authenticates as user1.
+        """
+        self.user1 = User.objects.create_user(username="testuser1", password="testpassword1")
+        self.user2 = User.objects.create_user(username="testuser2", password="testpassword2")
+        self.client.force_authenticate(self.user1)
+        self.urls = [
+            "https://www.youtube.com/watch?v=abc1",
+            "https://youtu.be/abc1",
+            "https://www.youtube.com/watch?v=abc2",
+            "https://www.invalid.com/watch?v=abc3",
+        ]
+
+    def create_batch(self):
+        """
+        Posts the example URLs and returns the response.
+        """
+        return self.client.post(reverse("create-quiz-batch"), {"urls": self.urls}, format="json")
+
+    def test_batch_dedupes_and_reports_invalid_urls(self, mock_validate_duration):
+        """
+        Ensures that one job per video is queued and invalid URLs are
+        reported without failing the batch.
+        """
+        response = self.create_batch()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual([item["video_id"] for item in response.data["items"]], ["abc1", "abc2"])
+        self.assertEqual(response.data["counts"]["pending"], 2)
+        self.assertEqual(response.data["rejected"][0]["url"], self.urls[3])
+        self.assertEqual(mock_validate_duration.call_count, 3)
+
+    def test_unreadable_video_is_rejected_per_item(self, mock_validate_duration):
+        """
+        Ensures that a video whose metadata lookup fails (e.g. a private
+        video) is rejected without failing the other URLs of the batch.
+        """
+        def lookup(video_id):
+            if video_id == "abc2":
+                raise DownloadError("Private video")
+        mock_validate_duration.side_effect = lookup
+
+        response = self.create_batch()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual([item["video_id"] for item in response.data["items"]], ["abc1"])
+        self.assertIn({"url": self.urls[2], "error": "The video could not be read."}, response.data["rejected"])
+
+    def test_batch_reports_quiz_ids_as_jobs_complete(self, mock_validate_duration):
+        """
+        Ensures that a finished item shows its quiz id while the others
+        are still pending.
+        """
+        batch_id = self.create_batch().data["batch_id"]
+        job = claim_next_job("worker-a")
+        complete_job(job, "worker-a", GENERATED_QUIZ)
+
+        response = self.client.get(reverse("quiz-batch-detail", args=[batch_id]))
+
+        done = [item for item in response.data["items"] if item["status"] == "done"]
+        self.assertEqual(len(done), 1)
+        self.assertEqual(done[0]["quiz_id"], QuizJob.objects.get(id=job.id).quiz_id)
+        self.assertEqual(response.data["counts"]["pending"], 1)
+
+    def test_second_active_batch_is_rejected(self, mock_validate_duration):
+        """
+        Ensures that a user cannot start a second batch while one is unfinished.
+        """
+        self.create_batch()
+
+        response = self.create_batch()
+
+        self.assertEqual(response.status_code, 429)
+
+    def test_batch_of_other_user_is_forbidden(self, mock_validate_duration):
+        """
+        Ensures that a batch cannot be viewed by another user.
+        """
+        batch_id = self.create_batch().data["batch_id"]
+        self.client.force_authenticate(self.user2)
+
+        response = self.client.get(reverse("quiz-batch-detail", args=[batch_id]))
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,65 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from quiz_managment_app.models import Quiz, Question
+
+
+class QuizDetailQueriesTest(APITestCase):
+    """
+    Test case for the query budget of the QuizDetailView: owner-scoped
+    fetches with prefetched questions and a single cascading delete.
+    """
+    def setUp(self):
+        """
+        Sets up two users and a quiz with three questions for user1.
+        Authenticates as user1.
+        """
+        self.user1 = User.objects.create_user(username="testuser1", password="testpassword1")
+        self.user2 = User.objects.create_user(username="testuser2", password="testpassword2")
+        self.client.force_authenticate(self.user1)
+
+        self.quiz = Quiz.objects.create(
+            owner=self.user1, title="Test Quiz", description="Test", video_url="https://www.youtube.com/watch?v=abc1"
+        )
+        for index in range(3):
+            Question.objects.create(
+                quiz=self.quiz, question_title=f"Q{index}", question_options=["A", "B", "C", "D"], answer="A"
+            )
+        self.url = reverse("quiz-detail", args=[self.quiz.id])
+
+    def test_get_takes_two_queries(self):
+        """
+        Ensures that the quiz and all its questions are loaded with one
+        query each.
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["questions"]), 3)
+
+    def test_miss_distinguishes_forbidden_and_missing(self):
+        """
+        Ensures that another user's quiz still answers HTTP 403 and an
+        unknown id HTTP 404, each after one extra existence check.
+        """
+        self.client.force_authenticate(self.user2)
+
+        with self.assertNumQueries(2):
+            forbidden = self.client.get(self.url)
+        missing = self.client.get(reverse("quiz-detail", args=[self.quiz.id + 1]))
+
+        self.assertEqual(forbidden.status_code, 403)
+        self.assertEqual(missing.status_code, 404)
+
+    def test_delete_cascades_in_one_transaction(self):
+        """
+        Ensures that the delete loads no questions and removes them with
+        the quiz: one lookup, then one statement per table inside a savepoint.
+        """
+        with self.assertNumQueries(6):
+            response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Quiz.objects.filter(id=self.quiz.id).exists())
+        self.assertFalse(Question.objects.filter(quiz_id=self.quiz.id).exists())
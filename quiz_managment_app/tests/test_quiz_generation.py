@@ -0,0 +1,72 @@
+from django.test import SimpleTestCase, override_settings
+from unittest.mock import patch
+
+from quiz_managment_app.api.schemas import GeneratedQuiz, QuestionCandidates
+from quiz_managment_app.api.sections import split_transcript
+from quiz_managment_app.api.utils import QuizGenerator
+
+
+def count_words(text):
+    """
+    Counts words as tokens, so the tests do not need tiktoken's encoding files.
+    """
+    return len(text.split())
+
+
+class MapReduceGenerationTest(SimpleTestCase):
+    """
+    Test case for quiz generation from long transcripts. Verifies that the
+    transcript is split into bounded sections and that every section is
+    sent to the AI model before the final merge.
+    """
+    def setUp(self):
+        """
+        Creates a QuizGenerator with a transcript of three sentences.
+        """
+        self.processor = QuizGenerator()
+        self.addCleanup(self.processor.cleanup)
+        self.transcript = "Eins zwei drei vier. Fünf sechs sieben acht. Neun zehn elf zwölf."
+        self.processor.write_file(self.processor.transcript_file, self.transcript)
+
+    def test_sections_respect_token_limit(self):
+        """
+        Ensures that sections end at sentence boundaries, stay within the
+        limit and keep the whole transcript.
+        """
+        sections = split_transcript(self.transcript, max_tokens=8, count=count_words)
+
+        self.assertEqual(sections, [
+            "Eins zwei drei vier. Fünf sechs sieben acht.",
+            "Neun zehn elf zwölf.",
+        ])
+
+    def test_unpunctuated_text_is_split_at_words(self):
+        """
+        Ensures that a single sentence longer than the limit is split.
+        """
+        sections = split_transcript("a b c d e f g h i j", max_tokens=4, count=count_words)
+
+        self.assertTrue(all(count_words(section) <= 4 for section in sections))
+        self.assertEqual(" ".join(sections), "a b c d e f g h i j")
+
+    @override_settings(QUIZ_GENERATION_MODE="map_reduce")
+    @patch("quiz_managment_app.api.utils.split_transcript")
+    @patch("quiz_managment_app.api.utils.QuizGenerator.ask_gemini")
+    def test_every_section_contributes_candidates(self, mock_ask, mock_split):
+        """
+        Ensures that one call per section is made and that the merge step
+        receives the candidates of all sections.
+        """
+        mock_split.return_value = ["Eins zwei drei vier.", "Fünf sechs sieben acht.", "Neun zehn elf zwölf."]
+        question = {"question_title": "Q", "question_options": ["A", "B", "C", "D"], "answer": "A"}
+        final = {"title": "T", "description": "D", "questions": [question]}
+        mock_ask.side_effect = lambda prompt, schema: (
+            GeneratedQuiz(**final) if schema is GeneratedQuiz else QuestionCandidates(questions=[question])
+        )
+
+        quiz = self.processor.generate_quiz()
+
+        self.assertEqual(quiz, final)
+        self.assertEqual(mock_ask.call_count, 4)
+        merge_prompt = mock_ask.call_args_list[-1].args[0]
+        self.assertEqual(merge_prompt.count('"question_title": "Q"'), 3)
@@ -0,0 +1,142 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.jobs import claim_next_job, enqueue_quiz_job, process_next_job, try_claim
+from quiz_managment_app.api.quiz_cache import store_quiz
+from quiz_managment_app.models import QuizJob
+
+
+class QuizJobQueueTest(APITestCase):
+    """
+    Test case for the quiz generation queue. Verifies lease-based claiming
+    by several workers, recovery of abandoned jobs and access to job status.
+    """
+    def setUp(self):
+        """
+        Sets up two users and one pending job for user1.
+        Authenticates as user1 for the tests.
+        """
+        self.user1 = User.objects.create_user(username="testuser1", password="testpassword1")
+        self.user2 = User.objects.create_user(username="testuser2", password="testpassword2")
+        self.client.force_authenticate(self.user1)
+
+        self.job = enqueue_quiz_job(self.user1, "https://www.youtube.com/watch?v=abc1")
+
+    def test_job_is_claimed_by_one_worker_only(self):
+        """
+        Ensures that a pending job is leased to the first worker and not
+        handed out to a second worker while the lease is valid.
+        """
+        claimed = claim_next_job("worker-a")
+
+        self.assertEqual(claimed.id, self.job.id)
+        self.assertEqual(claimed.status, QuizJob.Status.RUNNING)
+        self.assertEqual(claimed.lease_owner, "worker-a")
+        self.assertIsNone(claim_next_job("worker-b"))
+
+    def test_expired_lease_is_reclaimed(self):
+        """
+        Ensures that a job whose worker stopped renewing the lease is
+        picked up by another worker.
+        """
+        claim_next_job("worker-a")
+        QuizJob.objects.filter(id=self.job.id).update(
+            lease_expires_at=timezone.now() - timedelta(seconds=1)
+        )
+
+        claimed = claim_next_job("worker-b")
+
+        self.assertEqual(claimed.lease_owner, "worker-b")
+        self.assertEqual(claimed.attempts, 2)
+
+    @patch("quiz_managment_app.api.jobs.generate_quiz_data")
+    def test_failed_generation_is_reported(self, mock_generate):
+        """
+        Ensures that a pipeline error marks the job as failed and exposes
+        the error through the job status endpoint.
+        """
+        mock_generate.side_effect = ValueError("Generated quiz is not valid JSON.")
+
+        process_next_job("worker-a")
+
+        response = self.client.get(reverse("quiz-job-detail", args=[self.job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "failed")
+        self.assertEqual(response.data["error"], "Generated quiz is not valid JSON.")
+        self.assertIsNone(response.data["quiz"])
+
+    def test_same_video_waits_for_running_generation(self):
+        """
+        Ensures that a second job for a video that is being generated is
+        held back while a job for another video can still be claimed.
+        """
+        same_video = enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=abc1")
+        other_video = enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=abc2")
+        claim_next_job("worker-a")
+
+        claimed = claim_next_job("worker-b")
+
+        self.assertEqual(claimed.id, other_video.id)
+        self.assertIsNone(claim_next_job("worker-c"))
+        self.assertEqual(QuizJob.objects.get(id=same_video.id).status, QuizJob.Status.PENDING)
+
+    def test_owner_with_fewer_running_jobs_goes_first(self):
+        """
+        Ensures that a second worker takes another user's later job before
+        a further job of the user who already has one running.
+        """
+        second_own = enqueue_quiz_job(self.user1, "https://www.youtube.com/watch?v=abc2")
+        other_user = enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=abc3")
+        claim_next_job("worker-a")
+
+        claimed = claim_next_job("worker-b")
+
+        self.assertEqual(claimed.id, other_user.id)
+        self.assertEqual(claim_next_job("worker-c").id, second_own.id)
+
+    def test_racing_claim_for_same_video_is_rejected(self):
+        """
+        Ensures that a worker whose candidate list is stale cannot claim a
+        second job for a video that another worker claimed in the meantime.
+        """
+        same_video = enqueue_quiz_job(self.user2, "https://www.youtube.com/watch?v=abc1")
+        claim_next_job("worker-a")
+
+        with patch("quiz_managment_app.api.jobs.claimable_jobs", return_value=QuizJob.objects.all()):
+            claimed = try_claim(same_video.id, "worker-b", timezone.now())
+
+        self.assertFalse(claimed)
+        self.assertEqual(QuizJob.objects.get(id=same_video.id).status, QuizJob.Status.PENDING)
+
+    @patch("quiz_managment_app.api.jobs.run_pipeline")
+    def test_cached_quiz_is_copied_without_pipeline(self, mock_pipeline):
+        """
+        Ensures that a job for a video with a cached quiz builds the user's
+        quiz from the cached JSON without running the pipeline.
+        """
+        store_quiz("abc1", {
+            "title": "Cached Quiz",
+            "description": "From the cache",
+            "questions": [{"question_title": "Q1", "question_options": ["A", "B", "C", "D"], "answer": "A"}],
+        })
+
+        process_next_job("worker-a")
+
+        job = QuizJob.objects.get(id=self.job.id)
+        mock_pipeline.assert_not_called()
+        self.assertEqual(job.status, QuizJob.Status.DONE)
+        self.assertEqual(job.quiz.owner, self.user1)
+        self.assertEqual(job.quiz.title, "Cached Quiz")
+        self.assertEqual(job.quiz.questions.count(), 1)
+
+    def test_get_job_no_permission(self):
+        """
+        Ensures that a user cannot access another user's job.
+        """
+        self.client.force_authenticate(self.user2)
+        response = self.client.get(reverse("quiz-job-detail", args=[self.job.id]))
+        self.assertEqual(response.status_code, 403)
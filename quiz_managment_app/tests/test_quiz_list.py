@@ -56,19 +56,50 @@ class QuizListViewTest(APITestCase):
         response = self.client.get(url, format="json")
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(response.data), 2)
+        quizzes = response.data["results"]
+        self.assertEqual(len(quizzes), 2)
 
-        titles = [quiz["title"] for quiz in response.data]
+        titles = [quiz["title"] for quiz in quizzes]
         self.assertIn("Test Quiz 1", titles)
         self.assertIn("Test Quiz 2", titles)
         self.assertNotIn("Test Quiz 3", titles)
 
-        quiz1_data = next(q for q in response.data if q["id"] == self.quiz1.id)
+        quiz1_data = next(q for q in quizzes if q["id"] == self.quiz1.id)
         self.assertEqual(len(quiz1_data["questions"]), 1)
         self.assertEqual(quiz1_data["questions"][0]["question_title"], "Question 1")
         self.assertEqual(quiz1_data["questions"][0]["question_options"], ["A", "B", "C", "D"])
         self.assertEqual(quiz1_data["questions"][0]["answer"], "A")
         
+    def test_quiz_list_pages_newest_first_with_cursor(self):
+        """
+        Ensures that pages follow each other by cursor, newest quiz first,
+        without repeating or skipping quizzes.
+        """
+        url = reverse("quiz-list")
+
+        first = self.client.get(url, {"page_size": 1}, format="json").data
+        second = self.client.get(first["next"], format="json").data
+
+        self.assertEqual([q["id"] for q in first["results"]], [self.quiz2.id])
+        self.assertEqual([q["id"] for q in second["results"]], [self.quiz1.id])
+        self.assertIsNone(second["next"])
+
+    def test_quiz_list_query_count_is_constant(self):
+        """
+        Ensures that the list takes the same number of queries for a small
+        and a large library: one for the page and one for its questions.
+        """
+        url = reverse("quiz-list")
+        with self.assertNumQueries(2):
+            self.client.get(url, format="json")
+
+        for index in range(15):
+            quiz = Quiz.objects.create(owner=self.user1, title=f"Quiz {index}", description="", video_url="")
+            Question.objects.create(quiz=quiz, question_title="Q", question_options=["A", "B", "C", "D"], answer="A")
+        with self.assertNumQueries(2):
+            response = self.client.get(url, format="json")
+        self.assertEqual(len(response.data["results"]), 17)
+
     def test_quiz_list_unauthenticated(self):
         """
         Ensures that unauthenticated users receive a 401 response.
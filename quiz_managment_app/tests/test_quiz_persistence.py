@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.serializers import YTURLSerializer
+from quiz_managment_app.models import Question, Quiz
+
+
+class QuizPersistenceTest(TestCase):
+    """
+    Test case for saving a generated quiz with `YTURLSerializer.create`.
+    Verifies the normalization, the bulk insert and the atomicity.
+    """
+    def setUp(self):
+        """
+        Sets up a user and a generated quiz with five questions, one of
+        them with an answer that is not among its options.
+        """
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        questions = [
+            {"question_title": f"Q{index}", "question_options": [" A ", "B", "C", "D"], "answer": "a"}
+            for index in range(4)
+        ]
+        questions.append({"question_title": "Q4", "question_options": ["A", "B", "C", "D"], "answer": "E"})
+        self.data = {
+            "url": "https://www.youtube.com/watch?v=abc1",
+            "owner": self.user,
+            "generated_quiz": {"title": "Quiz", "description": "", "questions": questions},
+        }
+
+    def test_questions_are_normalized_and_inserted_in_bulk(self):
+        """
+        Ensures that the quiz and its valid questions take one INSERT each,
+        inside a savepoint, and that options and answers are normalized.
+        """
+        with self.assertNumQueries(4):
+            quiz = YTURLSerializer().create(self.data)
+
+        questions = list(quiz.questions.order_by("id"))
+        self.assertEqual([question.question_title for question in questions], ["Q0", "Q1", "Q2", "Q3"])
+        self.assertEqual(questions[0].question_options, ["A", "B", "C", "D"])
+        self.assertEqual(questions[0].answer, "A")
+
+    def test_failed_insert_leaves_no_quiz(self):
+        """
+        Ensures that the quiz is rolled back if its questions cannot be saved.
+        """
+        with patch.object(Question.objects, "bulk_create", side_effect=RuntimeError("disk full")):
+            with self.assertRaises(RuntimeError):
+                YTURLSerializer().create(self.data)
+
+        self.assertFalse(Quiz.objects.exists())
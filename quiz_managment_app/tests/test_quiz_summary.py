@@ -0,0 +1,59 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth.models import User
+from quiz_managment_app.models import Quiz, Question
+
+
+class QuizSummaryTest(APITestCase):
+    """
+    Test case for the summary representation and the sparse fieldsets
+    of the quiz list.
+    """
+    def setUp(self):
+        """
+        Sets up a user with two quizzes, one of them with three questions.
+        """
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("quiz-list")
+
+        self.quiz1 = Quiz.objects.create(owner=self.user, title="Quiz 1", description="Eins", video_url="")
+        self.quiz2 = Quiz.objects.create(owner=self.user, title="Quiz 2", description="Zwei", video_url="")
+        for index in range(3):
+            Question.objects.create(
+                quiz=self.quiz1, question_title=f"Q{index}", question_options=["A", "B", "C", "D"], answer="A"
+            )
+
+    def test_summary_counts_questions_in_one_query(self):
+        """
+        Ensures that the summary returns `question_count` instead of the
+        questions and takes a single query.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {"view": "summary"}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        counts = {quiz["id"]: quiz["question_count"] for quiz in response.data["results"]}
+        self.assertEqual(counts, {self.quiz1.id: 3, self.quiz2.id: 0})
+        self.assertNotIn("questions", response.data["results"][0])
+
+    def test_fields_restrict_the_representation(self):
+        """
+        Ensures that only the requested fields are returned, and that the
+        full list skips the question prefetch when they are not requested.
+        """
+        summary = self.client.get(self.url, {"view": "summary", "fields": "title,question_count"}, format="json")
+        with self.assertNumQueries(1):
+            full = self.client.get(self.url, {"fields": "id,title"}, format="json")
+
+        self.assertEqual(summary.data["results"][0], {"title": "Quiz 2", "question_count": 0})
+        self.assertEqual(full.data["results"][0], {"id": self.quiz2.id, "title": "Quiz 2"})
+
+    def test_unknown_field_is_rejected(self):
+        """
+        Ensures that an unknown field name is answered with HTTP 400.
+        """
+        response = self.client.get(self.url, {"view": "summary", "fields": "title,answer"}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("answer", response.data["detail"])
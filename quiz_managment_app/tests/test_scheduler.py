@@ -0,0 +1,98 @@
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from quiz_managment_app.api.jobs import claim_next_job, enqueue_quiz_job
+from quiz_managment_app.api.scheduler import schedule_fields
+from quiz_managment_app.api.serializers import QuizJobSerializer
+from quiz_managment_app.api.youtube import info_cache_key
+from quiz_managment_app.models import QuizJob
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+    QUIZ_COST_GENERATION_SECONDS=20,
+    QUIZ_COST_TRANSCRIPTION_FACTOR=0.5,
+    QUIZ_SCHEDULER_AGING_FACTOR=2,
+)
+class ShortestJobFirstTest(APITestCase):
+    """
+    Test case for the shortest-job-first scheduling of generation jobs.
+    Verifies the claim order, the aging of long jobs and the estimates.
+    """
+    def setUp(self):
+        """
+        Caches the metadata of a 14-minute and a 1-minute video, as the URL
+        validation would, and authenticates a user.
+        """
+        cache.clear()
+        cache.set(info_cache_key("long1"), {"id": "long1", "duration": 840})
+        cache.set(info_cache_key("short1"), {"id": "short1", "duration": 60})
+        self.user = User.objects.create_user(username="testuser", password="testpassword")
+        self.client.force_authenticate(self.user)
+
+    def test_short_job_overtakes_long_job(self):
+        """
+        Ensures that a 1-minute video queued behind a 14-minute video is
+        claimed first.
+        """
+        long_job = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=long1")
+        short_job = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=short1")
+
+        self.assertEqual(long_job.estimated_seconds, 20 + 840 * 0.5)
+        self.assertEqual(claim_next_job("worker-a").id, short_job.id)
+        self.assertEqual(claim_next_job("worker-b").id, long_job.id)
+
+    def test_long_job_is_not_starved(self):
+        """
+        Ensures that short jobs arriving after the long job's aging delay
+        no longer overtake it.
+        """
+        start = timezone.now() - timedelta(hours=1)
+        long_job = QuizJob.objects.create(
+            owner=self.user, url="u", video_id="long1",
+            **schedule_fields("long1", {"duration": 840}, now=start),
+        )
+        QuizJob.objects.create(
+            owner=self.user, url="u", video_id="short1",
+            **schedule_fields("short1", {"duration": 60}, now=start + timedelta(seconds=900)),
+        )
+
+        self.assertEqual(claim_next_job("worker-a").id, long_job.id)
+
+    def test_status_contains_estimates(self):
+        """
+        Ensures that a waiting job starts after the running job's estimated
+        remaining time and finishes its own estimate later.
+        """
+        enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=short1")
+        running = claim_next_job("worker-a")
+        waiting = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=long1")
+
+        response = self.client.get(reverse("quiz-job-detail", args=[waiting.id]))
+
+        self.assertEqual(response.data["queue_position"], 1)
+        self.assertEqual(response.data["duration_seconds"], 840)
+        start = timezone.datetime.fromisoformat(response.data["estimated_start"].replace("Z", "+00:00"))
+        finish = timezone.datetime.fromisoformat(response.data["estimated_finish"].replace("Z", "+00:00"))
+        self.assertAlmostEqual((start - running.started_at).total_seconds(), running.estimated_seconds, delta=5)
+        self.assertAlmostEqual((finish - start).total_seconds(), waiting.estimated_seconds, delta=1)
+
+    def test_estimates_are_computed_once(self):
+        """
+        Ensures that serializing a waiting job runs the scheduler queries
+        once: the queue position count, the running jobs and the backlog
+        of the jobs ahead.
+        """
+        enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=short1")
+        claim_next_job("worker-a")
+        waiting = enqueue_quiz_job(self.user, "https://www.youtube.com/watch?v=long1")
+
+        with self.assertNumQueries(3):
+            data = QuizJobSerializer(waiting).data
+
+        self.assertIsNotNone(data["estimated_finish"])
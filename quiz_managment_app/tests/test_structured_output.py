@@ -0,0 +1,79 @@
+import json
+from django.test import SimpleTestCase, override_settings
+from pydantic import ValidationError
+from unittest.mock import patch
+
+from quiz_managment_app.api.schemas import GeneratedQuiz
+from quiz_managment_app.api.utils import QuizGenerationError, QuizGenerator
+
+
+QUESTION = {"question_title": "Q", "question_options": ["A", "B", "C", "D"], "answer": "A"}
+
+
+@override_settings(QUIZ_GENERATION_MODE="single", QUIZ_GENERATION_ATTEMPTS=3)
+class StructuredOutputTest(SimpleTestCase):
+    """
+    Test case for the schema-constrained Gemini output. Verifies that
+    answers are validated in memory and that only the Gemini call is
+    retried within the attempt budget.
+    """
+    def setUp(self):
+        """
+        Creates a QuizGenerator with a short transcript.
+        """
+        self.processor = QuizGenerator()
+        self.addCleanup(self.processor.cleanup)
+        self.processor.write_file(self.processor.transcript_file, "Ein kurzes Transkript.")
+
+    def test_answer_must_be_an_option(self):
+        """
+        Ensures that questions with an answer outside the options or with
+        the wrong number of options are rejected.
+        """
+        for question in (dict(QUESTION, answer="E"), dict(QUESTION, question_options=["A", "B"])):
+            with self.assertRaises(ValidationError):
+                GeneratedQuiz(title="T", description="D", questions=[question])
+
+    @patch("quiz_managment_app.api.utils.get_client")
+    def test_invalid_answer_is_retried(self, mock_client):
+        """
+        Ensures that an invalid answer is retried and the valid quiz of
+        the next attempt is returned.
+        """
+        valid = {"title": "T", "description": "D", "questions": [QUESTION]}
+        invalid = dict(valid, questions=[dict(QUESTION, answer="E")])
+        generate = mock_client.return_value.models.generate_content
+        generate.side_effect = [
+            type("Response", (), {"text": json.dumps(answer)}) for answer in (invalid, valid)
+        ]
+
+        self.assertEqual(self.processor.generate_quiz(), valid)
+        self.assertEqual(generate.call_count, 2)
+        config = generate.call_args.kwargs["config"]
+        self.assertEqual(config.response_mime_type, "application/json")
+
+    @patch("quiz_managment_app.api.utils.get_client")
+    def test_attempts_are_bounded(self, mock_client):
+        """
+        Ensures that generation gives up after the configured attempts.
+        """
+        generate = mock_client.return_value.models.generate_content
+        generate.return_value = type("Response", (), {"text": "kein JSON"})
+
+        with self.assertRaises(QuizGenerationError):
+            self.processor.generate_quiz()
+        self.assertEqual(generate.call_count, 3)
+
+    @override_settings(QUIZ_GENERATION_ATTEMPTS=0)
+    @patch("quiz_managment_app.api.utils.get_client")
+    def test_zero_attempts_still_tries_once(self, mock_client):
+        """
+        Ensures that a budget below one attempt makes a single attempt and
+        fails with `QuizGenerationError` instead of crashing.
+        """
+        generate = mock_client.return_value.models.generate_content
+        generate.return_value = type("Response", (), {"text": "kein JSON"})
+
+        with self.assertRaises(QuizGenerationError):
+            self.processor.generate_quiz()
+        self.assertEqual(generate.call_count, 1)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from unittest.mock import patch
+
+from quiz_managment_app.api.jobs import load_transcript
+from quiz_managment_app.api.transcripts import get_cached_transcript, store_transcript
+from quiz_managment_app.api.utils import QuizGenerator
+from quiz_managment_app.models import TranscriptCache
+
+
+class TranscriptCacheTest(TestCase):
+    """
+    Test case for the cross-user transcript cache. Verifies that cache hits
+    skip download and transcription, that hits report the original source
+    and that entries are evicted by age and by total size.
+    """
+    def setUp(self):
+        """
+        Creates a QuizGenerator with its own workspace for each test.
+        """
+        self.processor = QuizGenerator()
+        self.addCleanup(self.processor.cleanup)
+        self.url = "https://www.youtube.com/watch?v=abc1"
+
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.transcribe_audio")
+    @patch("quiz_managment_app.api.jobs.QuizGenerator.fetch_audio_from_url")
+    @patch("quiz_managment_app.api.jobs.extract_video_info")
+    def test_cache_hit_skips_download_and_transcription(self, mock_info, mock_fetch, mock_transcribe):
+        """
+        Ensures that the second generation for a video reuses the stored
+        transcript instead of downloading and transcribing again.
+        """
+        mock_info.return_value = {}
+        mock_transcribe.return_value = "Mock transcript"
+        load_transcript(self.processor, self.url)
+
+        text, source, cached = load_transcript(self.processor, self.url)
+
+        self.assertEqual(text, "Mock transcript")
+        self.assertEqual(source, "whisper")
+        self.assertTrue(cached)
+        self.assertEqual(mock_fetch.call_count, 1)
+        self.assertEqual(mock_transcribe.call_count, 1)
+        self.assertEqual(self.processor.read_file(self.processor.transcript_file), text)
+
+    def test_expired_entry_is_a_miss(self):
+        """
+        Ensures that transcripts older than the maximum age are not served.
+        """
+        store_transcript("abc1", "Old transcript", "whisper")
+        TranscriptCache.objects.update(created_at=timezone.now() - timedelta(days=365))
+
+        self.assertEqual(get_cached_transcript("abc1"), (None, None))
+
+    @override_settings(TRANSCRIPT_CACHE_MAX_BYTES=10)
+    def test_least_recently_used_entry_is_evicted(self):
+        """
+        Ensures that exceeding the size budget evicts the least recently
+        used transcript first.
+        """
+        store_transcript("abc1", "12345", "whisper")
+        store_transcript("abc2", "12345", "whisper")
+        TranscriptCache.objects.filter(video_id="abc1").update(
+            last_used_at=timezone.now() - timedelta(minutes=1)
+        )
+        get_cached_transcript("abc1")
+
+        store_transcript("abc3", "12345", "whisper")
+
+        self.assertEqual(get_cached_transcript("abc1")[0], "12345")
+        self.assertIsNone(get_cached_transcript("abc2")[0])
+        self.assertEqual(get_cached_transcript("abc3")[0], "12345")
+
+    @override_settings(WHISPER_MODEL="small")
+    def test_caption_entry_keeps_source_across_models(self):
+        """
+        Ensures that a transcript from captions is reported with its source
+        and is still used after the Whisper model changed, while a Whisper
+        transcript of another model is not.
+        """
+        store_transcript("abc1", "From captions", "auto_captions")
+        with override_settings(WHISPER_MODEL="base"):
+            store_transcript("abc2", "From Whisper", "whisper")
+
+        self.assertEqual(get_cached_transcript("abc1"), ("From captions", "auto_captions"))
+        self.assertEqual(get_cached_transcript("abc2"), (None, None))
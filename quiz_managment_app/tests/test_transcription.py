@@ -0,0 +1,56 @@
+import numpy as np
+from django.test import SimpleTestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.audio import SAMPLE_RATE
+from quiz_managment_app.api.transcription import split_on_silence, transcribe_serial
+
+
+class SilenceSplitTest(SimpleTestCase):
+    """
+    Test case for splitting audio into chunks for transcription. Verifies
+    that cuts are placed in silent passages, no audio is lost and serial
+    transcription reports each chunk.
+    """
+    def setUp(self):
+        """
+        Creates 10 seconds of noise with a half-second pause at 3.5 seconds.
+        """
+        rng = np.random.default_rng(0)
+        self.audio = rng.uniform(-0.5, 0.5, 10 * SAMPLE_RATE).astype(np.float32)
+        self.audio[int(3.5 * SAMPLE_RATE):4 * SAMPLE_RATE] = 0
+
+    def test_cut_is_placed_in_silence(self):
+        """
+        Ensures that the first chunk ends inside the pause, that no chunk
+        exceeds the maximum length and that the chunks cover all samples.
+        """
+        chunks = split_on_silence(self.audio, chunk_seconds=4, search_seconds=1)
+
+        first_end = len(chunks[0]) / SAMPLE_RATE
+        self.assertGreaterEqual(first_end, 3.5)
+        self.assertLessEqual(first_end, 4)
+        self.assertTrue(all(len(chunk) <= 4 * SAMPLE_RATE for chunk in chunks))
+        np.testing.assert_array_equal(np.concatenate(chunks), self.audio)
+
+    def test_short_audio_is_one_chunk(self):
+        """
+        Ensures that audio shorter than the chunk length is not split.
+        """
+        chunks = split_on_silence(self.audio, chunk_seconds=30)
+
+        self.assertEqual(len(chunks), 1)
+
+    @patch("quiz_managment_app.api.transcription.transcribe")
+    def test_serial_transcription_reports_every_chunk(self, mock_transcribe):
+        """
+        Ensures that the serial mode transcribes the chunks in order and
+        reports progress after each of them.
+        """
+        mock_transcribe.side_effect = [{"text": " eins "}, {"text": "zwei"}, {"text": "drei"}]
+        progress = []
+
+        text = transcribe_serial(self.audio, chunk_seconds=4, on_progress=lambda *done: progress.append(done))
+
+        self.assertEqual(text, "eins zwei drei")
+        self.assertEqual(progress, [(1, 3), (2, 3), (3, 3)])
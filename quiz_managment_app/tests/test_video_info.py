@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, APITestCase
+from unittest.mock import patch
+
+from quiz_managment_app.api.serializers import YTURLSerializer
+from quiz_managment_app.api.youtube import get_video_info, info_cache_key
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class VideoInfoCacheTest(APITestCase):
+    """
+    Test case for the yt-dlp metadata cache used by URL validation.
+    Verifies that repeated validations of a video extract its info once
+    and that only host-independent metadata is cached.
+    """
+    def setUp(self):
+        """
+        Sets up a request for the serializer context and clears the cache.
+        """
+        cache.clear()
+        self.request = APIRequestFactory().post("/api/createQuiz/")
+        self.request.user = User.objects.create_user(username="testuser", password="testpassword")
+
+    @patch("quiz_managment_app.api.youtube.extract_video_info")
+    def test_repeated_validation_uses_cached_metadata(self, mock_extract):
+        """
+        Ensures that validating the same video twice calls yt-dlp only once
+        and that the canonical URL is returned both times.
+        """
+        mock_extract.return_value = {"id": "abc1", "duration": 120, "title": "Test"}
+
+        for url in ["https://youtu.be/abc1", "https://www.youtube.com/watch?v=abc1&t=5"]:
+            serializer = YTURLSerializer(data={"url": url}, context={"request": self.request})
+            self.assertTrue(serializer.is_valid())
+            self.assertEqual(serializer.validated_data["url"], "https://www.youtube.com/watch?v=abc1")
+
+        mock_extract.assert_called_once_with("abc1")
+
+    @patch("quiz_managment_app.api.youtube.extract_video_info")
+    def test_too_long_video_is_rejected(self, mock_extract):
+        """
+        Ensures that videos longer than 15 minutes fail validation.
+        """
+        mock_extract.return_value = {"id": "abc2", "duration": 16 * 60}
+
+        serializer = YTURLSerializer(data={"url": "https://youtu.be/abc2"}, context={"request": self.request})
+
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("Video is longer than 15 minutes.", serializer.errors["url"])
+
+    @patch("quiz_managment_app.api.youtube.extract_video_info")
+    def test_cached_metadata_has_no_stream_urls(self, mock_extract):
+        """
+        Ensures that the signed, host-bound URLs of formats and captions
+        are not cached while durations and caption languages are.
+        """
+        mock_extract.return_value = {
+            "id": "abc1", "duration": 120, "title": "Test",
+            "formats": [{"format_id": "251", "acodec": "opus", "url": "https://example.com/signed"}],
+            "subtitles": {},
+            "automatic_captions": {"de": [
+                {"ext": "json3", "url": "https://example.com/de.json3"},
+                {"ext": "vtt", "url": "https://example.com/de.vtt"},
+            ]},
+        }
+
+        metadata = get_video_info("abc1")
+
+        self.assertEqual(metadata["duration"], 120)
+        self.assertEqual(metadata["formats"], [{"format_id": "251", "acodec": "opus"}])
+        self.assertEqual(metadata["automatic_captions"], {"de": [{"ext": "vtt"}]})
+        self.assertNotIn("https://", str(cache.get(info_cache_key("abc1"))))
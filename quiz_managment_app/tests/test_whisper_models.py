@@ -0,0 +1,36 @@
+import sys
+from django.test import SimpleTestCase
+from unittest.mock import MagicMock, patch
+
+from quiz_managment_app.api import whisper_models
+
+
+class WhisperModelRegistryTest(SimpleTestCase):
+    """
+    Test case for the process-wide Whisper model registry. Verifies that
+    each model size is loaded from disk only once.
+    """
+    def setUp(self):
+        """
+        Replaces the whisper package with a mock and empties the registry.
+        """
+        self.whisper = MagicMock()
+        modules = patch.dict(sys.modules, {"whisper": self.whisper})
+        registry = patch.multiple(whisper_models, _models={}, _model_locks={}, _model_stats={})
+        for patcher in (modules, registry):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_model_is_loaded_once_per_size(self):
+        """
+        Ensures that repeated lookups reuse the loaded model and that load
+        statistics are recorded per model size.
+        """
+        first = whisper_models.get_whisper_model("small")
+        second = whisper_models.get_whisper_model("small")
+        whisper_models.get_whisper_model("base")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.whisper.load_model.call_count, 2)
+        self.assertEqual(set(whisper_models.loaded_models()), {"small", "base"})
+        self.assertIn("rss_bytes", whisper_models.loaded_models()["small"])
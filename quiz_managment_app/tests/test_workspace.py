@@ -0,0 +1,62 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from django.test import SimpleTestCase
+
+from quiz_managment_app.api.utils import QuizGenerator
+from quiz_managment_app.api.workspace import host_workspace_dir, purge_stale_workspaces
+
+
+class QuizWorkspaceTest(SimpleTestCase):
+    """
+    Test case for the per-generation scratch directories of QuizGenerator.
+    Verifies isolation between generations and purging of stale workspaces.
+    """
+    def setUp(self):
+        """
+        Creates a temporary workspace root for each test.
+        """
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Removes the temporary workspace root.
+        """
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_generators_use_separate_workspaces(self):
+        """
+        Ensures that two generators write to different directories and that
+        cleaning up one leaves the other's files untouched.
+        """
+        first = QuizGenerator(workspace_root=self.root)
+        second = QuizGenerator(workspace_root=self.root)
+        first.write_file(first.transcript_file, "first")
+        second.write_file(second.transcript_file, "second")
+
+        first.cleanup()
+
+        self.assertNotEqual(first.media_dir, second.media_dir)
+        self.assertFalse(os.path.exists(first.media_dir))
+        self.assertEqual(second.read_file(second.transcript_file), "second")
+        second.cleanup()
+
+    def test_purge_removes_workspaces_of_dead_processes(self):
+        """
+        Ensures that a workspace created by a process that no longer exists
+        is removed, while a live process's workspace is kept.
+        """
+        finished = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                                  capture_output=True, text=True)
+        dead_dir = os.path.join(host_workspace_dir(self.root), f"quiz-{finished.stdout.strip()}-x")
+        os.makedirs(dead_dir)
+        live = QuizGenerator(workspace_root=self.root)
+
+        removed = purge_stale_workspaces(self.root, max_age=3600)
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(dead_dir))
+        self.assertTrue(os.path.exists(live.media_dir))
+        live.cleanup()